@@ -1,34 +1,162 @@
-from collections import deque
+import heapq
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from almacen_estados import AlmacenEstados, ConjuntoEstados
+from analisis_estructural import base_p_invariantes
+from exploracion_disco import ExploracionEnDisco
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional, solo lo usa el motor vectorizado
+    np = None
+
+
+# Omega se codifica como el máximo entero de 64 bits: es mayor que cualquier marca
+# finita, así que habilitar, comparar y acelerar se reducen a aritmética entera y
+# los marcados caben en arreglos int64. El símbolo solo se usa al mostrar.
+OMEGA = 2 ** 63 - 1
+SIMBOLO_OMEGA = "ω"
+
+
+def a_marcado_numerico(marcado):
+    """Convierte un marcado que puede contener el símbolo 'ω' a su codificación entera"""
+    return [OMEGA if x == SIMBOLO_OMEGA else x for x in marcado]
+
+
+def formatear_marcado(marcado):
+    """Representación del marcado para imprimir, con 'ω' en lugar del centinela entero"""
+    return str(type(marcado)(SIMBOLO_OMEGA if x == OMEGA else x for x in marcado))
+
+
+def _congelar(matriz):
+    """Copia la matriz como tupla de tuplas, para que no se pueda modificar en sitio"""
+    return tuple(tuple(fila) for fila in matriz)
 
 
 class RedPetri:
-    def __init__(self, pre, post, marcado_inicial):
+    def __init__(self, pre, post, marcado_inicial, usar_numpy=False, tam_cache=1024):
         """
         Inicializa la Red de Petri
         pre: Matriz de pre-condiciones (lugares x transiciones)
         post: Matriz de post-condiciones (lugares x transiciones)
         marcado_inicial: Lista con el marcado inicial de cada lugar
+        usar_numpy: Si es True guarda Pre/Post/C como arreglos de NumPy y calcula
+                    las transiciones habilitadas de forma vectorizada
+        tam_cache: Máximo de marcados en la caché de sucesores (0 la desactiva)
         """
-        self.pre = pre
-        self.post = post
-        self.marcado_actual = marcado_inicial.copy()
-        self.marcado_inicial = marcado_inicial.copy()
-        self.n_transiciones = len(pre[0])
-        self.n_lugares = len(pre)
-        self.omega = "ω"
+        # pre y post quedan inmutables: los índices dispersos y la caché se derivan de
+        # ellas, así que para cambiarlas hay que reasignarlas
+        self._pre = _congelar(pre)
+        self._post = _congelar(post)
+        self.marcado_actual = a_marcado_numerico(marcado_inicial)
+        self.marcado_inicial = a_marcado_numerico(marcado_inicial)
+        self.omega = OMEGA
         self.cobertura = False
+        self.usar_numpy = usar_numpy
+
+        # Caché LRU: (cobertura, marcado) -> (habilitadas, {transicion: sucesor})
+        self.tam_cache = tam_cache
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+
+        # Calcular la matriz de incidencia y los índices dispersos de pre y post
+        self._construir_estructuras()
+
+    @property
+    def pre(self):
+        return self._pre
+
+    @pre.setter
+    def pre(self, pre):
+        self._pre = _congelar(pre)
+        self._construir_estructuras()
+
+    @property
+    def post(self):
+        return self._post
+
+    @post.setter
+    def post(self, post):
+        self._post = _congelar(post)
+        self._construir_estructuras()
+
+    def _construir_estructuras(self):
+        """
+        Construye todo lo que se deriva de pre y post. Se llama de nuevo al reasignar
+        pre o post, que no se pueden modificar en sitio.
+        """
+        self.n_transiciones = len(self._pre[0])
+        self.n_lugares = len(self._pre)
 
         # Calcular matriz de incidencia c = post - pre
         self.C = self.calcular_matriz_incidencia()
 
+        # Representación dispersa: cada transición toca pocos lugares, así que
+        # habilitar y disparar cuestan O(arcos) en lugar de O(|P|·|T|)
+        self.entradas = [[] for _ in range(self.n_transiciones)]  # t -> [(lugar, peso pre)]
+        self.salidas = [[] for _ in range(self.n_transiciones)]   # t -> [(lugar, peso post)]
+        self.cambios = [[] for _ in range(self.n_transiciones)]   # t -> [(lugar, c)] con c != 0
+        self.consumidoras = [[] for _ in range(self.n_lugares)]   # p -> transiciones que consumen de p
+        for p in range(self.n_lugares):
+            fila_pre = self._pre[p]
+            fila_post = self._post[p]
+            for t in range(self.n_transiciones):
+                if fila_pre[t] > 0:
+                    self.entradas[t].append((p, fila_pre[t]))
+                    self.consumidoras[p].append(t)
+                if fila_post[t] > 0:
+                    self.salidas[t].append((p, fila_post[t]))
+                if fila_post[t] != fila_pre[t]:
+                    self.cambios[t].append((p, fila_post[t] - fila_pre[t]))
+
+        # las transiciones sin arcos nunca se habilitan
+        self.con_arcos = [bool(self.entradas[t] or self.salidas[t]) for t in range(self.n_transiciones)]
+
+        # Al disparar t solo cambian los lugares de cambios[t], así que solo las transiciones
+        # que consumen de esos lugares pueden cambiar de estado
+        self.afectadas = [
+            frozenset(t2 for p, _ in self.cambios[t] for t2 in self.consumidoras[p])
+            for t in range(self.n_transiciones)
+        ]
+
+        # Relación de dependencia para la reducción por órdenes parciales:
+        # conflictos[t] son las transiciones que consumen de algún lugar de entrada de t
+        # y productoras[p] las que aumentan las marcas de p
+        self.conflictos = [
+            frozenset(t2 for p, _ in self.entradas[t] for t2 in self.consumidoras[p])
+            for t in range(self.n_transiciones)
+        ]
+        self.productoras = [[] for _ in range(self.n_lugares)]
+        for t in range(self.n_transiciones):
+            for p, c in self.cambios[t]:
+                if c > 0:
+                    self.productoras[p].append(t)
+
+        if self.usar_numpy:
+            self._construir_motor_numpy()
+
+        # los sucesores guardados dejan de valer con otra pre o post
+        self._cache = OrderedDict()
+        self._p_invariantes = None
+
+    def _construir_motor_numpy(self):
+        """Guarda Pre, Post y C como arreglos enteros para el motor vectorizado"""
+        if np is None:
+            raise ImportError("El motor vectorizado requiere numpy (pip install numpy)")
+        self.pre_np = np.array(self.pre, dtype=np.int64).reshape(self.n_lugares, self.n_transiciones)
+        self.post_np = np.array(self.post, dtype=np.int64).reshape(self.n_lugares, self.n_transiciones)
+        self.C_np = self.post_np - self.pre_np
+        # las transiciones sin arcos nunca se habilitan
+        self.con_arcos_np = (self.pre_np > 0).any(axis=0) | (self.post_np > 0).any(axis=0)
+
     def es_omega(self, valor):
-        return valor == "ω"
-    
+        return valor == OMEGA
+
     def comparar_con_omega(self, pre_condicion, marca):
-        if self.es_omega(marca):
-            return True
-        else:
-            return marca >= pre_condicion
+        # omega es el máximo entero, por lo que siempre cubre la pre-condición
+        return marca >= pre_condicion
 
     def calcular_matriz_incidencia(self):
         """Calcula la matriz de incidencia c = post - pre"""
@@ -49,27 +177,100 @@ class RedPetri:
         """
         if marcado is None:
             marcado = self.marcado_actual
-        habilitadas = []
+        if self.tam_cache == 0:
+            return self._calcular_habilitadas(marcado)
+        return list(self._consultar_cache(marcado)[0])
 
-        for t in range(self.n_transiciones):
-            habilitada = True 
-            arcos = False
-            # Verificar M >= Pre para todos los lugares
-            # Verifica que las transiciones tienen que ser iguales o mayores en los absolutos, y diferentes de 0 para
-            # para que se encuentren habilitadas
-            for p in range(self.n_lugares):
-                if self.pre[p][t] > 0 or self.post[p][t] > 0: # toma en cuenta el pre y post
-                    arcos = True
-                if self.cobertura is False and self.pre[p][t] > marcado[p]:
-                    habilitada = False
-                    break
-                elif self.cobertura is True and not self.comparar_con_omega(self.pre[p][t], marcado[p]):
-                    habilitada = False
-                    break
-            if habilitada and arcos: # se habilita si existen arcos
-                habilitadas.append(t)
+    def _calcular_habilitadas(self, marcado):
+        """Habilitadas sin pasar por la caché (para los recorridos que visitan cada marcado una vez)"""
+        if self.usar_numpy:
+            return self.transiciones_habilitadas_lote([marcado])[0]
+        return [t for t in range(self.n_transiciones) if self.esta_habilitada(t, marcado)]
 
-        return habilitadas
+    def _consultar_cache(self, marcado):
+        """
+        Busca un marcado en la caché de sucesores; si no está, calcula sus habilitadas y
+        lo guarda, descartando el usado hace más tiempo si se llenó. Los sucesores se
+        agregan uno a uno conforme se disparan (ver disparar)
+
+        Returns:
+            tuple: (habilitadas, {transicion: sucesor}) con el sucesor como tupla
+        """
+        clave = (self.cobertura, tuple(marcado))
+        entrada = self._cache.get(clave)
+        if entrada is not None:
+            self.aciertos_cache += 1
+            self._cache.move_to_end(clave)
+            return entrada
+
+        self.fallos_cache += 1
+        habilitadas = tuple(self._calcular_habilitadas(marcado))
+        entrada = (habilitadas, {})
+        self._cache[clave] = entrada
+        if len(self._cache) > self.tam_cache:
+            self._cache.popitem(last=False)
+        return entrada
+
+    def estadisticas_cache(self):
+        """
+        Returns:
+            dict: Aciertos, fallos, tasa de aciertos y marcados guardados en la caché
+        """
+        consultas = self.aciertos_cache + self.fallos_cache
+        return {
+            'aciertos': self.aciertos_cache,
+            'fallos': self.fallos_cache,
+            'tasa_aciertos': self.aciertos_cache / consultas if consultas else 0.0,
+            'entradas': len(self._cache),
+            'capacidad': self.tam_cache
+        }
+
+    def limpiar_cache(self):
+        """Vacía la caché de sucesores y reinicia sus contadores"""
+        self._cache.clear()
+        self.aciertos_cache = 0
+        self.fallos_cache = 0
+
+    def esta_habilitada(self, transicion, marcado=None):
+        """
+        Verifica M >= Pre solo sobre los lugares de entrada de la transición.
+        Con omega codificado como entero la comparación es la misma en ambos modos.
+        """
+        if marcado is None:
+            marcado = self.marcado_actual
+        # se habilita solo si existen arcos (en pre o en post)
+        if not 0 <= transicion < self.n_transiciones or not self.con_arcos[transicion]:
+            return False
+        for p, peso in self.entradas[transicion]:
+            if marcado[p] < peso:
+                return False
+        return True
+
+    def _marcados_a_arreglo(self, marcados):
+        """
+        Convierte una lista de marcados en un arreglo (marcados x lugares).
+        OMEGA es el máximo int64, así que M >= Pre siempre se cumple en esos lugares.
+        """
+        return np.array(marcados, dtype=np.int64).reshape(len(marcados), self.n_lugares)
+
+    def transiciones_habilitadas_lote(self, marcados):
+        """
+        Calcula las transiciones habilitadas para varios marcados a la vez
+        marcados: Lista de marcados (o arreglo marcados x lugares)
+
+        Returns:
+            list: Para cada marcado, la lista de índices de transiciones habilitadas
+        """
+        if not self.usar_numpy:
+            return [self._calcular_habilitadas(marcado) for marcado in marcados]
+        if isinstance(marcados, np.ndarray):
+            M = marcados.astype(np.int64, copy=False).reshape(-1, self.n_lugares)
+        else:
+            M = self._marcados_a_arreglo(marcados)
+
+        # M[:, :, None] >= Pre compara cada lugar contra cada transición de un solo paso
+        habilitadas = (M[:, :, None] >= self.pre_np[None, :, :]).all(axis=1) & self.con_arcos_np
+        return [np.flatnonzero(fila).tolist() for fila in habilitadas]
 
     def disparar(self, transicion, marcado=None):
         """
@@ -83,69 +284,662 @@ class RedPetri:
         if marcado is None:
             marcado = self.marcado_actual
 
-        # Verificar si la transición está habilitada
-        if transicion not in self.transiciones_habilitadas(marcado):
-            return False, marcado
-
-        # Calcular nuevo marcado: M' = M + c[:,t]
-        nuevo_marcado = marcado.copy()
-        for p in range(self.n_lugares):
-            if self.cobertura is False:
-                nuevo_marcado[p] += self.C[p][transicion]
-            else:
-                if self.es_omega(marcado[p]):
-                    nuevo_marcado[p] = 'ω'
-                else:
-                    nuevo_marcado[p] += self.C[p][transicion]
-                    if nuevo_marcado[p] < 0:
-                        nuevo_marcado[p] = 0
+        if self.tam_cache == 0:
+            if not self.esta_habilitada(transicion, marcado):
+                return False, marcado
+            nuevo_marcado = self._sucesor(transicion, marcado)
+        else:
+            # Las habilitadas salen de la caché si el marcado ya se consultó; el sucesor
+            # de esta transición se calcula la primera vez que se dispara y se guarda
+            habilitadas, sucesores = self._consultar_cache(marcado)
+            sucesor = sucesores.get(transicion)
+            if sucesor is None:
+                if transicion not in habilitadas:
+                    return False, marcado
+                sucesor = sucesores[transicion] = tuple(self._sucesor(transicion, marcado))
+            nuevo_marcado = list(sucesor)
 
         # Actualizar marcado actual si no se proporcionó uno específico
         if marcado == self.marcado_actual:
             self.marcado_actual = nuevo_marcado
 
         return True, nuevo_marcado
-    
-    def busqueda_por_anchura(self, max_profundidad=10):
+
+    def _sucesor(self, transicion, marcado):
+        """
+        Calcula M' = M + c[:,t] sin verificar la habilitación, solo en los lugares que
+        cambian; los lugares en omega se quedan en omega
+        """
+        nuevo_marcado = list(marcado)
+        for p, c in self.cambios[transicion]:
+            if nuevo_marcado[p] != OMEGA:
+                nuevo_marcado[p] += c
+        return nuevo_marcado
+
+    def actualizar_habilitadas(self, habilitadas, marcado, revisar):
+        """
+        Actualiza un conjunto de habilitadas volviendo a evaluar solo algunas transiciones
+        habilitadas: Transiciones habilitadas antes del cambio
+        marcado: Marcado después del cambio
+        revisar: Transiciones cuyo estado pudo cambiar (p. ej. self.afectadas[t])
+
+        Returns:
+            list: Transiciones habilitadas en marcado, ordenadas por índice
+        """
+        nuevas = [t for t in habilitadas if t not in revisar]
+        nuevas.extend(t for t in revisar if self.esta_habilitada(t, marcado))
+        nuevas.sort()
+        return nuevas
+
+    def disparar_incremental(self, transicion, habilitadas, marcado=None):
+        """
+        Dispara una transición llevando el conjunto de habilitadas junto con el marcado.
+        Solo se reevalúan las transiciones que consumen de los lugares modificados.
+        transicion: Índice de la transición a disparar
+        habilitadas: Transiciones habilitadas en marcado
+        marcado: Marcado desde el cual disparar (opcional, si no se da se usa y
+                 actualiza el marcado actual)
+
+        Returns:
+            tuple: (éxito, nuevo_marcado, nuevas_habilitadas)
+        """
+        actualizar_actual = marcado is None
+        if actualizar_actual:
+            marcado = self.marcado_actual
+
+        if transicion not in habilitadas:
+            return False, marcado, habilitadas
+
+        nuevo_marcado = self._sucesor(transicion, marcado)
+        nuevas_habilitadas = self.actualizar_habilitadas(habilitadas, nuevo_marcado, self.afectadas[transicion])
+
+        if actualizar_actual:
+            self.marcado_actual = nuevo_marcado
+
+        return True, nuevo_marcado, nuevas_habilitadas
+
+    def disparar_medido(self, transicion, habilitadas, marcado, metricas):
+        """
+        Igual que disparar_incremental con un marcado dado, pero registra en metricas el
+        tiempo de disparar y el de actualizar las habilitadas por separado
+        """
+        if transicion not in habilitadas:
+            return False, marcado, habilitadas
+        inicio = metricas.iniciar('disparo')
+        nuevo_marcado = self._sucesor(transicion, marcado)
+        metricas.terminar('disparo', inicio)
+        inicio = metricas.iniciar('habilitacion')
+        nuevas_habilitadas = self.actualizar_habilitadas(habilitadas, nuevo_marcado, self.afectadas[transicion])
+        metricas.terminar('habilitacion', inicio)
+        return True, nuevo_marcado, nuevas_habilitadas
+
+    def conjunto_obstinado(self, marcado, habilitadas):
+        """
+        Calcula las transiciones habilitadas de un conjunto obstinado (stubborn set).
+        Para una transición habilitada del conjunto se agregan las que le quitan marcas
+        a sus lugares de entrada; para una deshabilitada, las que pueden aumentar un lugar
+        que le falta. Disparar solo estas conserva todos los bloqueos alcanzables.
+        Se prueba cada habilitada como semilla y se queda el conjunto más pequeño.
+        marcado: Marcado actual
+        habilitadas: Transiciones habilitadas en marcado
+
+        Returns:
+            list: Subconjunto de habilitadas, ordenado por índice
+        """
+        habilitadas_set = set(habilitadas)
+        mejor = list(habilitadas)
+
+        for semilla in habilitadas:
+            conjunto = {semilla}
+            pendientes = [semilla]
+            habilitadas_conjunto = []
+            while pendientes and len(habilitadas_conjunto) < len(mejor):
+                t = pendientes.pop()
+                if t in habilitadas_set:
+                    habilitadas_conjunto.append(t)
+                    agregar = self.conflictos[t]
+                else:
+                    # lugar que le falta a t con menos productoras
+                    faltante = min((p for p, peso in self.entradas[t] if marcado[p] < peso),
+                                   key=lambda p: len(self.productoras[p]))
+                    agregar = self.productoras[faltante]
+                for t2 in agregar:
+                    if t2 not in conjunto:
+                        conjunto.add(t2)
+                        pendientes.append(t2)
+
+            if not pendientes and len(habilitadas_conjunto) < len(mejor):
+                mejor = habilitadas_conjunto
+                if len(mejor) == 1:
+                    break
+
+        mejor.sort()
+        return mejor
+
+    def busqueda_por_anchura(self, max_profundidad=10, reduccion=False, metricas=None, simetria=None):
         """
         Realiza búsqueda por anchura en el árbol de alcance
+        max_profundidad: Profundidad máxima a explorar (None para no limitarla)
+        reduccion: Si es True solo dispara un conjunto obstinado en cada marcado; se exploran
+                   menos estados pero se conservan todos los bloqueos alcanzables
+        metricas: Instancia de Metricas para seguir el progreso (opcional)
+        simetria: Instancia de simetrias.Simetria; se guarda un representante por órbita
+                  (consultar con simetria.contiene)
 
         Returns:
-            dict: Diccionario con todos los marcados alcanzables
+            AlmacenEstados: Vista tipo diccionario marcado -> {padre, transicion} con
+                            todos los marcados alcanzables
         """
-        # Usar tupla para poder usar como clave en diccionario
-        marcado_inicial_tuple = tuple(self.marcado_inicial)
+        # Los marcados se guardan empaquetados e internados a ids enteros
+        visitados = AlmacenEstados()
+        for _ in self.explorar_por_anchura(max_profundidad, visitados, reduccion, metricas, simetria):
+            pass
+        return visitados
+
+    def busqueda_en_disco(self, directorio, max_profundidad=None):
+        """
+        Búsqueda por anchura con visitados y frontera en archivos mapeados en memoria,
+        para espacios de estados que no caben en RAM. Si el directorio ya contiene una
+        exploración de esta red, la reanuda desde el último nivel terminado
+        directorio: Carpeta donde se guardan los archivos de la exploración
+        max_profundidad: Profundidad máxima (None para explorar todo)
+
+        Returns:
+            ExploracionEnDisco: Vista tipo diccionario igual a la de busqueda_por_anchura.
+                                Conserva abiertos sus archivos: cerrarla con cerrar() o
+                                usarla en un bloque with
+        """
+        return ExploracionEnDisco(self, directorio).explorar(max_profundidad)
 
-        visitados = {}  # marcado -> {padre: None, transicion: None}
+    def explorar_por_anchura(self, max_profundidad=10, visitados=None, reduccion=False, metricas=None,
+                             simetria=None):
+        """
+        Versión generadora de la búsqueda por anchura: produce cada marcado en cuanto se
+        descubre, así se puede escribir a disco, detenerse al encontrar un objetivo o
+        encadenar con otro consumidor sin esperar al árbol completo
+        max_profundidad: Profundidad máxima a explorar (None para no limitarla)
+        visitados: AlmacenEstados donde registrar el árbol (opcional). Si no se da, solo se
+                   recuerdan los marcados empaquetados para no repetirlos
+        reduccion: Si es True dispara solo un conjunto obstinado (ver conjunto_obstinado)
+        metricas: Instancia de Metricas que recibe estados nuevos, duplicados, tamaño de la
+                  frontera y tiempos de disparo y habilitación (opcional)
+        simetria: Instancia de simetrias.Simetria (opcional). Cada sucesor se cambia por el
+                  representante de su órbita antes de buscarlo en visitados; el marcado
+                  producido es ese representante, simétrico al que deja la transición
+
+        Yields:
+            tuple: (marcado, padre, transicion, profundidad); el marcado inicial tiene
+                   padre y transicion None
+        """
+        if visitados is None:
+            visitados = ConjuntoEstados()
+        marcado_inicial_tuple = tuple(self.marcado_inicial)
         cola = deque()
 
+        if metricas is not None:
+            metricas.comenzar()
+            metricas.nuevo_estado(0, 1)
+
         # Inicializar con el marcado inicial
-        visitados[marcado_inicial_tuple] = {'padre': None, 'transicion': None}
-        cola.append((marcado_inicial_tuple, 0))  # (marcado, profundidad)
+        id_inicial, _ = visitados.agregar(marcado_inicial_tuple)
+        yield marcado_inicial_tuple, None, None, 0
+        # (marcado, id, profundidad, habilitadas): las habilitadas viajan con el marcado
+        cola.append((marcado_inicial_tuple, id_inicial, 0, self.transiciones_habilitadas(self.marcado_inicial)))
 
         while cola:
-            marcado_actual_tuple, profundidad = cola.popleft()
-            marcado_actual = list(marcado_actual_tuple)
+            marcado_actual_tuple, id_actual, profundidad, habilitadas = cola.popleft()
 
-            if profundidad >= max_profundidad:
+            if max_profundidad is not None and profundidad >= max_profundidad:
                 continue
 
-            # Obtener transiciones habilitadas para este marcado
-            habilitadas = self.transiciones_habilitadas(marcado_actual)
-
-            for transicion in habilitadas:
-                # Disparar transición
-                exito, nuevo_marcado = self.disparar(transicion, marcado_actual)
+            disparables = self.conjunto_obstinado(marcado_actual_tuple, habilitadas) if reduccion else habilitadas
+            for transicion in disparables:
+                # Disparar transición y actualizar solo las habilitadas afectadas
+                if metricas is None:
+                    exito, nuevo_marcado, nuevas_habilitadas = self.disparar_incremental(
+                        transicion, habilitadas, marcado_actual_tuple
+                    )
+                else:
+                    exito, nuevo_marcado, nuevas_habilitadas = self.disparar_medido(
+                        transicion, habilitadas, marcado_actual_tuple, metricas
+                    )
 
                 if exito:
-                    nuevo_marcado_tuple = tuple(nuevo_marcado)
+                    if simetria is not None:
+                        representante = simetria.canonico(nuevo_marcado)
+                        if representante != tuple(nuevo_marcado):
+                            nuevo_marcado, nuevas_habilitadas = representante, None
                     # Si es un nuevo marcado, agregar a la cola
-                    if nuevo_marcado_tuple not in visitados:
-                        visitados[nuevo_marcado_tuple] = {
-                            'padre': marcado_actual_tuple,
-                            'transicion': transicion
-                        }
-                        cola.append((nuevo_marcado_tuple, profundidad + 1))
+                    nuevo_id, es_nuevo = visitados.agregar(nuevo_marcado, id_actual, transicion)
+                    if es_nuevo:
+                        nuevo_marcado_tuple = tuple(nuevo_marcado)
+                        if nuevas_habilitadas is None:
+                            nuevas_habilitadas = self.transiciones_habilitadas(nuevo_marcado_tuple)
+                        yield nuevo_marcado_tuple, marcado_actual_tuple, transicion, profundidad + 1
+                        cola.append((nuevo_marcado_tuple, nuevo_id, profundidad + 1, nuevas_habilitadas))
+                        if metricas is not None:
+                            metricas.nuevo_estado(profundidad + 1, len(cola))
+                    elif metricas is not None:
+                        metricas.duplicado()
+
+        if metricas is not None:
+            metricas.finalizar()
+
+    def _pasos_en_profundidad(self, max_profundidad, visitados, reduccion=False, metricas=None):
+        """
+        Núcleo de la búsqueda en profundidad con pila explícita. Cada nivel de la pila es el
+        id del marcado, el marcado, sus habilitadas, las transiciones por disparar y el
+        índice de la siguiente, sin copiar listas: la memoria de la pila es proporcional a la
+        profundidad y no al ancho. Con max_profundidad, un marcado que se vuelve a encontrar
+        más cerca de la raíz se expande otra vez y su padre en visitados pasa a ser el del
+        camino más corto, así el límite no esconde marcados que estaban a menor
+        profundidad y al terminar secuencia() da caminos de largo mínimo, como en anchura.
+        Sin límite no se reexpande y los caminos son los del árbol de profundidad.
+        visitados: AlmacenEstados donde se internan los marcados
+
+        Yields:
+            tuple: ('nuevo', id, marcado, padre, transicion, profundidad, habilitadas) al
+                   descubrir un marcado; ('ciclo', id, ciclo) cuando un disparo vuelve al
+                   marcado id del camino actual, con las transiciones del ciclo; y al
+                   terminar ('corte', id) por cada marcado cuya menor profundidad es el
+                   límite y tiene transiciones por disparar (los cortados en un camino
+                   largo que luego se expandieron desde más arriba no cuentan)
+        """
+        marcado_inicial_tuple = tuple(self.marcado_inicial)
+        id_inicial, _ = visitados.agregar(marcado_inicial_tuple)
+        habilitadas = self.transiciones_habilitadas(self.marcado_inicial)
+        profundidades = array('i', [0])  # por id: la menor profundidad en que se vio
+
+        if metricas is not None:
+            metricas.comenzar()
+            metricas.nuevo_estado(0, 1)
+        yield 'nuevo', id_inicial, marcado_inicial_tuple, None, None, 0, habilitadas
+
+        # la pila: un elemento por nivel en listas paralelas
+        ids = [id_inicial]
+        marcados = [marcado_inicial_tuple]
+        habilitadas_pila = [habilitadas]
+        disparables_pila = [self.conjunto_obstinado(marcado_inicial_tuple, habilitadas) if reduccion else habilitadas]
+        indices = array('i', [0])
+        disparos = [None]  # transición que llevó a cada nivel
+        en_camino = {id_inicial: 0}  # id -> nivel en la pila
+        cortados = set()
+
+        while ids:
+            nivel = len(ids) - 1
+            i = indices[nivel]
+            disparables = disparables_pila[nivel]
+            limite = max_profundidad is not None and nivel >= max_profundidad
+            if limite or i >= len(disparables):
+                if limite and disparables:
+                    cortados.add(ids[nivel])
+                del en_camino[ids.pop()]
+                marcados.pop()
+                habilitadas_pila.pop()
+                disparables_pila.pop()
+                indices.pop()
+                disparos.pop()
+                continue
+
+            indices[nivel] = i + 1
+            transicion = disparables[i]
+            if metricas is None:
+                _, nuevo_marcado, nuevas_habilitadas = self.disparar_incremental(
+                    transicion, habilitadas_pila[nivel], marcados[nivel])
+            else:
+                _, nuevo_marcado, nuevas_habilitadas = self.disparar_medido(
+                    transicion, habilitadas_pila[nivel], marcados[nivel], metricas)
+            nuevo_id, es_nuevo = visitados.agregar(nuevo_marcado, ids[nivel], transicion)
+            profundidad = nivel + 1
+            nuevo_marcado_tuple = tuple(nuevo_marcado)
+
+            if es_nuevo:
+                profundidades.append(profundidad)
+                yield ('nuevo', nuevo_id, nuevo_marcado_tuple, marcados[nivel], transicion,
+                       profundidad, nuevas_habilitadas)
+                if metricas is not None:
+                    metricas.nuevo_estado(profundidad, len(ids))
+            else:
+                if nuevo_id in en_camino:
+                    yield 'ciclo', nuevo_id, disparos[en_camino[nuevo_id] + 1:] + [transicion]
+                    continue
+                if metricas is not None:
+                    metricas.duplicado()
+                if max_profundidad is None or profundidades[nuevo_id] <= profundidad:
+                    continue
+                profundidades[nuevo_id] = profundidad
+                visitados.cambiar_padre(nuevo_id, ids[nivel], transicion)
+
+            en_camino[nuevo_id] = profundidad
+            ids.append(nuevo_id)
+            marcados.append(nuevo_marcado_tuple)
+            habilitadas_pila.append(nuevas_habilitadas)
+            disparables_pila.append(self.conjunto_obstinado(nuevo_marcado_tuple, nuevas_habilitadas)
+                                    if reduccion else nuevas_habilitadas)
+            indices.append(0)
+            disparos.append(transicion)
+
+        for estado_id in cortados:
+            if profundidades[estado_id] == max_profundidad:
+                yield 'corte', estado_id
+
+        if metricas is not None:
+            metricas.finalizar()
+
+    def explorar_por_profundidad(self, max_profundidad=None, visitados=None, reduccion=False, metricas=None):
+        """
+        Versión en profundidad de explorar_por_anchura, con la misma forma de uso. Baja hasta
+        el fondo antes de volver, con memoria proporcional a la profundidad del camino
+        max_profundidad: Profundidad máxima a explorar (None para no limitarla)
+        visitados: AlmacenEstados donde registrar el árbol (opcional)
+        reduccion: Si es True dispara solo un conjunto obstinado (ver conjunto_obstinado)
+        metricas: Instancia de Metricas (opcional)
+
+        Yields:
+            tuple: (marcado, padre, transicion, profundidad) de cada marcado nuevo
+        """
+        if visitados is None:
+            visitados = AlmacenEstados()
+        for paso in self._pasos_en_profundidad(max_profundidad, visitados, reduccion, metricas):
+            if paso[0] == 'nuevo':
+                yield paso[2:6]
+
+    def busqueda_por_profundidad(self, max_profundidad=None, reduccion=False, metricas=None):
+        """
+        Búsqueda en profundidad con pila explícita
+
+        Returns:
+            AlmacenEstados: Igual que busqueda_por_anchura. Sin max_profundidad los padres
+                            forman un árbol de profundidad y las secuencias no son las más
+                            cortas; con límite sí lo son (ver _pasos_en_profundidad)
+        """
+        visitados = AlmacenEstados()
+        for _ in self.explorar_por_profundidad(max_profundidad, visitados, reduccion, metricas):
+            pass
+        return visitados
+
+    def busqueda_por_profundizacion(self, max_profundidad=None, incremento=1, reduccion=False):
+        """
+        Profundización iterativa: búsquedas en profundidad con límite incremento,
+        2·incremento, ... hasta que ninguna queda cortada por el límite (o se llega a
+        max_profundidad). Sin max_profundidad no termina en redes no acotadas.
+
+        Returns:
+            AlmacenEstados: Los marcados de la última búsqueda, con caminos de largo mínimo
+        """
+        limite = incremento if max_profundidad is None else min(incremento, max_profundidad)
+        while True:
+            visitados = AlmacenEstados()
+            cortada = False
+            for paso in self._pasos_en_profundidad(limite, visitados, reduccion):
+                cortada = cortada or paso[0] == 'corte'
+            if not cortada or (max_profundidad is not None and limite >= max_profundidad):
+                return visitados
+            limite += incremento
+            if max_profundidad is not None:
+                limite = min(limite, max_profundidad)
+
+    def detectar_ciclo(self, max_profundidad=None):
+        """
+        Busca en profundidad un disparo que vuelva a un marcado del camino actual
+
+        Returns:
+            tuple: (resultado, prefijo, ciclo): (True, secuencia hasta el marcado que se
+                   repite, transiciones del ciclo), (False, None, None) si el espacio no
+                   tiene ciclos y (None, None, None) si el límite de profundidad cortó
+                   la búsqueda sin hallarlo
+        """
+        visitados = AlmacenEstados()
+        cortada = False
+        for paso in self._pasos_en_profundidad(max_profundidad, visitados):
+            if paso[0] == 'ciclo':
+                return True, visitados.secuencia(paso[1]), paso[2]
+            cortada = cortada or paso[0] == 'corte'
+        return (None, None, None) if cortada else (False, None, None)
+
+    def _busqueda_guiada(self, es_objetivo, heuristica, max_estados=None, reduccion=False, guia=None):
+        """
+        Búsqueda A* (costo 1 por disparo) que se detiene en cuanto genera un marcado objetivo
+        es_objetivo: Función (marcado, habilitadas) -> bool
+        heuristica: Función (marcado, habilitadas) -> estimación de disparos restantes, o
+                    None si desde ese marcado el objetivo es imposible (se poda)
+        max_estados: Máximo de estados a visitar (None para no limitarlo)
+        reduccion: Disparar solo conjuntos obstinados (conserva bloqueos, no otros objetivos)
+        guia: Conjunto de transiciones preferidas; a igual costo estimado se expanden antes
+              los marcados con menos disparos fuera de él (no cambia la respuesta)
+
+        Returns:
+            tuple: (resultado, secuencia): (True, transiciones desde el marcado inicial) si se
+                   encontró, (False, None) si se agotó el espacio de estados y (None, None)
+                   si se llegó a max_estados sin respuesta
+        """
+        visitados = AlmacenEstados()
+        marcado_inicial_tuple = tuple(self.marcado_inicial)
+        id_inicial, _ = visitados.agregar(marcado_inicial_tuple)
+        habilitadas_iniciales = self._calcular_habilitadas(marcado_inicial_tuple)
+        if es_objetivo(marcado_inicial_tuple, habilitadas_iniciales):
+            return True, []
+        estimado = heuristica(marcado_inicial_tuple, habilitadas_iniciales)
+        if estimado is None:
+            return False, None
+
+        # (costo estimado total, disparos fuera de la guía, orden de llegada,
+        #  disparos desde la raíz, id, habilitadas)
+        abiertos = [(estimado, 0, 0, 0, id_inicial, habilitadas_iniciales)]
+        llegada = 1
+        while abiertos:
+            _, desvios, _, costo, id_actual, habilitadas = heapq.heappop(abiertos)
+            marcado = visitados.marcado(id_actual)
+            disparables = self.conjunto_obstinado(marcado, habilitadas) if reduccion else habilitadas
+            for transicion in disparables:
+                _, nuevo_marcado, nuevas_habilitadas = self.disparar_incremental(transicion, habilitadas, marcado)
+                nuevo_id, es_nuevo = visitados.agregar(nuevo_marcado, id_actual, transicion)
+                if not es_nuevo:
+                    continue
+                if es_objetivo(nuevo_marcado, nuevas_habilitadas):
+                    return True, visitados.secuencia(nuevo_id)
+                if max_estados is not None and len(visitados) >= max_estados:
+                    return None, None
+                estimado = heuristica(nuevo_marcado, nuevas_habilitadas)
+                if estimado is not None:
+                    nuevos_desvios = desvios + (guia is not None and transicion not in guia)
+                    heapq.heappush(abiertos, (costo + 1 + estimado, nuevos_desvios, llegada,
+                                              costo + 1, nuevo_id, nuevas_habilitadas))
+                    llegada += 1
+        return False, None
+
+    def _cambio_maximo(self, solo_aumentos=False):
+        """Para cada lugar, lo más que puede cambiar (o aumentar) con un disparo"""
+        maximo = [0] * self.n_lugares
+        for t in range(self.n_transiciones):
+            for p, c in self.cambios[t]:
+                cambio = c if solo_aumentos else abs(c)
+                if cambio > maximo[p]:
+                    maximo[p] = cambio
+        return maximo
+
+    def verificar_ecuacion_estado(self, objetivo, cubrir=False, **opciones):
+        """
+        Filtro de la ecuación de estado M = M0 + C·x (ver ecuacion_estado.verificar). Los
+        P-invariantes se calculan una vez por red y descartan objetivos aun sin scipy,
+        que se carga recién aquí.
+
+        Returns:
+            tuple: (resultado, x): False si el objetivo es seguro inalcanzable (o no
+                   cubrible), True con el vector de disparos x, o None si no se decidió
+        """
+        # se importa al usarlo: scipy solo hace falta para este filtro opcional
+        import ecuacion_estado
+        if self._p_invariantes is None:
+            self._p_invariantes = base_p_invariantes(self.C)
+        return ecuacion_estado.verificar(self.C, self.marcado_inicial, a_marcado_numerico(objetivo),
+                                         cubrir, self._p_invariantes, **opciones)
+
+    @staticmethod
+    def _guia_desde(x):
+        """Transiciones que aparecen en una solución de la ecuación de estado"""
+        if x is None:
+            return None
+        from ecuacion_estado import TOLERANCIA
+        return {t for t, veces in enumerate(x) if veces > TOLERANCIA}
+
+    def alcanzable(self, objetivo, max_estados=None, ecuacion=True):
+        """
+        Decide si un marcado es alcanzable desde el marcado inicial con A*: la heurística es
+        max_p ceil(|objetivo(p) - M(p)| / cambio máximo de p por disparo), que nunca
+        sobreestima, y los marcados desde los que un lugar sin cambios no puede llegar a su
+        valor se podan. En redes no acotadas conviene dar max_estados.
+        Antes de explorar se revisa la ecuación de estado: si no tiene solución entera se
+        responde que no sin buscar, y si la tiene sus transiciones guían la búsqueda.
+        objetivo: Marcado buscado (sin ω)
+        ecuacion: Usar el filtro de la ecuación de estado
+
+        Returns:
+            tuple: (resultado, secuencia) como _busqueda_guiada
+        """
+        objetivo = tuple(objetivo)
+        if len(objetivo) != self.n_lugares or OMEGA in a_marcado_numerico(objetivo):
+            raise ValueError("El objetivo debe ser un marcado finito con un valor por lugar")
+        guia = None
+        if ecuacion:
+            resultado, x = self.verificar_ecuacion_estado(objetivo)
+            if resultado is False:
+                return False, None
+            guia = self._guia_desde(x)
+        maximo = self._cambio_maximo()
+
+        def heuristica(marcado, habilitadas):
+            estimado = 0
+            for p in range(self.n_lugares):
+                diferencia = abs(objetivo[p] - marcado[p])
+                if diferencia:
+                    if not maximo[p]:
+                        return None
+                    estimado = max(estimado, -(-diferencia // maximo[p]))
+            return estimado
+
+        return self._busqueda_guiada(lambda marcado, habilitadas: tuple(marcado) == objetivo,
+                                     heuristica, max_estados, guia=guia)
+
+    def cubrible(self, objetivo, max_estados=None, ecuacion=True):
+        """
+        Decide si existe un marcado alcanzable M >= objetivo con A*, estimando los disparos
+        que faltan para cubrir el lugar con más déficit. La secuencia es un disparo real.
+        En redes no acotadas la búsqueda puede no terminar si la respuesta es no; para una
+        respuesta siempre finita usar GrafoCobertura.cubrible.
+        ecuacion: Descartar antes con la desigualdad M0 + C·x >= objetivo (requiere scipy)
+
+        Returns:
+            tuple: (resultado, secuencia) como _busqueda_guiada
+        """
+        objetivo = tuple(a_marcado_numerico(objetivo))
+        guia = None
+        if ecuacion and OMEGA not in objetivo:
+            resultado, x = self.verificar_ecuacion_estado(objetivo, cubrir=True)
+            if resultado is False:
+                return False, None
+            guia = self._guia_desde(x)
+        aumento = self._cambio_maximo(solo_aumentos=True)
+
+        def heuristica(marcado, habilitadas):
+            estimado = 0
+            for p in range(self.n_lugares):
+                deficit = objetivo[p] - marcado[p]
+                if deficit > 0:
+                    if not aumento[p]:
+                        return None
+                    estimado = max(estimado, -(-deficit // aumento[p]))
+            return estimado
+
+        return self._busqueda_guiada(
+            lambda marcado, habilitadas: all(x >= y for x, y in zip(marcado, objetivo)),
+            heuristica, max_estados, guia=guia)
+
+    def existe_bloqueo(self, max_estados=None, reduccion=True, estrategia='guiada'):
+        """
+        Busca un marcado alcanzable sin transiciones habilitadas, expandiendo primero los
+        marcados con menos habilitadas. Con reduccion solo se disparan conjuntos obstinados,
+        que conservan todos los bloqueos alcanzables.
+        estrategia: 'guiada' (A*) o 'profundidad', que baja por un solo camino a la vez y
+                    usa memoria proporcional a su largo más los visitados
+
+        Returns:
+            tuple: (resultado, secuencia) como _busqueda_guiada
+        """
+        if estrategia == 'profundidad':
+            visitados = AlmacenEstados()
+            for paso in self._pasos_en_profundidad(None, visitados, reduccion):
+                if paso[0] != 'nuevo':
+                    continue
+                if not paso[6]:
+                    return True, visitados.secuencia(paso[1])
+                if max_estados is not None and len(visitados) >= max_estados:
+                    return None, None
+            return False, None
+        if estrategia != 'guiada':
+            raise ValueError(f"Estrategia desconocida: {estrategia}")
+        return self._busqueda_guiada(lambda marcado, habilitadas: not habilitadas,
+                                     lambda marcado, habilitadas: len(habilitadas),
+                                     max_estados, reduccion)
+
+    def crear_ejecutor(self, procesos=None):
+        """
+        Crea un pool de procesos donde cada trabajador tiene su propia copia de la red
+        procesos: Número de procesos (por defecto, uno por núcleo)
+        """
+        return ProcessPoolExecutor(max_workers=procesos,
+                                   initializer=_inicializar_trabajador,
+                                   initargs=(self.pre, self.post))
+
+    def sucesores_en_paralelo(self, ejecutor, marcados, tam_bloque=256):
+        """
+        Reparte los marcados en bloques entre los procesos del ejecutor
+        ejecutor: Pool creado con crear_ejecutor
+        marcados: Lista de marcados (tuplas) a expandir
+        tam_bloque: Marcados por tarea enviada a un proceso
+
+        Returns:
+            list: Para cada marcado, en el mismo orden, la lista [(transicion, sucesor), ...]
+        """
+        bloques = [marcados[i:i + tam_bloque] for i in range(0, len(marcados), tam_bloque)]
+        resultado = []
+        # map conserva el orden de los bloques, así el resultado es determinista
+        for sucesores_bloque in ejecutor.map(_expandir_bloque, bloques):
+            resultado.extend(sucesores_bloque)
+        return resultado
+
+    def busqueda_por_anchura_paralela(self, max_profundidad=10, procesos=None, tam_bloque=256):
+        """
+        Búsqueda por anchura sincronizada por niveles: cada nivel de la frontera se reparte
+        entre un pool de procesos que calculan habilitadas y sucesores, y este proceso
+        los une en visitados en el mismo orden que la búsqueda secuencial
+        max_profundidad: Profundidad máxima a explorar (None para no limitarla)
+        procesos: Número de procesos (por defecto, uno por núcleo)
+        tam_bloque: Marcados por tarea enviada a un proceso
+
+        Returns:
+            AlmacenEstados: El mismo almacén que busqueda_por_anchura
+        """
+        visitados = AlmacenEstados()
+        id_inicial, _ = visitados.agregar(self.marcado_inicial)
+        nivel = [tuple(self.marcado_inicial)]
+        ids_nivel = [id_inicial]
+        profundidad = 0
+
+        with self.crear_ejecutor(procesos) as ejecutor:
+            while nivel and (max_profundidad is None or profundidad < max_profundidad):
+                siguiente_nivel = []
+                siguientes_ids = []
+                sucesores_nivel = self.sucesores_en_paralelo(ejecutor, nivel, tam_bloque)
+                for id_actual, sucesores in zip(ids_nivel, sucesores_nivel):
+                    for transicion, nuevo_marcado_tuple in sucesores:
+                        nuevo_id, es_nuevo = visitados.agregar(nuevo_marcado_tuple, id_actual, transicion)
+                        if es_nuevo:
+                            siguiente_nivel.append(nuevo_marcado_tuple)
+                            siguientes_ids.append(nuevo_id)
+                nivel = siguiente_nivel
+                ids_nivel = siguientes_ids
+                profundidad += 1
 
         return visitados
 
@@ -154,22 +948,45 @@ class RedPetri:
         print("ÁRBOL DE ALCANCE - BÚSQUEDA POR ANCHURA")
 
         for i, (marcado, info) in enumerate(arbol.items()):
-            padre_str = f"Padre: {info['padre']}" if info['padre'] else "INICIAL"
+            padre_str = f"Padre: {formatear_marcado(info['padre'])}" if info['padre'] else "INICIAL"
             transicion_str = f"Transición: T{info['transicion']}" if info['transicion'] is not None else ""
-            print(f"M{i}: {marcado} | {padre_str} | {transicion_str}")
+            print(f"M{i}: {formatear_marcado(marcado)} | {padre_str} | {transicion_str}")
 
-    def mostrar_estado(self):
-        """Muestra el estado actual de la red"""
-        print(f"\nMarcado actual: {self.marcado_actual}")
-        print(f"Transiciones habilitadas: {self.transiciones_habilitadas()}")
+    def mostrar_estado(self, habilitadas=None):
+        """
+        Muestra el estado actual de la red
+        habilitadas: Transiciones habilitadas ya conocidas (opcional, si no se calculan)
+        """
+        if habilitadas is None:
+            habilitadas = self.transiciones_habilitadas()
+        print(f"\nMarcado actual: {formatear_marcado(self.marcado_actual)}")
+        print(f"Transiciones habilitadas: {habilitadas}")
 
     def mostrar_estado_primero(self, mk):
-        self.marcado_actual = mk
+        self.marcado_actual = a_marcado_numerico(mk)
         """Muestra el estado actual de la red en la primera iteración"""
-        print(f"\nMarcado actual: {self.marcado_actual}")
+        print(f"\nMarcado actual: {formatear_marcado(self.marcado_actual)}")
         print(f"Transiciones habilitadas: {self.transiciones_habilitadas()}")
 
 
+# Red de cada proceso trabajador de busqueda_por_anchura_paralela
+_red_trabajador = None
+
+
+def _inicializar_trabajador(pre, post):
+    global _red_trabajador
+    _red_trabajador = RedPetri(pre, post, [0] * len(pre))
+
+
+def _expandir_bloque(bloque):
+    """Calcula en un proceso trabajador los sucesores de un bloque de marcados"""
+    red = _red_trabajador
+    return [
+        [(t, tuple(red._sucesor(t, marcado))) for t in red._calcular_habilitadas(marcado)]
+        for marcado in bloque
+    ]
+
+
 def simulador_red_petri():
     # DATOS PREDEFINIDOS
     pre = [
@@ -244,13 +1061,12 @@ def simulador_red_petri():
     # Ciclo interactivo de simulación
     print("MODO INTERACTIVO")
     red.mostrar_estado_primero(marcado_inicial)
+    # Las habilitadas se calculan una vez y luego se actualizan al disparar
+    habilitadas = red.transiciones_habilitadas()
     paso = 1
     while True:
         print(f"\n--- Paso {paso} ---")
-        red.mostrar_estado()
-
-        # Obtener transiciones habilitadas
-        habilitadas = red.transiciones_habilitadas()
+        red.mostrar_estado(habilitadas)
 
         # Si no hay transiciones habilitadas, fin de la simulación
         if not habilitadas:
@@ -271,7 +1087,7 @@ def simulador_red_petri():
                 print("Error: Por favor ingrese un número válido.")
 
         # Disparar la transición seleccionada
-        exito, nuevo_marcado = red.disparar(opcion)
+        exito, nuevo_marcado, habilitadas = red.disparar_incremental(opcion, habilitadas)
         if exito:
             print(f"Transición {opcion} disparada exitosamente")
             print(f"Nuevo marcado: {nuevo_marcado}")
@@ -1,5 +1,7 @@
 from collections import deque
 
+from Parte_I import OMEGA, a_marcado_numerico, formatear_marcado
+
 class GrafoCobertura:
     def __init__(self, red_petri):
         """
@@ -7,37 +9,30 @@ class GrafoCobertura:
         red_petri: Instancia de la clase RedPetri
         """
         self.red = red_petri
-        self.omega = 'ω'  # Representación simbólica de omega
+        self.omega = OMEGA  # omega codificado como el máximo entero
         self.red.cobertura = True
     
     def es_omega(self, valor):
         """Verifica si un valor representa omega"""
-        return valor == self.omega
-    
+        return valor == OMEGA
+
     def comparar_marcas(self, marca1, marca2):
         """
         Compara dos marcas considerando omega.
         Devuelve: -1 si marca1 < marca2, 0 si iguales, 1 si marca1 > marca2
         """
-        if marca1 == marca2:
-            return 0
-        
-        # Si ambos son omega, son iguales
-        if self.es_omega(marca1) and self.es_omega(marca2):
-            return 0
-        
-        # Omega es mayor que cualquier número finito
-        if self.es_omega(marca1) and not self.es_omega(marca2):
-            return 1
-        if not self.es_omega(marca1) and self.es_omega(marca2):
-            return -1
-        
-        # Comparación numérica normal
-        return -1 if marca1 < marca2 else 1
+        # omega es el máximo entero, así que es mayor que cualquier número finito
+        return (marca1 > marca2) - (marca1 < marca2)
     
-    def expandir_grafo_cobertura(self, max_profundidad=100):
+    def expandir_grafo_cobertura(self, max_profundidad=100, metricas=None, escritor=None):
         """
         Expande el grafo de cobertura completo
+        max_profundidad: Profundidad máxima a expandir (None para no limitarla)
+        metricas: Instancia de Metricas para seguir el progreso (opcional): nodos nuevos,
+                  duplicados, lugares que pasan a ω y tiempo por fase
+        escritor: EscritorGrafo de exportar.py (opcional); recibe cada arco al crearse y
+                  cada nodo cuando su tipo queda definido, así el archivo se escribe
+                  durante la expansión
         """
         marcado_inicial_tuple = tuple(self.red.marcado_inicial)
         
@@ -45,74 +40,98 @@ class GrafoCobertura:
         nodos = {}  # marcado_tuple -> información del nodo
         arcos = []  # lista de arcos (origen, destino, transicion)
         
-        # Inicializar con el nodo raíz
+        # Inicializar con el nodo raíz. Cada nodo guarda solo un apuntador a su padre;
+        # el camino completo se reconstruye con camino_desde_raiz cuando se necesita
         nodos[marcado_inicial_tuple] = {
             'tipo': 'frontera',
             'marcado': marcado_inicial_tuple,
             'profundidad': 0,
-            'camino_desde_raiz': [marcado_inicial_tuple]
+            'padre': None
         }
         
-        cola_frontera = deque([marcado_inicial_tuple])
+        # (marcado, habilitadas, minimos_ancestros): las habilitadas viajan con el marcado
+        # y se actualizan de forma incremental. minimos_ancestros[p] es el menor valor del
+        # lugar p entre los ancestros estrictos del nodo (OMEGA si no hay), así la regla 2
+        # se verifica en O(1) por lugar sin recorrer el camino
+        sin_ancestros = (OMEGA,) * len(marcado_inicial_tuple)
+        cola_frontera = deque([(marcado_inicial_tuple,
+                                self.red.transiciones_habilitadas(self.red.marcado_inicial),
+                                sin_ancestros)])
+        if metricas is not None:
+            metricas.comenzar()
+            metricas.nuevo_estado(0, 1)
         
         while cola_frontera:
-            marcado_actual_tuple = cola_frontera.popleft()
+            marcado_actual_tuple, habilitadas, minimos_ancestros = cola_frontera.popleft()
             
             # Verificar profundidad máxima
-            if nodos[marcado_actual_tuple]['profundidad'] >= max_profundidad:
+            if max_profundidad is not None and nodos[marcado_actual_tuple]['profundidad'] >= max_profundidad:
                 nodos[marcado_actual_tuple]['tipo'] = 'profundidad_maxima'
+                if escritor is not None:
+                    escritor.nodo(marcado_actual_tuple, 'profundidad_maxima')
                 continue
                 
             nodo_actual = nodos[marcado_actual_tuple]
             marcado_actual = list(marcado_actual_tuple)
             
-            # Verificar si es nodo duplicado (existe nodo no-frontera con mismo marcado)
-            es_duplicado = False
-            for marcado_tuple, info_nodo in nodos.items():
-                if (marcado_tuple == marcado_actual_tuple and 
-                    info_nodo['tipo'] != 'frontera' and 
-                    marcado_tuple != marcado_actual_tuple):
-                    es_duplicado = True
-                    break
-            
-            if es_duplicado:
-                nodos[marcado_actual_tuple]['tipo'] = 'duplicado'
-                continue
-            
-            # Obtener transiciones habilitadas usando la Red de Petri
-            habilitadas = self.red.transiciones_habilitadas(marcado_actual)
+            # Los duplicados se detectan por hash: nodos está indexado por marcado y cada
+            # marcado entra a la cola una sola vez, así que no hace falta recorrer nodos
             
             # Si ninguna transición está habilitada, es nodo terminal
             if not habilitadas:
                 nodos[marcado_actual_tuple]['tipo'] = 'terminal'
+                if escritor is not None:
+                    escritor.nodo(marcado_actual_tuple, 'terminal')
                 continue
             
             # Expandir para cada transición habilitada
             for transicion in habilitadas:
-                # Disparar transición (obtener marcado base)
-                exito, nuevo_marcado_base = self.red.disparar(transicion, marcado_actual)
+                # Disparar transición (obtener marcado base y sus habilitadas)
+                if metricas is None:
+                    exito, nuevo_marcado_base, nuevas_habilitadas = self.red.disparar_incremental(
+                        transicion, habilitadas, marcado_actual
+                    )
+                else:
+                    exito, nuevo_marcado_base, nuevas_habilitadas = self.red.disparar_medido(
+                        transicion, habilitadas, marcado_actual, metricas
+                    )
                 
                 if not exito:
                     continue
                 
                 # Aplicar reglas del grafo de cobertura
+                if metricas is not None:
+                    inicio = metricas.iniciar('reglas_cobertura')
                 nuevo_marcado = self._aplicar_reglas_cobertura(
-                    marcado_actual, nuevo_marcado_base, nodo_actual['camino_desde_raiz']
+                    marcado_actual, nuevo_marcado_base, minimos_ancestros
                 )
+                if metricas is not None:
+                    metricas.terminar('reglas_cobertura', inicio)
+                    if nuevo_marcado != nuevo_marcado_base:
+                        metricas.omegas(sum(1 for a, b in zip(nuevo_marcado, nuevo_marcado_base) if a != b))
                 
                 nuevo_marcado_tuple = tuple(nuevo_marcado)
                 
                 # Crear nuevo nodo si no existe
                 if nuevo_marcado_tuple not in nodos:
-                    nuevo_camino = nodo_actual['camino_desde_raiz'] + [nuevo_marcado_tuple]
-                    
                     nodos[nuevo_marcado_tuple] = {
                         'tipo': 'frontera',
                         'marcado': nuevo_marcado_tuple,
                         'profundidad': nodo_actual['profundidad'] + 1,
-                        'camino_desde_raiz': nuevo_camino
+                        'padre': marcado_actual_tuple
                     }
-                    cola_frontera.append(nuevo_marcado_tuple)
+                    # los lugares que pasaron a omega pueden habilitar a sus consumidoras
+                    if nuevo_marcado != nuevo_marcado_base:
+                        revisar = {t for p in range(len(nuevo_marcado)) if nuevo_marcado[p] != nuevo_marcado_base[p]
+                                   for t in self.red.consumidoras[p]}
+                        nuevas_habilitadas = self.red.actualizar_habilitadas(nuevas_habilitadas, nuevo_marcado, revisar)
+                    # el nodo actual pasa a ser ancestro estricto del nuevo
+                    minimos_hijo = tuple(map(min, minimos_ancestros, marcado_actual_tuple))
+                    cola_frontera.append((nuevo_marcado_tuple, nuevas_habilitadas, minimos_hijo))
+                    if metricas is not None:
+                        metricas.nuevo_estado(nodo_actual['profundidad'] + 1, len(cola_frontera))
+                elif metricas is not None:
+                    metricas.duplicado()
                 
                 # Agregar arco
                 arcos.append({
@@ -120,45 +139,320 @@ class GrafoCobertura:
                     'destino': nuevo_marcado_tuple,
                     'transicion': transicion
                 })
+                if escritor is not None:
+                    escritor.arco(marcado_actual_tuple, nuevo_marcado_tuple, transicion)
             
             # Marcar nodo actual como expandido
             nodos[marcado_actual_tuple]['tipo'] = 'expandido'
+            if escritor is not None:
+                escritor.nodo(marcado_actual_tuple, 'expandido')
         
+        if metricas is not None:
+            metricas.finalizar()
+        return nodos, arcos
+
+    def expandir_grafo_cobertura_paralelo(self, max_profundidad=100, procesos=None, tam_bloque=256):
+        """
+        Expande el grafo de cobertura por niveles repartiendo cada nivel de la frontera
+        entre un pool de procesos. Los procesos calculan los sucesores base y este proceso
+        aplica las reglas de cobertura en el mismo orden que expandir_grafo_cobertura,
+        así que el resultado es idéntico
+        max_profundidad: Profundidad máxima a expandir (None para no limitarla)
+        procesos: Número de procesos (por defecto, uno por núcleo)
+        tam_bloque: Marcados por tarea enviada a un proceso
+        """
+        marcado_inicial_tuple = tuple(self.red.marcado_inicial)
+
+        nodos = {}
+        arcos = []
+        nodos[marcado_inicial_tuple] = {
+            'tipo': 'frontera',
+            'marcado': marcado_inicial_tuple,
+            'profundidad': 0,
+            'padre': None
+        }
+
+        # (marcado, minimos_ancestros) de cada nodo del nivel actual
+        nivel = [(marcado_inicial_tuple, (OMEGA,) * len(marcado_inicial_tuple))]
+        profundidad = 0
+
+        with self.red.crear_ejecutor(procesos) as ejecutor:
+            while nivel:
+                if max_profundidad is not None and profundidad >= max_profundidad:
+                    for marcado_tuple, _ in nivel:
+                        nodos[marcado_tuple]['tipo'] = 'profundidad_maxima'
+                    break
+
+                siguiente_nivel = []
+                sucesores_nivel = self.red.sucesores_en_paralelo(
+                    ejecutor, [marcado_tuple for marcado_tuple, _ in nivel], tam_bloque
+                )
+                for (marcado_actual_tuple, minimos_ancestros), sucesores in zip(nivel, sucesores_nivel):
+                    if not sucesores:
+                        nodos[marcado_actual_tuple]['tipo'] = 'terminal'
+                        continue
+
+                    for transicion, nuevo_marcado_base in sucesores:
+                        nuevo_marcado_tuple = tuple(self._aplicar_reglas_cobertura(
+                            marcado_actual_tuple, list(nuevo_marcado_base), minimos_ancestros
+                        ))
+
+                        if nuevo_marcado_tuple not in nodos:
+                            nodos[nuevo_marcado_tuple] = {
+                                'tipo': 'frontera',
+                                'marcado': nuevo_marcado_tuple,
+                                'profundidad': profundidad + 1,
+                                'padre': marcado_actual_tuple
+                            }
+                            minimos_hijo = tuple(map(min, minimos_ancestros, marcado_actual_tuple))
+                            siguiente_nivel.append((nuevo_marcado_tuple, minimos_hijo))
+
+                        arcos.append({
+                            'origen': marcado_actual_tuple,
+                            'destino': nuevo_marcado_tuple,
+                            'transicion': transicion
+                        })
+
+                    nodos[marcado_actual_tuple]['tipo'] = 'expandido'
+
+                nivel = siguiente_nivel
+                profundidad += 1
+
         return nodos, arcos
+
+    def camino_desde_raiz(self, nodos, marcado):
+        """
+        Reconstruye el camino desde la raíz hasta un nodo siguiendo los apuntadores al padre
+
+        Returns:
+            list: Marcados desde el nodo raíz hasta marcado (inclusive)
+        """
+        camino = []
+        actual = tuple(marcado)
+        while actual is not None:
+            camino.append(actual)
+            actual = nodos[actual]['padre']
+        camino.reverse()
+        return camino
     
-    def _aplicar_reglas_cobertura(self, marcado_k, marcado_z_base, camino_n0_a_nk):
+    def expandir_cobertura_minima(self):
+        """
+        Calcula el conjunto mínimo de cobertura (estilo MinCov / MP).
+        Construye un árbol de Karp-Miller acelerando contra todos los ancestros y mantiene
+        una anticadena con los marcados omega maximales: un sucesor cubierto por un nodo
+        de la anticadena se poda, y los nodos que un sucesor nuevo cubre salen de ella.
+
+        Returns:
+            tuple: (nodos, arcos) con la misma forma que expandir_grafo_cobertura.
+                   Los nodos son los de la anticadena; cada arco va al nodo de la
+                   anticadena que cubre al sucesor. 'padre' es el ancestro más cercano
+                   que sigue en la anticadena.
+        """
+        arbol = self._arbol_minimo()
+        marcados = arbol['marcados']
+        padres = arbol['padres']
+        profundidades = arbol['profundidades']
+        anticadena = arbol['anticadena']
+        habilitadas_de = arbol['habilitadas_de']
+
+        nodos = {}
+        for nodo, marcado in anticadena.items():
+            padre = padres[nodo]
+            while padre is not None and padre not in anticadena:
+                padre = padres[padre]
+            nodos[marcado] = {
+                'tipo': 'expandido' if habilitadas_de[nodo] else 'terminal',
+                'marcado': marcado,
+                'profundidad': profundidades[nodo],
+                'padre': marcados[padre] if padre is not None else None
+            }
+
+        # Arcos: cada sucesor va al nodo igual o, si no existe, al primero que lo cubre
+        arcos = []
+        for nodo, marcado in anticadena.items():
+            for transicion in habilitadas_de[nodo]:
+                sucesor = tuple(self.red.disparar_incremental(transicion, habilitadas_de[nodo], marcado)[1])
+                if sucesor not in nodos:
+                    sucesor = next(m for m in anticadena.values() if self._cubre(m, sucesor))
+                arcos.append({
+                    'origen': marcado,
+                    'destino': sucesor,
+                    'transicion': transicion
+                })
+
+        return nodos, arcos
+
+    def _arbol_minimo(self, detener=None):
+        """
+        Árbol de Karp-Miller con la poda de MinCov (ver expandir_cobertura_minima)
+        detener: Función marcado -> bool (opcional); la construcción se detiene en cuanto
+                 un nodo nuevo (o la raíz) la cumple
+
+        Returns:
+            dict: marcados, padres, transiciones y profundidades de todos los nodos del
+                  árbol (también los podados, que siguen sirviendo para acelerar), la
+                  anticadena id -> marcado, las habilitadas de cada nodo expandido y el
+                  id del nodo que cumplió detener (None si no se detuvo)
+        """
+        marcados = [tuple(self.red.marcado_inicial)]
+        padres = [None]
+        transiciones = [None]
+        profundidades = [0]
+
+        anticadena = {0: marcados[0]}  # id de nodo -> marcado, solo los maximales
+        frontera = deque([(0, self.red.transiciones_habilitadas(self.red.marcado_inicial))])
+        habilitadas_de = {}
+        arbol = {
+            'marcados': marcados,
+            'padres': padres,
+            'transiciones': transiciones,
+            'profundidades': profundidades,
+            'anticadena': anticadena,
+            'habilitadas_de': habilitadas_de,
+            'detenido': None
+        }
+        if detener is not None and detener(marcados[0]):
+            arbol['detenido'] = 0
+            return arbol
+
+        while frontera:
+            nodo, habilitadas = frontera.popleft()
+            # pudo salir de la anticadena mientras esperaba en la frontera
+            if nodo not in anticadena:
+                continue
+            habilitadas_de[nodo] = habilitadas
+            marcado = marcados[nodo]
+
+            for transicion in habilitadas:
+                _, marcado_base, nuevas_habilitadas = self.red.disparar_incremental(
+                    transicion, habilitadas, marcado
+                )
+                nuevo_marcado = self._acelerar(marcado_base, nodo, marcados, padres)
+
+                # Poda: un nodo de la anticadena ya cubre al sucesor
+                if any(self._cubre(otro, nuevo_marcado) for otro in anticadena.values()):
+                    continue
+
+                # El sucesor reemplaza a los nodos que cubre
+                for otro in [n for n, m in anticadena.items() if self._cubre(nuevo_marcado, m)]:
+                    del anticadena[otro]
+
+                if nuevo_marcado != marcado_base:
+                    revisar = {t for p in range(len(nuevo_marcado)) if nuevo_marcado[p] != marcado_base[p]
+                               for t in self.red.consumidoras[p]}
+                    nuevas_habilitadas = self.red.actualizar_habilitadas(nuevas_habilitadas, nuevo_marcado, revisar)
+
+                nuevo = len(marcados)
+                marcados.append(tuple(nuevo_marcado))
+                padres.append(nodo)
+                transiciones.append(transicion)
+                profundidades.append(profundidades[nodo] + 1)
+                anticadena[nuevo] = marcados[nuevo]
+                frontera.append((nuevo, nuevas_habilitadas))
+
+                if detener is not None and detener(marcados[nuevo]):
+                    arbol['detenido'] = nuevo
+                    return arbol
+
+                # si el sucesor cubrió al nodo actual, sus demás sucesores quedan cubiertos
+                if nodo not in anticadena:
+                    break
+
+
+        return arbol
+
+    def _secuencia_en_arbol(self, arbol, nodo):
+        """Transiciones desde la raíz del árbol hasta el nodo"""
+        secuencia = []
+        while arbol['padres'][nodo] is not None:
+            secuencia.append(arbol['transiciones'][nodo])
+            nodo = arbol['padres'][nodo]
+        secuencia.reverse()
+        return secuencia
+
+    def cubrible(self, objetivo):
+        """
+        Decide si algún marcado alcanzable cubre al objetivo. Se construye el árbol de
+        Karp-Miller con poda y se detiene en el primer nodo que lo cubre, así que la
+        respuesta siempre es finita aunque la red no sea acotada.
+
+        Returns:
+            tuple: (resultado, secuencia). Si un lugar del nodo testigo es ω, los ciclos
+                   de la secuencia que lo aumentan deben repetirse las veces necesarias
+        """
+        objetivo = tuple(a_marcado_numerico(objetivo))
+        arbol = self._arbol_minimo(detener=lambda marcado: self._cubre(marcado, objetivo))
+        if arbol['detenido'] is None:
+            return False, None
+        return True, self._secuencia_en_arbol(arbol, arbol['detenido'])
+
+    def acotado(self, lugar):
+        """
+        Decide si un lugar es acotado: no lo es si algún nodo del árbol de Karp-Miller
+        tiene ω en él, y la construcción se detiene ahí. Si es acotado, la cota es el
+        mayor valor del lugar en el árbol (que es el máximo alcanzable).
+
+        Returns:
+            tuple: (acotado, cota, secuencia): la cota es None si no es acotado y la
+                   secuencia lleva al nodo con ω (None si es acotado); como en cubrible,
+                   si pasa por otros ω sus ciclos deben repetirse para dispararla
+        """
+        if not 0 <= lugar < self.red.n_lugares:
+            raise ValueError(f"El lugar {lugar} no existe")
+        arbol = self._arbol_minimo(detener=lambda marcado: marcado[lugar] == OMEGA)
+        if arbol['detenido'] is not None:
+            return False, None, self._secuencia_en_arbol(arbol, arbol['detenido'])
+        return True, max(marcado[lugar] for marcado in arbol['marcados']), None
+
+    def _cubre(self, mayor, menor):
+        """Verifica mayor >= menor lugar por lugar (omega cubre a cualquier valor)"""
+        return all(x >= y for x, y in zip(mayor, menor))
+
+    def _acelerar(self, marcado_base, padre, marcados, padres):
+        """
+        Aceleración de Karp-Miller: si un ancestro (o el padre) es menor o igual al
+        sucesor, los lugares donde el sucesor es estrictamente mayor pasan a omega.
+        Se repite hasta que ningún ancestro produce omegas nuevos.
+        """
+        nuevo_marcado = list(marcado_base)
+        cambio = True
+        while cambio:
+            cambio = False
+            ancestro = padre
+            while ancestro is not None:
+                marcado_r = marcados[ancestro]
+                if self._cubre(nuevo_marcado, marcado_r):
+                    for p in range(len(nuevo_marcado)):
+                        if nuevo_marcado[p] != OMEGA and marcado_r[p] < nuevo_marcado[p]:
+                            nuevo_marcado[p] = OMEGA
+                            cambio = True
+                ancestro = padres[ancestro]
+        return nuevo_marcado
+
+    def _aplicar_reglas_cobertura(self, marcado_k, marcado_z_base, minimos_ancestros):
         """
         Aplica las reglas del grafo de cobertura para determinar el marcado final
+        minimos_ancestros: Para cada lugar, el menor valor entre los ancestros estrictos de n_k
         """
         nuevo_marcado = marcado_z_base.copy()
-        
-        for i in range(len(marcado_k)):
-            pi = i  # índice del lugar
-            
+
+        for pi in range(len(marcado_k)):
+            mk = marcado_k[pi]
+
             # Regla 1: Si μ_k(pi) = ω, entonces μ_z(pi) = ω
-            if self.es_omega(marcado_k[pi]):
-                nuevo_marcado[pi] = self.omega
+            if mk == OMEGA:
+                nuevo_marcado[pi] = OMEGA
                 continue
-            
+
             # Regla 2: Si existe n_r en el camino de n_0 a n_k con μ_r(pi) < μ_k(pi)
             # y μ_k(pi) < μ_z_base(pi), entonces μ_z(pi) = ω
 
             # verifica crecimiento μ_k(pi) < μ_z_base(pi) solo si μ_z_base(pi) es finito
-            crecimiento = (not self.es_omega(marcado_z_base[pi]) and
-                           self.comparar_marcas(marcado_k[pi], nuevo_marcado[pi]) == -1)
-            if crecimiento:
-                existe_nr_con_condicion = False
-            
-                # itera sobre los predecesores, excluye el ultimo elemento μ_k
-                for marcado_r_tuple in camino_n0_a_nk[:-1]:
-                    marcado_r = list(marcado_r_tuple)
-
-                    if (not self.es_omega(marcado_r[pi]) and
-                        self.comparar_marcas(marcado_r[pi], marcado_k[pi]) <= 0):
-                        existe_nr_con_condicion = True
-                        break
-                if existe_nr_con_condicion:
-                    nuevo_marcado[pi] = self.omega
+            if marcado_z_base[pi] != OMEGA and mk < marcado_z_base[pi]:
+                # existe un predecesor con μ_r(pi) <= μ_k(pi) si y solo si el mínimo de los
+                # predecesores lo cumple; como μ_k(pi) es finito, un mínimo omega no cuenta
+                if minimos_ancestros[pi] <= mk:
+                    nuevo_marcado[pi] = OMEGA
         
         return nuevo_marcado
     
@@ -168,21 +462,23 @@ class GrafoCobertura:
         
         print("\nNODOS DEL GRAFO:")
         for marcado, info in nodos.items():
-            # Convertir tupla a lista para mostrar omega claramente
-            marcado_str = [f"'{x}'" if self.es_omega(x) else str(x) for x in marcado]
-            print(f"Nodo: [{', '.join(marcado_str)}]")
+            # Convertir a lista para mostrar omega claramente
+            print(f"Nodo: {formatear_marcado(list(marcado))}")
             print(f"  Tipo: {info['tipo']}")
             print(f"  Profundidad: {info['profundidad']}")
             print()
         
         print("\nARCOS DEL GRAFO:")
         for arco in arcos:
-            origen_str = [f"'{x}'" if self.es_omega(x) else str(x) for x in arco['origen']]
-            destino_str = [f"'{x}'" if self.es_omega(x) else str(x) for x in arco['destino']]
-            print(f"[{', '.join(origen_str)}] --[t{arco['transicion']}]--> [{', '.join(destino_str)}]")
+            origen_str = formatear_marcado(list(arco['origen']))
+            destino_str = formatear_marcado(list(arco['destino']))
+            print(f"{origen_str} --[t{arco['transicion']}]--> {destino_str}")
 
-    def obtener_estadisticas(self, nodos, arcos):
-        """Obtiene estadísticas del grafo de cobertura"""
+    def obtener_estadisticas(self, nodos, arcos, metricas=None):
+        """
+        Obtiene estadísticas del grafo de cobertura
+        metricas: Metricas usadas en la expansión (opcional); agrega tiempos y contadores
+        """
         estadisticas = {
             'total_nodos': len(nodos),
             'nodos_expandidos': 0,
@@ -200,7 +496,13 @@ class GrafoCobertura:
                 estadisticas[f'nodos_{tipo}'] += 1
             
             # Contar nodos que contienen al menos un omega
-            if any(self.es_omega(x) for x in marcado):
+            if OMEGA in marcado:
                 estadisticas['nodos_con_omega'] += 1
+
+        if metricas is not None:
+            resumen = metricas.resumen()
+            for clave in ('tiempo_total', 'tiempo_habilitacion', 'tiempo_disparo', 'tiempo_reglas_cobertura',
+                          'estados_por_segundo', 'duplicados', 'introducciones_omega', 'max_frontera'):
+                estadisticas[clave] = resumen[clave]
         
         return estadisticas
\ No newline at end of file
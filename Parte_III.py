@@ -0,0 +1,363 @@
+from array import array
+
+from Parte_I import OMEGA
+
+NIVELES = ('L0', 'L1', 'L3', 'L4')
+
+
+class GrafoCSR:
+    """
+    Grafo de alcance o de cobertura compilado a CSR: nodos con ids enteros y, para cada
+    nodo v, sus arcos en las posiciones inicios[v]..inicios[v+1]-1 de destinos y
+    transiciones. Todo se guarda en arreglos planos, sin un diccionario por arco, así que
+    sirve para grafos con millones de arcos.
+
+    Sobre él se calculan las componentes fuertemente conexas (Tarjan iterativo, sin
+    recursión), las componentes terminales y la vivacidad de cada transición. Las
+    respuestas son exactas cuando el grafo es el de alcance (sin nodos ω y cada arco al
+    sucesor real, ver desde_alcance). Con nodos ω un nodo resume infinitos marcados y
+    solo L0 y L1 son exactos: analizar no responde bloqueos, reversibilidad, estados
+    hogar ni L3/L4. Con expandir_cobertura_minima, que manda arcos al nodo que cubre al
+    sucesor, también son una aproximación.
+    """
+
+    def __init__(self, inicios, destinos, transiciones, marcados=None, tipos=None, raiz=0,
+                 con_omega=False):
+        """
+        inicios: n_nodos + 1 desplazamientos
+        destinos, transiciones: Un elemento por arco, agrupados por origen
+        marcados: Marcado de cada nodo (opcional, solo para mostrar)
+        tipos: Tipo de cada nodo como en expandir_grafo_cobertura (opcional); los nodos
+               'frontera' o 'profundidad_maxima' no se expandieron
+        raiz: Id del marcado inicial
+        con_omega: Si algún nodo tiene ω (grafo de cobertura de una red no acotada)
+        """
+        self.inicios = inicios
+        self.destinos = destinos
+        self.transiciones = transiciones
+        self.marcados = marcados
+        self.tipos = tipos
+        self.raiz = raiz
+        self.con_omega = con_omega
+        self.n_nodos = len(inicios) - 1
+        self.componente = None
+        self.n_componentes = 0
+
+    @classmethod
+    def desde_grafo(cls, nodos, arcos, marcado_inicial=None):
+        """
+        Compila la salida de expandir_grafo_cobertura (o expandir_cobertura_minima)
+        marcado_inicial: Raíz del grafo; por defecto el primer nodo sin padre
+        """
+        marcados = list(nodos)
+        ids = {marcado: i for i, marcado in enumerate(marcados)}
+        n_nodos = len(marcados)
+
+        # ordenamiento por conteo de los arcos según su origen
+        inicios = array('q', [0]) * (n_nodos + 1)
+        for arco in arcos:
+            inicios[ids[arco['origen']] + 1] += 1
+        for v in range(n_nodos):
+            inicios[v + 1] += inicios[v]
+        posicion = array('q', inicios)
+        destinos = array('q', [0]) * len(arcos)
+        transiciones = array('q', [0]) * len(arcos)
+        for arco in arcos:
+            origen = ids[arco['origen']]
+            k = posicion[origen]
+            destinos[k] = ids[arco['destino']]
+            transiciones[k] = arco['transicion']
+            posicion[origen] = k + 1
+
+        if marcado_inicial is not None:
+            raiz = ids[tuple(marcado_inicial)]
+        else:
+            raiz = next((i for i, m in enumerate(marcados) if nodos[m]['padre'] is None), 0)
+        tipos = [nodos[m]['tipo'] for m in marcados]
+        con_omega = any(OMEGA in m for m in marcados)
+        return cls(inicios, destinos, transiciones, marcados, tipos, raiz, con_omega)
+
+    @classmethod
+    def desde_alcance(cls, red, max_profundidad=None):
+        """
+        Grafo de alcance de la red: los marcados de busqueda_por_anchura y, para cada uno,
+        un arco por transición habilitada hacia su sucesor. No termina en redes no
+        acotadas; antes conviene revisar que el grafo de cobertura no tenga ω.
+        max_profundidad: Profundidad máxima (los marcados con sucesores fuera del límite
+                         quedan como 'profundidad_maxima')
+        """
+        visitados = red.busqueda_por_anchura(max_profundidad)
+        n_nodos = len(visitados)
+        inicios = array('q', [0])
+        destinos = array('q')
+        transiciones = array('q')
+        marcados = []
+        tipos = []
+        for v in range(n_nodos):
+            marcado = visitados.marcado(v)
+            marcados.append(marcado)
+            habilitadas = red.transiciones_habilitadas(marcado)
+            sucesores = [(t, visitados.id_de(red.disparar(t, marcado)[1])) for t in habilitadas]
+            if any(destino is None for _, destino in sucesores):
+                # un sucesor quedó fuera del límite de profundidad: nodo sin expandir
+                tipos.append('profundidad_maxima')
+            else:
+                for t, destino in sucesores:
+                    destinos.append(destino)
+                    transiciones.append(t)
+                tipos.append('expandido' if habilitadas else 'terminal')
+            inicios.append(len(destinos))
+        return cls(inicios, destinos, transiciones, marcados, tipos, 0)
+
+    @classmethod
+    def desde_guardado(cls, grafo):
+        """Compila un formato_binario.GrafoGuardado copiando sus arreglos, sin pasar por dicts"""
+        inicios, destinos, transiciones = grafo.arreglos_csr()
+        raiz = next((i for i in range(grafo.n_nodos) if grafo.padre(i) is None), 0)
+        tipos = [grafo.tipo(i) for i in range(grafo.n_nodos)]
+        con_omega = any(OMEGA in grafo.marcado(i) for i in range(grafo.n_nodos))
+        return cls(inicios, destinos, transiciones, tipos=tipos, raiz=raiz, con_omega=con_omega)
+
+    def __len__(self):
+        return self.n_nodos
+
+    def sucesores(self, nodo):
+        """
+        Returns:
+            list: [(transicion, nodo destino), ...]
+        """
+        return [(self.transiciones[k], self.destinos[k])
+                for k in range(self.inicios[nodo], self.inicios[nodo + 1])]
+
+    def completo(self):
+        """True si todos los nodos se expandieron (sin frontera ni profundidad máxima)"""
+        return self.tipos is None or all(t in ('expandido', 'terminal') for t in self.tipos)
+
+    def componentes_fuertes(self):
+        """
+        Tarjan iterativo en O(nodos + arcos). La pila de llamadas guarda solo el id del
+        nodo; el próximo arco a revisar de cada nodo está en un arreglo aparte.
+        Las componentes quedan numeradas en orden topológico inverso (las terminales
+        primero que las que llegan a ellas).
+
+        Returns:
+            array: Componente de cada nodo (también queda en self.componente)
+        """
+        n_nodos = self.n_nodos
+        inicios, destinos = self.inicios, self.destinos
+        indice = array('q', [-1]) * n_nodos
+        bajo = array('q', [0]) * n_nodos
+        componente = array('q', [-1]) * n_nodos
+        siguiente = array('q', inicios[:n_nodos])
+        en_pila = bytearray(n_nodos)
+        pila = array('q')
+        llamadas = array('q')
+        contador = 0
+        n_componentes = 0
+
+        for inicio in range(n_nodos):
+            if indice[inicio] != -1:
+                continue
+            indice[inicio] = bajo[inicio] = contador
+            contador += 1
+            pila.append(inicio)
+            en_pila[inicio] = 1
+            llamadas.append(inicio)
+
+            while llamadas:
+                v = llamadas[-1]
+                k = siguiente[v]
+                if k < inicios[v + 1]:
+                    siguiente[v] = k + 1
+                    w = destinos[k]
+                    if indice[w] == -1:
+                        indice[w] = bajo[w] = contador
+                        contador += 1
+                        pila.append(w)
+                        en_pila[w] = 1
+                        llamadas.append(w)
+                    elif en_pila[w] and indice[w] < bajo[v]:
+                        bajo[v] = indice[w]
+                    continue
+
+                # todos los arcos de v revisados: volver al llamador
+                llamadas.pop()
+                if llamadas and bajo[v] < bajo[llamadas[-1]]:
+                    bajo[llamadas[-1]] = bajo[v]
+                if bajo[v] == indice[v]:
+                    while True:
+                        w = pila.pop()
+                        en_pila[w] = 0
+                        componente[w] = n_componentes
+                        if w == v:
+                            break
+                    n_componentes += 1
+
+        self.componente = componente
+        self.n_componentes = n_componentes
+        return componente
+
+    def componentes_terminales(self):
+        """
+        Componentes de las que no sale ningún arco hacia otra
+
+        Returns:
+            list: Ids de las componentes terminales
+        """
+        if self.componente is None:
+            self.componentes_fuertes()
+        componente = self.componente
+        con_salida = bytearray(self.n_componentes)
+        for v in range(self.n_nodos):
+            c = componente[v]
+            for k in range(self.inicios[v], self.inicios[v + 1]):
+                if componente[self.destinos[k]] != c:
+                    con_salida[c] = 1
+                    break
+        return [c for c in range(self.n_componentes) if not con_salida[c]]
+
+    def vivacidad(self, n_transiciones=None):
+        """
+        Nivel de vivacidad de cada transición (el más alto que cumple):
+            L0: nunca se dispara (muerta)
+            L1: se dispara en alguna secuencia
+            L3: se dispara infinitas veces en alguna secuencia (arco dentro de un ciclo);
+                en un grafo finito incluye a L2
+            L4: viva, se puede disparar desde cualquier marcado alcanzable, es decir, tiene
+                un arco en cada componente terminal
+        n_transiciones: Número de transiciones de la red (por defecto, la mayor que aparece)
+
+        Returns:
+            list: 'L0', 'L1', 'L3' o 'L4' por transición
+        """
+        if n_transiciones is None:
+            n_transiciones = max(self.transiciones, default=-1) + 1
+        terminales = self.componentes_terminales()
+        componente = self.componente
+        es_terminal = bytearray(self.n_componentes)
+        for c in terminales:
+            es_terminal[c] = 1
+
+        disparada = bytearray(n_transiciones)
+        en_ciclo = bytearray(n_transiciones)
+        # cuántas componentes terminales tienen un arco de t; ultima evita contar dos veces
+        en_terminales = array('q', [0]) * n_transiciones
+        ultima = array('q', [-1]) * n_transiciones
+        for v in self._nodos_por_componente():
+            c = componente[v]
+            for k in range(self.inicios[v], self.inicios[v + 1]):
+                t = self.transiciones[k]
+                disparada[t] = 1
+                if componente[self.destinos[k]] == c:
+                    en_ciclo[t] = 1
+                    if es_terminal[c] and ultima[t] != c:
+                        ultima[t] = c
+                        en_terminales[t] += 1
+
+        niveles = []
+        for t in range(n_transiciones):
+            if terminales and en_terminales[t] == len(terminales):
+                niveles.append('L4')
+            elif en_ciclo[t]:
+                niveles.append('L3')
+            elif disparada[t]:
+                niveles.append('L1')
+            else:
+                niveles.append('L0')
+        return niveles
+
+    def _nodos_por_componente(self):
+        """Nodos agrupados por componente (ordenamiento por conteo)"""
+        if self.componente is None:
+            self.componentes_fuertes()
+        inicio = array('q', [0]) * (self.n_componentes + 1)
+        for c in self.componente:
+            inicio[c + 1] += 1
+        for c in range(self.n_componentes):
+            inicio[c + 1] += inicio[c]
+        orden = array('q', [0]) * self.n_nodos
+        for v, c in enumerate(self.componente):
+            orden[inicio[c]] = v
+            inicio[c] += 1
+        return orden
+
+    def bloqueos(self):
+        """Nodos expandidos sin arcos de salida"""
+        return [v for v in range(self.n_nodos)
+                if self.inicios[v] == self.inicios[v + 1] and
+                (self.tipos is None or self.tipos[v] == 'terminal')]
+
+    def es_reversible(self):
+        """True si desde todo marcado se puede volver al inicial (una sola componente)"""
+        if self.componente is None:
+            self.componentes_fuertes()
+        return self.n_componentes == 1
+
+    def estados_hogar(self):
+        """
+        Marcados alcanzables desde todos los demás: los de la única componente terminal,
+        o ninguno si hay más de una
+
+        Returns:
+            list: Ids de los nodos hogar
+        """
+        terminales = self.componentes_terminales()
+        if len(terminales) != 1:
+            return []
+        return [v for v in range(self.n_nodos) if self.componente[v] == terminales[0]]
+
+    def analizar(self, n_transiciones=None):
+        """
+        Returns:
+            dict: componentes, componentes_terminales, bloqueos, reversible, estados_hogar,
+                  vivacidad (nivel por transición), viva (todas L4), completo y con_omega.
+                  Con nodos ω bloqueos, reversible, estados_hogar y viva son None y la
+                  vivacidad solo distingue L0 de L1 (se dispara en alguna secuencia)
+        """
+        niveles = self.vivacidad(n_transiciones)
+        terminales = self.componentes_terminales()
+        if self.con_omega:
+            return {
+                'componentes': self.n_componentes,
+                'componentes_terminales': len(terminales),
+                'bloqueos': None,
+                'reversible': None,
+                'estados_hogar': None,
+                'vivacidad': ['L0' if nivel == 'L0' else 'L1' for nivel in niveles],
+                'viva': None,
+                'completo': self.completo(),
+                'con_omega': True
+            }
+        return {
+            'componentes': self.n_componentes,
+            'componentes_terminales': len(terminales),
+            'bloqueos': len(self.bloqueos()),
+            'reversible': self.es_reversible(),
+            'estados_hogar': len(self.estados_hogar()),
+            'vivacidad': niveles,
+            'viva': all(nivel == 'L4' for nivel in niveles),
+            'completo': self.completo(),
+            'con_omega': False
+        }
+
+
+def imprimir_vivacidad(resultado):
+    """Muestra el resultado de GrafoCSR.analizar"""
+    print("VIVACIDAD Y COMPONENTES")
+    if not resultado['completo']:
+        print("Aviso: el grafo tiene nodos sin expandir; los resultados son parciales")
+    if resultado.get('con_omega'):
+        print("Aviso: el grafo de cobertura tiene nodos ω; bloqueos, reversibilidad, "
+              "estados hogar y los niveles L3/L4 no se pueden decidir con él")
+    print(f"Componentes fuertemente conexas: {resultado['componentes']}")
+    print(f"Componentes terminales: {resultado['componentes_terminales']}")
+    if resultado.get('con_omega'):
+        for t, nivel in enumerate(resultado['vivacidad']):
+            print(f"  T{t}: {'L0' if nivel == 'L0' else 'L1 o más'}")
+        return
+    print(f"Bloqueos: {resultado['bloqueos']}")
+    print(f"Reversible: {'sí' if resultado['reversible'] else 'no'}")
+    print(f"Estados hogar: {resultado['estados_hogar']}")
+    for t, nivel in enumerate(resultado['vivacidad']):
+        print(f"  T{t}: {nivel}")
+    print(f"Red viva: {'sí' if resultado['viva'] else 'no'}")
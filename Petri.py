@@ -1,5 +1,10 @@
 from __init__ import *
 import  dibuja_red
+from analisis_estructural import analizar_red, imprimir_analisis
+from simulacion import simular, imprimir_simulacion
+from metricas import Metricas, imprimir_progreso
+from Parte_I import OMEGA
+from Parte_III import imprimir_vivacidad
 
 def salir(ans):
     """
@@ -30,13 +35,13 @@ def simulador_interactivo():
 
     # Ciclo interactivo
     red.mostrar_estado_primero(marcado_inicial)
+    # Las habilitadas se calculan una vez y luego se actualizan al disparar
+    habilitadas = red.transiciones_habilitadas()
     paso = 1
 
     while True:
         print(f"\n--- Paso {paso} ---")
-        red.mostrar_estado()
-
-        habilitadas = red.transiciones_habilitadas()
+        red.mostrar_estado(habilitadas)
 
         if not habilitadas:
             print("\n¡BLOQUEO! - No hay transiciones habilitadas")
@@ -45,7 +50,7 @@ def simulador_interactivo():
         try:
             opcion = int(input("¿Cuál transición desea disparar? "))
             if opcion in habilitadas:
-                exito, nuevo_marcado = red.disparar(opcion)
+                exito, nuevo_marcado, habilitadas = red.disparar_incremental(opcion, habilitadas)
                 if exito:
                     print(f"Transición {opcion} disparada exitosamente")
                     print(f"Nuevo marcado: {nuevo_marcado}")
@@ -75,18 +80,46 @@ def generar_grafo_cobertura():
     print("=" * 50)
     print("GENERANDO GRAFO DE COBERTURA...")
 
-    # Expandir grafo de cobertura
-    nodos, arcos = grafo.expandir_grafo_cobertura()
+    # Expandir grafo de cobertura; en redes grandes se muestra el progreso cada segundo
+    metricas = Metricas(callback=imprimir_progreso)
+    nodos, arcos = grafo.expandir_grafo_cobertura(metricas=metricas)
 
     grafo.imprimir_grafo(nodos, arcos)
     dibuja_red.dibuja_GC(nodos, arcos)
 
     # Mostrar estadísticas
-    stats = grafo.obtener_estadisticas(nodos, arcos)
+    stats = grafo.obtener_estadisticas(nodos, arcos, metricas)
     print("\nESTADÍSTICAS DEL GRAFO:")
     for key, value in stats.items():
         print(f"{key.replace('_', ' ').title()}: {value}")
 
+    # sin ω la red es acotada y la vivacidad se calcula exacta sobre el grafo de alcance
+    print()
+    if any(OMEGA in marcado for marcado in nodos):
+        compilado = GrafoCSR.desde_grafo(nodos, arcos)
+    else:
+        compilado = GrafoCSR.desde_alcance(red)
+    imprimir_vivacidad(compilado.analizar(red.n_transiciones))
+
+
+def analisis_estructural():
+    """Muestra invariantes y acotación estructural sin construir ningún grafo"""
+    red = RedPetri(pre, post, marcado_inicial)
+
+    print("=" * 50)
+    imprimir_analisis(analizar_red(red))
+
+
+def simulacion_monte_carlo():
+    """Ejecuta muchas corridas aleatorias a la vez y muestra sus estadísticas"""
+    red = RedPetri(pre, post, marcado_inicial)
+
+    print("=" * 50)
+    try:
+        imprimir_simulacion(simular(red, n_corridas=1000, max_pasos=1000, semilla=0))
+    except ImportError as error:
+        print(error)
+
 
 def main():
     dibuja_red.dibuja_RP(pre, post, marcado_inicial)
@@ -94,7 +127,9 @@ def main():
         print("REDES DE PETRI")
         print("1. Mostrar RP y Transiciones Habilitadas")
         print("2. Generar Grafo de Cobertura")
-        print("3. Salir")
+        print("3. Análisis Estructural")
+        print("4. Simulación Monte Carlo")
+        print("5. Salir")
 
         opcion = input("\nSeleccione una opción: ")
 
@@ -103,6 +138,10 @@ def main():
         elif opcion == '2':
             generar_grafo_cobertura()
         elif opcion == '3':
+            analisis_estructural()
+        elif opcion == '4':
+            simulacion_monte_carlo()
+        elif opcion == '5':
             print("Exit...")
             break
         else:
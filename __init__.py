@@ -1,8 +1,9 @@
 from Parte_I import RedPetri
 from Parte_II import GrafoCobertura
+from Parte_III import GrafoCSR
 
 
-__all__ = ["RedPetri", "GrafoCobertura", "pre", "post", "marcado_inicial"]
+__all__ = ["RedPetri", "GrafoCobertura", "GrafoCSR", "pre", "post", "marcado_inicial"]
 
 """pre = [
     [1, 0, 0, 0, 0, 0, 0, 0],
@@ -0,0 +1,119 @@
+from bdd import BDD
+
+
+class AlcanzabilidadSimbolica:
+    """
+    Exploración simbólica de redes 1-seguras con BDDs.
+    Cada lugar es una variable booleana (tiene o no tiene marca), así que un BDD representa
+    un conjunto de marcados completo. Los alcanzables se calculan como punto fijo de la
+    relación de transición, particionada por transición y construida a partir de pre/post.
+    """
+
+    def __init__(self, red):
+        """
+        red: Instancia de RedPetri; debe tener pesos 0/1 y un marcado inicial 0/1
+        """
+        if any(x not in (0, 1) for x in red.marcado_inicial):
+            raise ValueError("El marcado inicial de una red segura solo puede tener 0 o 1")
+        if any(w > 1 for t in range(red.n_transiciones) for _, w in red.entradas[t] + red.salidas[t]):
+            raise ValueError("Una red segura no puede tener arcos con peso mayor a 1")
+
+        self.red = red
+        self.bdd = BDD(red.n_lugares)
+        self.alcanzables = None
+        self.iteraciones = 0
+
+        # Relación particionada: para cada transición con arcos guardamos
+        # (guarda, lugares que cambian, efecto, lugares que se llenarían de más)
+        self.relaciones = []
+        for t in range(red.n_transiciones):
+            if not red.con_arcos[t]:
+                continue  # las transiciones sin arcos nunca se habilitan
+            entradas = {p for p, _ in red.entradas[t]}
+            salidas = {p for p, _ in red.salidas[t]}
+            consumidos = entradas - salidas
+            producidos = salidas - entradas
+            guarda = self.bdd.conjuncion((p, True) for p in entradas)
+            efecto = self.bdd.conjuncion([(p, False) for p in consumidos] + [(p, True) for p in producidos])
+            self.relaciones.append((t, guarda, frozenset(consumidos | producidos), efecto, producidos))
+
+    def marcado_a_bdd(self, marcado):
+        """BDD con un solo marcado"""
+        return self.bdd.conjuncion((p, bool(x)) for p, x in enumerate(marcado))
+
+    def imagen_transicion(self, conjunto, relacion):
+        """Marcados que se alcanzan desde conjunto disparando una sola transición"""
+        bdd = self.bdd
+        t, guarda, cambian, efecto, producidos = relacion
+        habilitados = bdd.y(conjunto, guarda)
+        if habilitados == bdd.FALSO:
+            return bdd.FALSO
+        # disparar hacia un lugar ya marcado dejaría dos marcas
+        for p in producidos:
+            if bdd.y(habilitados, bdd.variable(p)) != bdd.FALSO:
+                raise ValueError(f"La red no es segura: T{t} puede poner una segunda marca en P{p}")
+        # se olvidan los lugares que cambian y se fija su nuevo valor
+        return bdd.y(bdd.y_existe(conjunto, guarda, cambian), efecto)
+
+    def imagen(self, conjunto):
+        """Marcados que se alcanzan desde conjunto disparando una transición"""
+        resultado = self.bdd.FALSO
+        for relacion in self.relaciones:
+            resultado = self.bdd.o(resultado, self.imagen_transicion(conjunto, relacion))
+        return resultado
+
+    def calcular_alcanzables(self):
+        """
+        Punto fijo por encadenamiento: la imagen de cada transición se une de inmediato
+        al conjunto, así la siguiente transición ya parte de lo nuevo. Converge en muchas
+        menos pasadas que la búsqueda por capas cuando hay componentes independientes.
+
+        Returns:
+            int: Nodo BDD con el conjunto de marcados alcanzables
+        """
+        bdd = self.bdd
+        alcanzables = self.marcado_a_bdd(self.red.marcado_inicial)
+        self.iteraciones = 0
+        while True:
+            anterior = alcanzables
+            for relacion in self.relaciones:
+                alcanzables = bdd.o(alcanzables, self.imagen_transicion(alcanzables, relacion))
+            self.iteraciones += 1
+            bdd.limpiar_cache()
+            if alcanzables == anterior:
+                break
+        self.alcanzables = alcanzables
+        return alcanzables
+
+    def bloqueos(self):
+        """BDD de los marcados alcanzables sin transiciones habilitadas"""
+        if self.alcanzables is None:
+            self.calcular_alcanzables()
+        bdd = self.bdd
+        alguna_habilitada = bdd.FALSO
+        for _, guarda, _, _, _ in self.relaciones:
+            alguna_habilitada = bdd.o(alguna_habilitada, guarda)
+        return bdd.y(self.alcanzables, bdd.no(alguna_habilitada))
+
+    def es_alcanzable(self, marcado):
+        """Verifica si un marcado 0/1 pertenece al conjunto de alcanzables"""
+        if self.alcanzables is None:
+            self.calcular_alcanzables()
+        return self.bdd.evaluar(self.alcanzables, [bool(x) for x in marcado])
+
+    def analizar(self):
+        """
+        Returns:
+            dict: Número de marcados alcanzables, existencia de bloqueo, un marcado de
+                  bloqueo de ejemplo, iteraciones del punto fijo y nodos BDD usados
+        """
+        alcanzables = self.calcular_alcanzables()
+        bloqueos = self.bloqueos()
+        ejemplo = self.bdd.elegir(bloqueos)
+        return {
+            'estados_alcanzables': self.bdd.contar(alcanzables),
+            'bloqueo': bloqueos != self.bdd.FALSO,
+            'ejemplo_bloqueo': [int(x) for x in ejemplo] if ejemplo is not None else None,
+            'iteraciones': self.iteraciones,
+            'nodos_bdd': len(self.bdd)
+        }
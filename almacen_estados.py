@@ -0,0 +1,127 @@
+from array import array
+from collections.abc import Mapping
+
+
+# Cada lugar ocupa 8 bytes ('q') para que quepa el centinela OMEGA de 64 bits
+TIPO_MARCA = 'q'
+
+
+def empaquetar(marcado):
+    """Empaqueta un marcado en bytes de ancho fijo (8 bytes por lugar)"""
+    return array(TIPO_MARCA, marcado).tobytes()
+
+
+def desempaquetar(datos):
+    """Recupera la tupla del marcado a partir de sus bytes empaquetados"""
+    marcado = array(TIPO_MARCA)
+    marcado.frombytes(datos)
+    return tuple(marcado)
+
+
+class AlmacenEstados(Mapping):
+    """
+    Almacén compacto de estados visitados.
+    Cada marcado se empaqueta en bytes de ancho fijo y se interna a un id entero; el padre
+    y la transición de cada estado se guardan en columnas array('i') paralelas (-1 = ninguno).
+    Se comporta como un diccionario de solo lectura marcado -> {'padre': ..., 'transicion': ...},
+    el mismo formato que devolvía busqueda_por_anchura, así que mostrar_arbol_alcance funciona igual.
+    """
+
+    def __init__(self):
+        self.ids = {}              # bytes del marcado -> id
+        self.marcados = []         # id -> bytes del marcado (los mismos objetos que las llaves)
+        self.padres = array('i')   # id -> id del padre
+        self.transiciones = array('i')  # id -> transición disparada desde el padre
+
+    def agregar(self, marcado, padre=-1, transicion=-1):
+        """
+        Interna un marcado si no existía
+        marcado: Marcado (lista o tupla)
+        padre: Id del estado padre (-1 para la raíz)
+        transicion: Transición que llevó del padre a este estado (-1 para la raíz)
+
+        Returns:
+            tuple: (id, nuevo) donde nuevo indica si el marcado no estaba en el almacén
+        """
+        datos = empaquetar(marcado)
+        existente = self.ids.get(datos)
+        if existente is not None:
+            return existente, False
+        nuevo_id = len(self.marcados)
+        self.ids[datos] = nuevo_id
+        self.marcados.append(datos)
+        self.padres.append(padre)
+        self.transiciones.append(transicion)
+        return nuevo_id, True
+
+    def cambiar_padre(self, estado_id, padre, transicion):
+        """Reemplaza el padre y la transición de un estado (p. ej. al hallar un camino más corto)"""
+        self.padres[estado_id] = padre
+        self.transiciones[estado_id] = transicion
+
+    def id_de(self, marcado):
+        """Retorna el id de un marcado o None si no está en el almacén"""
+        return self.ids.get(empaquetar(marcado))
+
+    def marcado(self, estado_id):
+        """Retorna la tupla del marcado con ese id"""
+        return desempaquetar(self.marcados[estado_id])
+
+    def secuencia(self, estado_id):
+        """
+        Transiciones disparadas desde la raíz hasta el estado, siguiendo los padres
+
+        Returns:
+            list: Índices de transiciones en orden de disparo
+        """
+        secuencia = []
+        while self.padres[estado_id] >= 0:
+            secuencia.append(self.transiciones[estado_id])
+            estado_id = self.padres[estado_id]
+        secuencia.reverse()
+        return secuencia
+
+    def __getitem__(self, marcado):
+        estado_id = self.ids.get(empaquetar(marcado))
+        if estado_id is None:
+            raise KeyError(marcado)
+        padre = self.padres[estado_id]
+        transicion = self.transiciones[estado_id]
+        return {
+            'padre': self.marcado(padre) if padre >= 0 else None,
+            'transicion': transicion if transicion >= 0 else None
+        }
+
+    def __contains__(self, marcado):
+        return empaquetar(marcado) in self.ids
+
+    def __iter__(self):
+        for datos in self.marcados:
+            yield desempaquetar(datos)
+
+    def __len__(self):
+        return len(self.marcados)
+
+
+class ConjuntoEstados:
+    """
+    Solo recuerda qué marcados ya se vieron (empaquetados), sin padres ni transiciones.
+    Tiene la misma interfaz agregar que AlmacenEstados para usarse en su lugar cuando
+    no hace falta reconstruir el árbol.
+    """
+
+    def __init__(self):
+        self.vistos = set()
+
+    def agregar(self, marcado, padre=-1, transicion=-1):
+        datos = empaquetar(marcado)
+        if datos in self.vistos:
+            return -1, False
+        self.vistos.add(datos)
+        return len(self.vistos) - 1, True
+
+    def __contains__(self, marcado):
+        return empaquetar(marcado) in self.vistos
+
+    def __len__(self):
+        return len(self.vistos)
@@ -0,0 +1,237 @@
+from fractions import Fraction
+from math import gcd
+
+
+def transponer(matriz):
+    """Transpone una matriz dada como lista de listas"""
+    return [list(columna) for columna in zip(*matriz)]
+
+
+def _normalizar(fila):
+    """Divide una fila entera entre el mcd de sus elementos"""
+    divisor = 0
+    for x in fila:
+        divisor = gcd(divisor, x)
+    if divisor > 1:
+        return [x // divisor for x in fila]
+    return fila
+
+
+def semiflujos(matriz):
+    """
+    Algoritmo de Farkas en aritmética entera exacta.
+    Calcula los vectores y >= 0 de soporte mínimo con y·matriz = 0
+    matriz: Matriz (n x m) como lista de listas; y tiene una entrada por fila
+
+    Returns:
+        list: Semiflujos mínimos, cada uno como lista de n enteros no negativos
+    """
+    n = len(matriz)
+    if n == 0:
+        return []
+    m = len(matriz[0])
+
+    # Cada fila es [parte de la matriz | parte identidad]
+    filas = [list(matriz[i]) + [1 if j == i else 0 for j in range(n)] for i in range(n)]
+
+    for columna in range(m):
+        nuevas = [fila for fila in filas if fila[columna] == 0]
+        positivas = [fila for fila in filas if fila[columna] > 0]
+        negativas = [fila for fila in filas if fila[columna] < 0]
+
+        # Combinar cada par de signos opuestos para anular la columna
+        for fila_p in positivas:
+            for fila_n in negativas:
+                a = fila_p[columna]
+                b = -fila_n[columna]
+                nuevas.append(_normalizar([b * x + a * y for x, y in zip(fila_p, fila_n)]))
+
+        filas = _soportes_minimos(nuevas, m)
+
+    return [fila[m:] for fila in filas]
+
+
+def _soportes_minimos(filas, inicio):
+    """Descarta las filas repetidas o cuyo soporte (desde inicio) contiene al de otra fila"""
+    soportes = [frozenset(i for i in range(inicio, len(fila)) if fila[i] != 0) for fila in filas]
+    minimas = []
+    vistos = set()
+    for i, soporte in enumerate(soportes):
+        if soporte in vistos:
+            continue
+        if any(otro < soporte for otro in soportes):
+            continue
+        vistos.add(soporte)
+        minimas.append(filas[i])
+    return minimas
+
+
+def p_semiflujos(C):
+    """P-semiflujos: y >= 0 con y·C = 0 (la suma ponderada de marcas es constante)"""
+    return semiflujos(C)
+
+
+def t_semiflujos(C):
+    """T-semiflujos: x >= 0 con C·x = 0 (secuencias que regresan al mismo marcado)"""
+    return semiflujos(transponer(C))
+
+
+def rango(matriz):
+    """Rango de una matriz por eliminación gaussiana con fracciones exactas"""
+    return len(_forma_escalonada(matriz)[1])
+
+
+def _forma_escalonada(matriz):
+    """
+    Returns:
+        tuple: (forma escalonada reducida, columnas pivote)
+    """
+    filas = [[Fraction(x) for x in fila] for fila in matriz]
+    pivotes = []
+    r = 0
+    n_columnas = len(filas[0]) if filas else 0
+    for columna in range(n_columnas):
+        pivote = next((i for i in range(r, len(filas)) if filas[i][columna] != 0), None)
+        if pivote is None:
+            continue
+        filas[r], filas[pivote] = filas[pivote], filas[r]
+        valor = filas[r][columna]
+        filas[r] = [x / valor for x in filas[r]]
+        for i in range(len(filas)):
+            if i != r and filas[i][columna] != 0:
+                factor = filas[i][columna]
+                filas[i] = [x - factor * y for x, y in zip(filas[i], filas[r])]
+        pivotes.append(columna)
+        r += 1
+    return filas, pivotes
+
+
+def base_nucleo(matriz):
+    """
+    Base entera del núcleo {x : matriz·x = 0}, en tiempo polinomial.
+    Los vectores pueden tener entradas negativas.
+    """
+    if not matriz:
+        return []
+    n_columnas = len(matriz[0])
+    escalonada, pivotes = _forma_escalonada(matriz)
+    libres = [j for j in range(n_columnas) if j not in pivotes]
+    base = []
+    for libre in libres:
+        vector = [Fraction(0)] * n_columnas
+        vector[libre] = Fraction(1)
+        for fila, pivote in zip(escalonada, pivotes):
+            vector[pivote] = -fila[libre]
+        # escalar a enteros
+        denominador = 1
+        for x in vector:
+            denominador = denominador * x.denominator // gcd(denominador, x.denominator)
+        base.append(_normalizar([int(x * denominador) for x in vector]))
+    return base
+
+
+def base_p_invariantes(C):
+    """Base de los P-invariantes (y·C = 0) usando solo el rango de C"""
+    return base_nucleo(transponer(C))
+
+
+def base_t_invariantes(C):
+    """Base de los T-invariantes (C·x = 0) usando solo el rango de C"""
+    return base_nucleo(C)
+
+
+def _cubre_todo(vectores, n):
+    """Verifica si la unión de los soportes de los vectores cubre los n índices"""
+    cubiertos = set()
+    for vector in vectores:
+        cubiertos.update(i for i in range(n) if vector[i] != 0)
+    return len(cubiertos) == n
+
+
+def es_conservativa(C, semiflujos_p=None):
+    """
+    Una red es conservativa si existe y > 0 con y·C = 0, es decir, si los P-semiflujos
+    cubren todos los lugares (su suma es un invariante estrictamente positivo)
+    """
+    if semiflujos_p is None:
+        semiflujos_p = p_semiflujos(C)
+    return _cubre_todo(semiflujos_p, len(C))
+
+
+def es_consistente(C, semiflujos_t=None):
+    """Una red es consistente si existe x > 0 con C·x = 0 (los T-semiflujos cubren todo)"""
+    if semiflujos_t is None:
+        semiflujos_t = t_semiflujos(C)
+    return _cubre_todo(semiflujos_t, len(C[0]) if C else 0)
+
+
+def es_estructuralmente_acotada(C):
+    """
+    Una red es estructuralmente acotada (acotada para cualquier marcado inicial) si existe
+    y > 0 con y·C <= 0. Con holguras s >= 0 esto es y·C + s = 0, así que basta con que los
+    semiflujos de [C; I] cubran todos los lugares.
+    """
+    n_lugares = len(C)
+    n_transiciones = len(C[0]) if C else 0
+    identidad = [[1 if j == i else 0 for j in range(n_transiciones)] for i in range(n_transiciones)]
+    extendidos = semiflujos(list(C) + identidad)
+    return _cubre_todo([y[:n_lugares] for y in extendidos], n_lugares)
+
+
+def cotas_lugares(semiflujos_p, marcado_inicial):
+    """
+    Cota superior de cada lugar derivada de los P-semiflujos: si y·C = 0 entonces
+    y·M = y·M0 para todo M alcanzable, así que M(p) <= (y·M0) // y(p)
+
+    Returns:
+        list: Cota de cada lugar, o None si ningún semiflujo lo cubre
+    """
+    cotas = [None] * len(marcado_inicial)
+    for y in semiflujos_p:
+        total = sum(a * b for a, b in zip(y, marcado_inicial))
+        for p, peso in enumerate(y):
+            if peso > 0:
+                cota = total // peso
+                if cotas[p] is None or cota < cotas[p]:
+                    cotas[p] = cota
+    return cotas
+
+
+def analizar_red(red):
+    """
+    Análisis estructural completo a partir de la matriz de incidencia de una RedPetri.
+    No construye ningún grafo, así que conviene correrlo antes de una exploración costosa.
+
+    Returns:
+        dict: rango, semiflujos, conservatividad, consistencia, acotación estructural y
+              cotas por lugar
+    """
+    C = red.C
+    semiflujos_p = p_semiflujos(C)
+    semiflujos_t = t_semiflujos(C)
+    return {
+        'rango': rango(C),
+        'p_semiflujos': semiflujos_p,
+        't_semiflujos': semiflujos_t,
+        'conservativa': es_conservativa(C, semiflujos_p),
+        'consistente': es_consistente(C, semiflujos_t),
+        'estructuralmente_acotada': es_estructuralmente_acotada(C),
+        'cotas': cotas_lugares(semiflujos_p, red.marcado_inicial)
+    }
+
+
+def imprimir_analisis(resultado):
+    """Muestra el resultado de analizar_red"""
+    print("ANÁLISIS ESTRUCTURAL")
+    print(f"Rango de C: {resultado['rango']}")
+    print("\nP-semiflujos (y·C = 0):")
+    for y in resultado['p_semiflujos']:
+        print(f"  {y}")
+    print("T-semiflujos (C·x = 0):")
+    for x in resultado['t_semiflujos']:
+        print(f"  {x}")
+    print(f"\nConservativa: {'Sí' if resultado['conservativa'] else 'No'}")
+    print(f"Consistente: {'Sí' if resultado['consistente'] else 'No'}")
+    print(f"Estructuralmente acotada: {'Sí' if resultado['estructuralmente_acotada'] else 'No'}")
+    cotas = ["?" if cota is None else str(cota) for cota in resultado['cotas']]
+    print(f"Cotas por lugar: [{', '.join(cotas)}]")
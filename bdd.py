@@ -0,0 +1,198 @@
+import sys
+
+
+class BDD:
+    """
+    Paquete mínimo de diagramas de decisión binaria reducidos y ordenados (ROBDD).
+    Los nodos son enteros: 0 es FALSO y 1 es VERDADERO. La tabla única garantiza que cada
+    función tenga un solo nodo (comparar funciones es comparar enteros) y la caché de
+    operaciones evita recalcular ite y cuantificaciones ya hechas.
+    El orden de las variables es su índice: 0 queda en la raíz.
+    """
+
+    FALSO = 0
+    VERDADERO = 1
+
+    def __init__(self, n_variables):
+        self.n_variables = n_variables
+        # Los terminales usan n_variables como variable para quedar debajo de todas
+        self.variables = [n_variables, n_variables]
+        self.bajos = [0, 1]
+        self.altos = [0, 1]
+        self.unica = {}  # (variable, bajo, alto) -> nodo
+        self.cache = {}  # (operación, argumentos...) -> nodo
+        # La recursión baja a lo más una vez por variable (dos en y_existe, que llama a o)
+        self._recursion_extra = 4 * n_variables + 200
+        self._en_operacion = False
+
+    def _ejecutar(self, operacion, *argumentos):
+        """
+        Ejecuta una operación recursiva subiendo el límite de recursión solo mientras dura
+        y restaurándolo al terminar; las llamadas anidadas usan el límite ya subido
+        """
+        if self._en_operacion:
+            return operacion(*argumentos)
+        anterior = sys.getrecursionlimit()
+        sys.setrecursionlimit(anterior + self._recursion_extra)
+        self._en_operacion = True
+        try:
+            return operacion(*argumentos)
+        finally:
+            self._en_operacion = False
+            sys.setrecursionlimit(anterior)
+
+    def limpiar_cache(self, limite=1 << 20):
+        """Vacía la caché de operaciones si pasó del límite de entradas (la tabla única se conserva)"""
+        if len(self.cache) > limite:
+            self.cache.clear()
+
+    def nodo(self, variable, bajo, alto):
+        """Retorna el nodo (variable ? alto : bajo) aplicando las reglas de reducción"""
+        if bajo == alto:
+            return bajo
+        clave = (variable, bajo, alto)
+        existente = self.unica.get(clave)
+        if existente is not None:
+            return existente
+        nuevo = len(self.variables)
+        self.variables.append(variable)
+        self.bajos.append(bajo)
+        self.altos.append(alto)
+        self.unica[clave] = nuevo
+        return nuevo
+
+    def variable(self, i):
+        """BDD de la variable x_i"""
+        return self.nodo(i, self.FALSO, self.VERDADERO)
+
+    def _cofactores(self, u, variable):
+        if self.variables[u] == variable:
+            return self.bajos[u], self.altos[u]
+        return u, u
+
+    def ite(self, f, g, h):
+        """Si-entonces-sino: (f ∧ g) ∨ (¬f ∧ h)"""
+        return self._ejecutar(self._ite, f, g, h)
+
+    def _ite(self, f, g, h):
+        if f == self.VERDADERO:
+            return g
+        if f == self.FALSO:
+            return h
+        if g == h:
+            return g
+        if g == self.VERDADERO and h == self.FALSO:
+            return f
+        clave = ('ite', f, g, h)
+        resultado = self.cache.get(clave)
+        if resultado is not None:
+            return resultado
+
+        v = min(self.variables[f], self.variables[g], self.variables[h])
+        f0, f1 = self._cofactores(f, v)
+        g0, g1 = self._cofactores(g, v)
+        h0, h1 = self._cofactores(h, v)
+        resultado = self.nodo(v, self._ite(f0, g0, h0), self._ite(f1, g1, h1))
+        self.cache[clave] = resultado
+        return resultado
+
+    def y(self, a, b):
+        return self.ite(a, b, self.FALSO)
+
+    def o(self, a, b):
+        return self.ite(a, self.VERDADERO, b)
+
+    def no(self, a):
+        return self.ite(a, self.FALSO, self.VERDADERO)
+
+    def conjuncion(self, literales):
+        """
+        Conjunción de literales
+        literales: Iterable de (variable, valor) con valor True o False
+        """
+        resultado = self.VERDADERO
+        # de abajo hacia arriba para construir cada nodo una sola vez
+        for i, valor in sorted(literales, reverse=True):
+            if valor:
+                resultado = self.nodo(i, self.FALSO, resultado)
+            else:
+                resultado = self.nodo(i, resultado, self.FALSO)
+        return resultado
+
+    def y_existe(self, a, b, variables):
+        """
+        Producto relacional: ∃ variables . (a ∧ b), sin construir a ∧ b completo
+        variables: frozenset con los índices de las variables a cuantificar
+        """
+        return self._ejecutar(self._y_existe, a, b, variables)
+
+    def _y_existe(self, a, b, variables):
+        if a == self.FALSO or b == self.FALSO:
+            return self.FALSO
+        if a == self.VERDADERO and b == self.VERDADERO:
+            return self.VERDADERO
+        if a > b:
+            a, b = b, a  # la operación es conmutativa, así se aprovecha mejor la caché
+        clave = ('y_existe', a, b, variables)
+        resultado = self.cache.get(clave)
+        if resultado is not None:
+            return resultado
+
+        v = min(self.variables[a], self.variables[b])
+        a0, a1 = self._cofactores(a, v)
+        b0, b1 = self._cofactores(b, v)
+        bajo = self._y_existe(a0, b0, variables)
+        if v in variables:
+            # si una rama ya es verdadera no hace falta la otra
+            resultado = bajo if bajo == self.VERDADERO else self.o(bajo, self._y_existe(a1, b1, variables))
+        else:
+            resultado = self.nodo(v, bajo, self._y_existe(a1, b1, variables))
+        self.cache[clave] = resultado
+        return resultado
+
+    def contar(self, u):
+        """Número de asignaciones de las n_variables que satisfacen u"""
+        memo = {}
+
+        def contar_desde(w):
+            # asignaciones de las variables variables[w]..n_variables-1
+            if w <= 1:
+                return w
+            if w in memo:
+                return memo[w]
+            v = self.variables[w]
+            bajo, alto = self.bajos[w], self.altos[w]
+            total = (contar_desde(bajo) << (self.variables[bajo] - v - 1)) + \
+                    (contar_desde(alto) << (self.variables[alto] - v - 1))
+            memo[w] = total
+            return total
+
+        return self._ejecutar(contar_desde, u) << self.variables[u]
+
+    def elegir(self, u):
+        """
+        Una asignación que satisface u (las variables libres quedan en False)
+
+        Returns:
+            list: Valor de cada variable, o None si u es FALSO
+        """
+        if u == self.FALSO:
+            return None
+        asignacion = [False] * self.n_variables
+        while u != self.VERDADERO:
+            if self.bajos[u] != self.FALSO:
+                u = self.bajos[u]
+            else:
+                asignacion[self.variables[u]] = True
+                u = self.altos[u]
+        return asignacion
+
+    def evaluar(self, u, asignacion):
+        """Evalúa u con una asignación (lista de booleanos)"""
+        while u > 1:
+            u = self.altos[u] if asignacion[self.variables[u]] else self.bajos[u]
+        return u == self.VERDADERO
+
+    def __len__(self):
+        """Número de nodos creados (incluye los dos terminales)"""
+        return len(self.variables)
@@ -0,0 +1,198 @@
+"""
+Mide el rendimiento de las operaciones básicas sobre familias de redes de tamaño variable
+y guarda los resultados en JSON para comparar entre versiones.
+
+Uso:
+    python benchmark.py --salida resultados.json
+    python benchmark.py --familias filosofos anillo --tamanos 3 5 7
+    python benchmark.py --salida nuevo.json --comparar anterior.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from Parte_I import RedPetri
+from Parte_II import GrafoCobertura
+from generadores import FAMILIAS
+
+TAMANOS = {
+    'filosofos': [2, 3, 4, 5],
+    'productor_consumidor': [2, 3, 4, 5],
+    'anillo': [4, 8, 16],
+    'aleatoria': [10, 15, 20],
+}
+
+
+def medir(funcion, medir_memoria=True):
+    """
+    Ejecuta funcion una vez para el tiempo y, si se pide, otra bajo tracemalloc para la
+    memoria (tracemalloc hace lenta la ejecución, así que no se mezcla con el tiempo)
+
+    Returns:
+        tuple: (resultado, segundos, pico de memoria en bytes o None)
+    """
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+
+    pico = None
+    if medir_memoria:
+        tracemalloc.start()
+        try:
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return resultado, segundos, pico
+
+
+def _marcados_de_prueba(red, cantidad, semilla=0):
+    """Marcados visitados por una caminata aleatoria, para las pruebas de una sola operación"""
+    rng = random.Random(semilla)
+    marcado = list(red.marcado_inicial)
+    marcados = []
+    for _ in range(cantidad):
+        marcados.append(tuple(marcado))
+        habilitadas = red.transiciones_habilitadas(marcado)
+        if not habilitadas:
+            marcado = list(red.marcado_inicial)
+            continue
+        marcado = red._sucesor(rng.choice(habilitadas), marcado)
+    return marcados
+
+
+def medir_red(familia, tamano, repeticiones=2000, max_profundidad=20, medir_memoria=True):
+    """
+    Mide las cuatro operaciones sobre una red generada. La caché de sucesores se desactiva
+    para medir el costo real de cada operación y no el de una consulta repetida: con
+    tam_cache=0, disparar solo revisa los arcos de entrada de la transición y calcula su
+    sucesor, sin pasar por la caché.
+
+    Returns:
+        list: Un dict por operación
+    """
+    pre, post, marcado_inicial = FAMILIAS[familia](tamano)
+    red = RedPetri(pre, post, marcado_inicial, tam_cache=0)
+    marcados = _marcados_de_prueba(red, repeticiones)
+
+    def habilitadas():
+        for marcado in marcados:
+            red.transiciones_habilitadas(marcado)
+        return len(marcados)
+
+    # pares (transicion, marcado) con la transición habilitada
+    disparos = [(t, m) for m in marcados for t in red.transiciones_habilitadas(m)[:1]]
+
+    def disparar():
+        # un disparo por marcado: mide el costo de una sola transición
+        for t, marcado in disparos:
+            red.disparar(t, marcado)
+        return len(disparos)
+
+    def busqueda():
+        return len(red.busqueda_por_anchura(max_profundidad))
+
+    def cobertura():
+        red_cobertura = RedPetri(pre, post, marcado_inicial, tam_cache=0)
+        nodos, _ = GrafoCobertura(red_cobertura).expandir_grafo_cobertura(max_profundidad)
+        return len(nodos)
+
+    resultados = []
+    for operacion, funcion in (('transiciones_habilitadas', habilitadas), ('disparar', disparar),
+                               ('busqueda_por_anchura', busqueda),
+                               ('expandir_grafo_cobertura', cobertura)):
+        estados, segundos, pico = medir(funcion, medir_memoria)
+        resultados.append({
+            'familia': familia,
+            'tamano': tamano,
+            'lugares': red.n_lugares,
+            'transiciones': red.n_transiciones,
+            'operacion': operacion,
+            'estados': estados,
+            'segundos': segundos,
+            'estados_por_segundo': estados / segundos if segundos > 0 else None,
+            'memoria_pico_bytes': pico
+        })
+    return resultados
+
+
+def _version():
+    """Commit actual del repositorio, si se puede obtener"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(familias=None, tamanos=None, max_profundidad=20, medir_memoria=True):
+    """
+    familias: Nombres de FAMILIAS a medir (todas por defecto)
+    tamanos: Tamaños a usar en todas las familias (por defecto los de TAMANOS)
+
+    Returns:
+        dict: Datos del entorno y lista de resultados
+    """
+    resultados = []
+    for familia in familias or FAMILIAS:
+        for tamano in tamanos or TAMANOS[familia]:
+            print(f"Midiendo {familia}({tamano})...")
+            resultados.extend(medir_red(familia, tamano, max_profundidad=max_profundidad,
+                                        medir_memoria=medir_memoria))
+    return {
+        'version': _version(),
+        'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'max_profundidad': max_profundidad,
+        'resultados': resultados
+    }
+
+
+def comparar(anterior, actual):
+    """Muestra la razón de tiempos actual / anterior para cada medición en común"""
+    def clave(r):
+        return r['familia'], r['tamano'], r['operacion']
+
+    previos = {clave(r): r for r in anterior['resultados']}
+    print(f"\nCOMPARACIÓN {anterior.get('version')} -> {actual.get('version')} (tiempo actual / anterior)")
+    for r in actual['resultados']:
+        previo = previos.get(clave(r))
+        if previo is None or not previo['segundos']:
+            continue
+        razon = r['segundos'] / previo['segundos']
+        aviso = "  <-- más lento" if razon > 1.2 else ""
+        print(f"  {r['familia']}({r['tamano']}) {r['operacion']}: {razon:.2f}x{aviso}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de operaciones sobre redes de Petri")
+    parser.add_argument('--familias', nargs='+', choices=sorted(FAMILIAS))
+    parser.add_argument('--tamanos', nargs='+', type=int)
+    parser.add_argument('--max-profundidad', type=int, default=20)
+    parser.add_argument('--sin-memoria', action='store_true', help="no medir el pico de memoria")
+    parser.add_argument('--salida', default='benchmark.json')
+    parser.add_argument('--comparar', help="JSON de una ejecución anterior")
+    args = parser.parse_args()
+
+    datos = ejecutar(args.familias, args.tamanos, args.max_profundidad, not args.sin_memoria)
+    with open(args.salida, 'w') as archivo:
+        json.dump(datos, archivo, indent=2)
+
+    for r in datos['resultados']:
+        velocidad = f"{r['estados_por_segundo']:.0f}/s" if r['estados_por_segundo'] else "-"
+        print(f"{r['familia']}({r['tamano']}) {r['operacion']}: {r['estados']} en "
+              f"{r['segundos']:.4f}s ({velocidad})")
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar) as archivo:
+            comparar(json.load(archivo), datos)
+
+
+if __name__ == "__main__":
+    main()
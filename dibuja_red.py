@@ -1,6 +1,8 @@
 import graphviz
 import os
 
+from Parte_I import OMEGA, SIMBOLO_OMEGA
+
 
 output_directory = "grafos_generados"
 
@@ -67,46 +69,98 @@ def dibuja_RP(pre, post, Mk, imagen="RP"):
     print(f"Red de Petri guardada en '{output_directory}'!")
 
 
-def dibuja_GC(nodos, arcos, imagen="GC"):
+def dibuja_GC(nodos, arcos, imagen="GC", max_nodos=300, renderizar=True, ver=True):
     """
     dibuja grafo de cobertura
+    max_nodos: Con más nodos se dibuja un resumen con un nodo por nivel de profundidad,
+               porque dot no termina con grafos grandes (para el grafo completo usar
+               exportar.exportar, que escribe el archivo sin armarlo en memoria)
+    renderizar: Si es False solo se guarda el archivo .gv, sin llamar a dot
+    ver: Abrir la imagen al terminar (poner False en servidores sin pantalla)
     """
     directorio()
-    dot = graphviz.Digraph('CoverageGraph',
-                           comment='Grafo de Cobertura',
-                           graph_attr={'rankdir': 'LR', 'splines': 'true'})
-    
-    # Agregar Nodos (Marcados)
-    for marcado, info in nodos.items():
-        # Formatear el marcado para incluir 'ω' y el tipo de nodo
-        marcado_str = [str(x) for x in marcado]
-
-        # Etiqueta del nodo: El marcado
-        label_marcado = f"[{', '.join(marcado_str)}]"
-
-        # Color y forma para identificar nodos especiales
-        color = 'black'
-        shape = 'oval'
-
-        if 'ω' in marcado:
-            color = 'red'
-        elif info['tipo'] == 'terminal':
-            shape = 'doublecircle'
-        elif info['tipo'] == 'duplicado':
-            shape = 'box'
-
-        dot.node(str(marcado), # El ID del nodo es la tupla como string
-                 label=label_marcado,
-                 shape=shape,
-                 color=color,
-                 style='filled' if info['tipo'] == 'terminal' else '')
-
-    # Agregar Arcos
+    if len(nodos) > max_nodos:
+        dot = _resumen_por_profundidad(nodos, arcos)
+    else:
+        dot = graphviz.Digraph('CoverageGraph',
+                               comment='Grafo de Cobertura',
+                               graph_attr={'rankdir': 'LR', 'splines': 'true'})
+
+        # Ids enteros cortos en lugar de la tupla como texto
+        ids = {marcado: str(i) for i, marcado in enumerate(nodos)}
+
+        # Agregar Nodos (Marcados)
+        for marcado, info in nodos.items():
+            # Formatear el marcado para incluir 'ω' y el tipo de nodo
+            marcado_str = [SIMBOLO_OMEGA if x == OMEGA else str(x) for x in marcado]
+
+            # Etiqueta del nodo: El marcado
+            label_marcado = f"[{', '.join(marcado_str)}]"
+
+            # Color y forma para identificar nodos especiales
+            color = 'black'
+            shape = 'oval'
+
+            if OMEGA in marcado:
+                color = 'red'
+            elif info['tipo'] == 'terminal':
+                shape = 'doublecircle'
+            elif info['tipo'] == 'duplicado':
+                shape = 'box'
+
+            dot.node(ids[marcado],
+                     label=label_marcado,
+                     shape=shape,
+                     color=color,
+                     style='filled' if info['tipo'] == 'terminal' else '')
+
+        # Agregar Arcos
+        for arco in arcos:
+            transicion_label = f"T{arco['transicion']}"
+            dot.edge(ids[arco['origen']], ids[arco['destino']], label=transicion_label)
+
+    if not renderizar:
+        ruta = dot.save(filename=f"{imagen}.gv", directory=output_directory)
+        print(f"Grafo de Cobertura guardado en '{ruta}' (sin dibujar)")
+        return
+    try:
+        dot.render(imagen, view=ver, format='png', directory=output_directory)
+    except graphviz.ExecutableNotFound:
+        ruta = dot.save(filename=f"{imagen}.gv", directory=output_directory)
+        print(f"No se encontró el programa dot de Graphviz; se guardó solo '{ruta}'")
+        return
+    print(f"¡Grafo de Cobertura guardado en '{output_directory}!")
+
+
+def _resumen_por_profundidad(nodos, arcos):
+    """
+    Grafo resumido: un nodo por nivel de profundidad con cuántos marcados tiene, y un
+    arco entre niveles con cuántos arcos del grafo original los unen
+    """
+    niveles = {}
+    for info in nodos.values():
+        nivel = niveles.setdefault(info.get('profundidad', 0), {'marcados': 0, 'omega': 0, 'terminales': 0})
+        nivel['marcados'] += 1
+        if OMEGA in info['marcado']:
+            nivel['omega'] += 1
+        if info['tipo'] == 'terminal':
+            nivel['terminales'] += 1
+
+    entre_niveles = {}
     for arco in arcos:
-        origen_str = str(arco['origen'])
-        destino_str = str(arco['destino'])
-        transicion_label = f"T{arco['transicion']}"
-        dot.edge(origen_str, destino_str, label=transicion_label)
-
-    dot.render(imagen, view=True, format='png', directory=output_directory)
-    print(f"¡Grafo de Cobertura guardado en '{output_directory}!")
\ No newline at end of file
+        clave = (nodos[arco['origen']].get('profundidad', 0), nodos[arco['destino']].get('profundidad', 0))
+        entre_niveles[clave] = entre_niveles.get(clave, 0) + 1
+
+    dot = graphviz.Digraph('CoverageGraphSummary',
+                           comment=f'Resumen del Grafo de Cobertura ({len(nodos)} nodos)',
+                           graph_attr={'rankdir': 'LR'})
+    for profundidad in sorted(niveles):
+        nivel = niveles[profundidad]
+        dot.node(f"N{profundidad}",
+                 label=f"Profundidad {profundidad}\n{nivel['marcados']} marcados\n"
+                       f"{nivel['omega']} con {SIMBOLO_OMEGA}, {nivel['terminales']} terminales",
+                 shape='box',
+                 color='red' if nivel['omega'] else 'black')
+    for (origen, destino), cantidad in sorted(entre_niveles.items()):
+        dot.edge(f"N{origen}", f"N{destino}", label=str(cantidad))
+    return dot
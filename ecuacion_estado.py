@@ -0,0 +1,108 @@
+from math import ceil, floor
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # scipy es opcional; sin él solo se usan los P-invariantes
+    linprog = None
+
+TOLERANCIA = 1e-6
+
+
+def respeta_invariantes(invariantes, marcado_inicial, objetivo):
+    """
+    Condición necesaria sin resolver nada: todo marcado alcanzable cumple y·M = y·M0 para
+    cada P-invariante y (equivale a que M - M0 esté en el espacio de columnas de C)
+    invariantes: Base de P-invariantes (analisis_estructural.base_p_invariantes)
+    """
+    for y in invariantes:
+        if sum(a * (m - m0) for a, m, m0 in zip(y, objetivo, marcado_inicial)) != 0:
+            return False
+    return True
+
+
+def _relajacion(C, diferencia, cubrir, cotas):
+    """
+    Programa lineal: minimizar la suma de x con C·x = diferencia (o C·x >= diferencia si
+    cubrir) y x dentro de las cotas
+
+    Returns:
+        list: Solución, o None si no es factible
+    """
+    n_transiciones = len(C[0]) if C else 0
+    costo = [1] * n_transiciones
+    if cubrir:
+        resultado = linprog(costo, A_ub=[[-c for c in fila] for fila in C],
+                            b_ub=[-d for d in diferencia], bounds=cotas, method='highs')
+    else:
+        resultado = linprog(costo, A_eq=C, b_eq=diferencia, bounds=cotas, method='highs')
+    if resultado.status == 2:
+        return None
+    if resultado.status != 0:
+        raise RuntimeError(f"linprog no terminó: {resultado.message}")
+    return list(resultado.x)
+
+
+def resolver(C, diferencia, cubrir=False, entero=True, max_nodos=200):
+    """
+    Busca x >= 0 con C·x = diferencia (o >= si cubrir). Primero la relajación lineal y,
+    si se pide, ramificación y acotamiento en profundidad sobre la primera variable
+    fraccionaria hasta obtener una solución entera.
+    max_nodos: Máximo de programas lineales a resolver en la ramificación
+
+    Returns:
+        tuple: (resultado, x): (False, None) si no hay solución, (True, x) si la hay
+               (entera si entero) y (None, x relajada) si se acabaron los nodos
+    """
+    if linprog is None:
+        raise ImportError("La ecuación de estado requiere scipy (pip install scipy)")
+    n_transiciones = len(C[0]) if C else 0
+    pendientes = [[(0, None)] * n_transiciones]
+    relajada = None
+    nodos = 0
+    while pendientes:
+        if nodos >= max_nodos:
+            return None, relajada
+        cotas = pendientes.pop()
+        nodos += 1
+        x = _relajacion(C, diferencia, cubrir, cotas)
+        if x is None:
+            continue
+        if relajada is None:
+            relajada = x
+        if not entero:
+            return True, x
+
+        fraccionaria = next((j for j, v in enumerate(x) if abs(v - round(v)) > TOLERANCIA), None)
+        if fraccionaria is None:
+            return True, [int(round(v)) for v in x]
+
+        # dos ramas: x_j <= piso(v) y x_j >= techo(v); se explora primero la de arriba
+        inferior, superior = cotas[fraccionaria]
+        v = x[fraccionaria]
+        abajo = list(cotas)
+        abajo[fraccionaria] = (inferior, floor(v))
+        arriba = list(cotas)
+        arriba[fraccionaria] = (ceil(v), superior)
+        pendientes.append(abajo)
+        pendientes.append(arriba)
+    return False, None
+
+
+def verificar(C, marcado_inicial, objetivo, cubrir=False, invariantes=None, entero=True, max_nodos=200):
+    """
+    Filtro de la ecuación de estado M = M0 + C·x, x >= 0 entero (si cubrir, M <= M0 + C·x,
+    es decir C·x >= M - M0, con M el objetivo).
+    Si no tiene solución el objetivo es inalcanzable (o no cubrible) con seguridad; si la
+    tiene no se puede concluir nada, pero x sirve de guía para la búsqueda.
+    invariantes: Base de P-invariantes; permite descartar sin scipy
+
+    Returns:
+        tuple: (resultado, x): False si es seguro que no, True si la ecuación tiene
+               solución x y None si no se pudo decidir (sin scipy o sin nodos)
+    """
+    if not cubrir and invariantes is not None and not respeta_invariantes(invariantes, marcado_inicial, objetivo):
+        return False, None
+    if linprog is None:
+        return None, None
+    diferencia = [m - m0 for m, m0 in zip(objetivo, marcado_inicial)]
+    return resolver(C, diferencia, cubrir, entero, max_nodos)
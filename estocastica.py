@@ -0,0 +1,157 @@
+import heapq
+import random
+
+from Parte_I import OMEGA, RedPetri
+
+INFINITO = float('inf')
+
+
+class RedPetriEstocastica(RedPetri):
+    """
+    Red de Petri estocástica: cada transición habilitada dispara después de un tiempo
+    exponencial con su tasa. La simulación usa el método de la siguiente reacción
+    (Gibson-Bruck): cada transición tiene agendado su próximo disparo en un montículo y,
+    al disparar una, solo se reagendan las transiciones de afectadas[t]. Gracias a la
+    falta de memoria de la exponencial, una transición que sigue habilitada con la misma
+    tasa conserva su tiempo agendado.
+    """
+
+    def __init__(self, pre, post, marcado_inicial, tasas, servidores='uno', **opciones):
+        """
+        tasas: Lista con la tasa (> 0) de cada transición
+        servidores: 'uno' para tasa constante mientras está habilitada, o 'infinitos'
+                    para multiplicarla por el grado de habilitación
+        opciones: Se pasan a RedPetri (usar_numpy, tam_cache)
+        """
+        super().__init__(pre, post, marcado_inicial, **opciones)
+        if len(tasas) != self.n_transiciones or any(tasa <= 0 for tasa in tasas):
+            raise ValueError("Se necesita una tasa positiva por transición")
+        if servidores not in ('uno', 'infinitos'):
+            raise ValueError("servidores debe ser 'uno' o 'infinitos'")
+        self.tasas = list(tasas)
+        self.servidores = servidores
+
+    def tasa_efectiva(self, transicion, marcado):
+        """Tasa de una transición en un marcado (0 si no está habilitada)"""
+        if not self.esta_habilitada(transicion, marcado):
+            return 0.0
+        if self.servidores == 'uno' or not self.entradas[transicion]:
+            return self.tasas[transicion]
+        grado = min(marcado[p] // peso for p, peso in self.entradas[transicion])
+        return self.tasas[transicion] * grado
+
+    def simular(self, tiempo_max=None, max_eventos=None, semilla=None):
+        """
+        Simulación de eventos discretos desde el marcado inicial. Se detiene al llegar a
+        tiempo_max, al disparar max_eventos o en un bloqueo (al menos un límite es necesario
+        si la red nunca se bloquea).
+
+        Returns:
+            dict: Tiempo simulado, eventos, disparos y throughput por transición, marcas
+                  promedio en el tiempo por lugar, marcado final y si terminó en bloqueo
+        """
+        if tiempo_max is None and max_eventos is None:
+            raise ValueError("Indique tiempo_max o max_eventos")
+        if OMEGA in self.marcado_inicial:
+            raise ValueError("No se puede simular un marcado con ω")
+
+        rng = random.Random(semilla)
+        marcado = list(self.marcado_inicial)
+        ahora = 0.0
+        eventos = 0
+        disparos = [0] * self.n_transiciones
+
+        # Integral de cada lugar en el tiempo; solo se actualiza cuando el lugar cambia
+        integral = [0.0] * self.n_lugares
+        ultimo_cambio = [0.0] * self.n_lugares
+
+        # Montículo (tiempo, transicion, version); una entrada con una versión vieja se
+        # descarta al sacarla en lugar de buscarla para borrarla
+        agendado = [INFINITO] * self.n_transiciones
+        tasa_actual = [0.0] * self.n_transiciones
+        version = [0] * self.n_transiciones
+        monticulo = []
+
+        def agendar(t, tiempo):
+            agendado[t] = tiempo
+            version[t] += 1
+            if tiempo < INFINITO:
+                heapq.heappush(monticulo, (tiempo, t, version[t]))
+
+        for t in range(self.n_transiciones):
+            tasa_actual[t] = self.tasa_efectiva(t, marcado)
+            if tasa_actual[t] > 0:
+                agendar(t, rng.expovariate(tasa_actual[t]))
+
+        bloqueo = False
+        horizonte = None
+        while max_eventos is None or eventos < max_eventos:
+            # descartar entradas invalidadas
+            while monticulo and monticulo[0][2] != version[monticulo[0][1]]:
+                heapq.heappop(monticulo)
+            if not monticulo:
+                bloqueo = True
+                horizonte = tiempo_max
+                break
+            tiempo, t, _ = monticulo[0]
+            if tiempo_max is not None and tiempo > tiempo_max:
+                horizonte = tiempo_max
+                break
+            heapq.heappop(monticulo)
+
+            ahora = tiempo
+            for p, c in self.cambios[t]:
+                integral[p] += marcado[p] * (ahora - ultimo_cambio[p])
+                ultimo_cambio[p] = ahora
+                marcado[p] += c
+            disparos[t] += 1
+            eventos += 1
+
+            # la que disparó necesita un tiempo nuevo; las demás solo si cambió su tasa
+            tasa_actual[t] = self.tasa_efectiva(t, marcado)
+            agendar(t, ahora + rng.expovariate(tasa_actual[t]) if tasa_actual[t] > 0 else INFINITO)
+            for t2 in self.afectadas[t]:
+                if t2 == t:
+                    continue
+                nueva = self.tasa_efectiva(t2, marcado)
+                anterior = tasa_actual[t2]
+                if nueva == anterior:
+                    continue
+                tasa_actual[t2] = nueva
+                if nueva == 0:
+                    agendar(t2, INFINITO)
+                elif anterior == 0:
+                    agendar(t2, ahora + rng.expovariate(nueva))
+                else:
+                    # se reescala el tiempo restante (Gibson-Bruck), sin sortear de nuevo
+                    agendar(t2, ahora + (anterior / nueva) * (agendado[t2] - ahora))
+
+        if horizonte is None:
+            horizonte = ahora
+        for p in range(self.n_lugares):
+            integral[p] += marcado[p] * (horizonte - ultimo_cambio[p])
+
+        return {
+            'tiempo': horizonte,
+            'eventos': eventos,
+            'disparos': disparos,
+            'throughput': [d / horizonte if horizonte > 0 else 0.0 for d in disparos],
+            'marcas_promedio': [x / horizonte if horizonte > 0 else float(m)
+                                for x, m in zip(integral, marcado)],
+            'marcado_final': marcado,
+            'bloqueo': bloqueo
+        }
+
+
+def imprimir_simulacion_estocastica(resultado):
+    """Muestra el resultado de RedPetriEstocastica.simular"""
+    print("SIMULACIÓN ESTOCÁSTICA")
+    print(f"Tiempo simulado: {resultado['tiempo']:.4f} | Eventos: {resultado['eventos']}")
+    if resultado['bloqueo']:
+        print(f"La red se bloqueó en el marcado {resultado['marcado_final']}")
+    print("\nThroughput por transición (disparos por unidad de tiempo):")
+    for t, (n, x) in enumerate(zip(resultado['disparos'], resultado['throughput'])):
+        print(f"  T{t}: {x:.4f} ({n} disparos)")
+    print("Marcas promedio en el tiempo:")
+    for p, x in enumerate(resultado['marcas_promedio']):
+        print(f"  P{p}: {x:.4f}")
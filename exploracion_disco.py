@@ -0,0 +1,309 @@
+import hashlib
+import json
+import mmap
+import os
+from array import array
+from collections.abc import Mapping
+
+from almacen_estados import desempaquetar, empaquetar
+
+
+class ExploracionEnDisco(Mapping):
+    """
+    Búsqueda por anchura con el conjunto de visitados y la frontera en archivos, para
+    espacios de estados que no caben en memoria. La memoria usada queda acotada por los
+    búferes; el resto lo pagina el sistema operativo a través de mmap.
+
+    Archivos dentro del directorio:
+        meta.json: parámetros y punto de control del último nivel terminado
+        estados.bin: un registro por estado (marcado empaquetado, id del padre, transición)
+        tabla.bin: tabla hash de direccionamiento abierto (hash, id + 1) mapeada en memoria
+        frontera_<n>.bin: ids de los estados del nivel n que faltan por expandir
+
+    Si el directorio ya tiene una exploración de la misma red (pre, post y marcado inicial),
+    se reanuda desde el último nivel terminado.
+    Se comporta como un diccionario de solo lectura marcado -> {'padre', 'transicion'},
+    igual que busqueda_por_anchura. Mantiene abiertos sus archivos hasta cerrar(); se
+    puede usar como administrador de contexto:
+        with red.busqueda_en_disco("estados") as visitados:
+            ...
+    """
+
+    CAPACIDAD_INICIAL = 1 << 16     # casillas de la tabla hash (potencia de 2)
+    CARGA_MAXIMA = 0.5              # se duplica la tabla al pasar esta ocupación
+    TAM_BUFER = 1 << 22             # bytes de registros pendientes antes de escribirlos
+    TAM_BLOQUE_FRONTERA = 1 << 12   # ids de frontera leídos por bloque
+
+    def __init__(self, red, directorio):
+        """
+        red: Instancia de RedPetri a explorar
+        directorio: Carpeta donde viven los archivos de la exploración
+        """
+        self.red = red
+        self.directorio = directorio
+        self.n_lugares = red.n_lugares
+        self.bytes_marcado = 8 * self.n_lugares
+        self.bytes_registro = self.bytes_marcado + 16  # marcado + padre + transición
+        os.makedirs(directorio, exist_ok=True)
+
+        self._pendientes = bytearray()  # registros aún no escritos en estados.bin
+        self._mmap = None
+        self._casillas = None
+
+        huella = self.huella_red(red)
+        ruta_meta = self._ruta("meta.json")
+        if os.path.exists(ruta_meta):
+            with open(ruta_meta) as archivo:
+                self.meta = json.load(archivo)
+            if self.meta['n_lugares'] != self.n_lugares:
+                raise ValueError("La exploración guardada es de una red con otro número de lugares")
+            if self.meta.get('huella') != huella:
+                raise ValueError("La exploración guardada es de otra red (pre, post o marcado inicial distintos)")
+            self._abrir_estados()
+            # se descarta lo escrito después del último punto de control
+            os.truncate(self._ruta("estados.bin"), self.meta['n_estados'] * self.bytes_registro)
+            self.n_estados = self.meta['n_estados']
+            self._reconstruir_tabla(self.meta['capacidad'])
+        else:
+            self.meta = {
+                'n_lugares': self.n_lugares,
+                'huella': huella,
+                'n_estados': 0,
+                'nivel': 0,
+                'capacidad': self.CAPACIDAD_INICIAL,
+                'terminado': False
+            }
+            self._abrir_estados()
+            self.n_estados = 0
+            self._crear_tabla(self.CAPACIDAD_INICIAL, self._ruta("tabla.bin"))
+            self._insertar(tuple(red.marcado_inicial), -1, -1)
+            with open(self._ruta_frontera(0), 'wb') as archivo:
+                array('q', [0]).tofile(archivo)
+            self._guardar_punto_control(0)
+
+    @staticmethod
+    def huella_red(red):
+        """Resumen de pre, post y marcado inicial para no reanudar sobre otra red"""
+        datos = json.dumps([red.pre, red.post, list(red.marcado_inicial)]).encode()
+        return hashlib.blake2b(datos, digest_size=16).hexdigest()
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def _ruta_frontera(self, nivel):
+        return self._ruta(f"frontera_{nivel}.bin")
+
+    def _abrir_estados(self):
+        self._fd_estados = os.open(self._ruta("estados.bin"), os.O_RDWR | os.O_CREAT, 0o644)
+
+    # --- tabla hash en disco ---
+
+    def _hash(self, datos):
+        """Hash estable entre procesos (hash() de Python cambia en cada ejecución)"""
+        return int.from_bytes(hashlib.blake2b(datos, digest_size=8).digest(), 'little', signed=True)
+
+    def _crear_tabla(self, capacidad, ruta):
+        self._cerrar_tabla()
+        with open(ruta, 'wb') as archivo:
+            archivo.truncate(capacidad * 16)
+        self._abrir_tabla(ruta, capacidad)
+
+    def _abrir_tabla(self, ruta, capacidad):
+        self._archivo_tabla = open(ruta, 'r+b')
+        self._mmap = mmap.mmap(self._archivo_tabla.fileno(), capacidad * 16)
+        self._casillas = memoryview(self._mmap).cast('q')  # pares (hash, id + 1)
+        self.capacidad = capacidad
+        self._mascara = capacidad - 1
+
+    def _cerrar_tabla(self):
+        if self._mmap is not None:
+            self._casillas.release()
+            self._mmap.flush()
+            self._mmap.close()
+            self._archivo_tabla.close()
+            self._mmap = None
+
+    def _buscar(self, datos, codigo):
+        """
+        Returns:
+            tuple: (id, casilla) con id None si el marcado no está y casilla libre donde iría
+        """
+        casillas = self._casillas
+        i = codigo & self._mascara
+        while True:
+            ocupado = casillas[2 * i + 1]
+            if ocupado == 0:
+                return None, i
+            if casillas[2 * i] == codigo and self._leer_marcado(ocupado - 1) == datos:
+                return ocupado - 1, i
+            i = (i + 1) & self._mascara
+
+    def _reconstruir_tabla(self, capacidad):
+        """Vuelve a llenar la tabla a partir de estados.bin, en orden de id"""
+        while self.n_estados > capacidad * self.CARGA_MAXIMA:
+            capacidad *= 2
+        ruta_temporal = self._ruta("tabla.tmp")
+        self._crear_tabla(capacidad, ruta_temporal)
+        for estado_id, datos in enumerate(self._recorrer_registros()):
+            codigo = self._hash(datos[:self.bytes_marcado])
+            _, i = self._buscar(datos[:self.bytes_marcado], codigo)
+            self._casillas[2 * i] = codigo
+            self._casillas[2 * i + 1] = estado_id + 1
+        self._cerrar_tabla()
+        # el reemplazo es atómico, así una tabla a medio construir nunca queda como tabla.bin
+        os.replace(ruta_temporal, self._ruta("tabla.bin"))
+        self._abrir_tabla(self._ruta("tabla.bin"), capacidad)
+
+    # --- registros de estados ---
+
+    def _leer_registro(self, estado_id):
+        inicio_pendientes = self.n_estados - len(self._pendientes) // self.bytes_registro
+        if estado_id >= inicio_pendientes:
+            desplazamiento = (estado_id - inicio_pendientes) * self.bytes_registro
+            return bytes(self._pendientes[desplazamiento:desplazamiento + self.bytes_registro])
+        return os.pread(self._fd_estados, self.bytes_registro, estado_id * self.bytes_registro)
+
+    def _leer_marcado(self, estado_id):
+        return self._leer_registro(estado_id)[:self.bytes_marcado]
+
+    def _vaciar_pendientes(self):
+        if self._pendientes:
+            escritos = self.n_estados - len(self._pendientes) // self.bytes_registro
+            os.pwrite(self._fd_estados, self._pendientes, escritos * self.bytes_registro)
+            self._pendientes = bytearray()
+
+    def _recorrer_registros(self):
+        """Lee estados.bin (más los registros pendientes) de forma secuencial"""
+        self._vaciar_pendientes()
+        with open(self._ruta("estados.bin"), 'rb') as archivo:
+            for _ in range(self.n_estados):
+                yield archivo.read(self.bytes_registro)
+
+    def _insertar(self, marcado, padre, transicion):
+        """
+        Returns:
+            tuple: (id, nuevo) igual que AlmacenEstados.agregar
+        """
+        datos = empaquetar(marcado)
+        codigo = self._hash(datos)
+        existente, i = self._buscar(datos, codigo)
+        if existente is not None:
+            return existente, False
+
+        estado_id = self.n_estados
+        self._pendientes += datos
+        self._pendientes += array('q', [padre, transicion]).tobytes()
+        self.n_estados += 1
+        self._casillas[2 * i] = codigo
+        self._casillas[2 * i + 1] = estado_id + 1
+
+        if len(self._pendientes) >= self.TAM_BUFER:
+            self._vaciar_pendientes()
+        if self.n_estados > self.capacidad * self.CARGA_MAXIMA:
+            self._reconstruir_tabla(self.capacidad * 2)
+        return estado_id, True
+
+    def _guardar_punto_control(self, nivel):
+        """Escribe todo a disco y registra que el nivel indicado es el siguiente a expandir"""
+        self._vaciar_pendientes()
+        os.fsync(self._fd_estados)
+        self._mmap.flush()
+        self.meta.update({'n_estados': self.n_estados, 'nivel': nivel, 'capacidad': self.capacidad})
+        ruta_temporal = self._ruta("meta.tmp")
+        with open(ruta_temporal, 'w') as archivo:
+            json.dump(self.meta, archivo)
+        os.replace(ruta_temporal, self._ruta("meta.json"))
+
+    # --- búsqueda ---
+
+    def explorar(self, max_profundidad=None):
+        """
+        Ejecuta (o reanuda) la búsqueda por anchura nivel por nivel
+        max_profundidad: Profundidad máxima a explorar (None para explorar todo)
+
+        Returns:
+            ExploracionEnDisco: La misma instancia, para usarla como diccionario
+        """
+        nivel = self.meta['nivel']
+        while not self.meta['terminado']:
+            if max_profundidad is not None and nivel >= max_profundidad:
+                break
+
+            n_siguiente = 0
+            with open(self._ruta_frontera(nivel), 'rb') as actual, \
+                    open(self._ruta_frontera(nivel + 1), 'wb') as siguiente:
+                while True:
+                    bloque = array('q')
+                    try:
+                        bloque.fromfile(actual, self.TAM_BLOQUE_FRONTERA)
+                    except EOFError:
+                        pass  # fromfile deja en el arreglo lo que alcanzó a leer
+                    if not bloque:
+                        break
+                    nuevos = array('q')
+                    for estado_id in bloque:
+                        marcado = desempaquetar(self._leer_marcado(estado_id))
+                        # cada marcado se expande una sola vez, así que no se usa la caché
+                        for transicion in self.red._calcular_habilitadas(marcado):
+                            nuevo_marcado = self.red._sucesor(transicion, marcado)
+                            nuevo_id, es_nuevo = self._insertar(nuevo_marcado, estado_id, transicion)
+                            if es_nuevo:
+                                nuevos.append(nuevo_id)
+                    nuevos.tofile(siguiente)
+                    n_siguiente += len(nuevos)
+
+            nivel += 1
+            if n_siguiente == 0:
+                self.meta['terminado'] = True
+            self._guardar_punto_control(nivel)
+            os.remove(self._ruta_frontera(nivel - 1))
+
+        return self
+
+    def cerrar(self):
+        """Guarda lo pendiente y libera los archivos"""
+        if self._mmap is not None:
+            self._vaciar_pendientes()
+            self._cerrar_tabla()
+            os.close(self._fd_estados)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def __del__(self):
+        # por si no se cerró: al menos no se pierden los registros pendientes
+        if getattr(self, '_mmap', None) is not None:
+            self.cerrar()
+
+    # --- vista tipo diccionario ---
+
+    def id_de(self, marcado):
+        """Retorna el id de un marcado o None si no fue visitado"""
+        datos = empaquetar(marcado)
+        return self._buscar(datos, self._hash(datos))[0]
+
+    def marcado(self, estado_id):
+        return desempaquetar(self._leer_marcado(estado_id))
+
+    def __getitem__(self, marcado):
+        estado_id = self.id_de(marcado)
+        if estado_id is None:
+            raise KeyError(marcado)
+        padre, transicion = array('q', self._leer_registro(estado_id)[self.bytes_marcado:])
+        return {
+            'padre': self.marcado(padre) if padre >= 0 else None,
+            'transicion': transicion if transicion >= 0 else None
+        }
+
+    def __contains__(self, marcado):
+        return self.id_de(marcado) is not None
+
+    def __iter__(self):
+        for datos in self._recorrer_registros():
+            yield desempaquetar(datos[:self.bytes_marcado])
+
+    def __len__(self):
+        return self.n_estados
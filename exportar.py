@@ -0,0 +1,160 @@
+from xml.sax.saxutils import escape
+
+from Parte_I import OMEGA, SIMBOLO_OMEGA
+
+
+def etiqueta_marcado(marcado):
+    """Marcado como texto '[1, ω, 0]'"""
+    return "[" + ", ".join(SIMBOLO_OMEGA if x == OMEGA else str(x) for x in marcado) + "]"
+
+
+class EscritorGrafo:
+    """
+    Escribe un grafo de marcados a un archivo conforme se produce, sin guardarlo completo.
+    Cada marcado recibe un id entero corto la primera vez que aparece (en un nodo o un arco);
+    en memoria solo queda el diccionario marcado -> id.
+
+    Se usa como administrador de contexto:
+        with EscritorDOT("grafo.dot") as escritor:
+            grafo.expandir_grafo_cobertura(escritor=escritor)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.ids = {}
+        self.n_arcos = 0
+        self.archivo = open(ruta, 'w', encoding='utf-8')
+        self._encabezado()
+
+    def id_de(self, marcado):
+        """Id entero del marcado, asignándolo si es nuevo"""
+        marcado = tuple(marcado)
+        nodo_id = self.ids.get(marcado)
+        if nodo_id is None:
+            nodo_id = len(self.ids)
+            self.ids[marcado] = nodo_id
+        return nodo_id
+
+    def nodo(self, marcado, tipo):
+        """Declara un nodo una vez que su tipo es definitivo"""
+        self._escribir_nodo(self.id_de(marcado), marcado, tipo)
+
+    def arco(self, origen, destino, transicion):
+        self.n_arcos += 1
+        self._escribir_arco(self.id_de(origen), self.id_de(destino), transicion)
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self._pie()
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    # --- a definir por cada formato ---
+
+    def _encabezado(self):
+        pass
+
+    def _pie(self):
+        pass
+
+    def _escribir_nodo(self, nodo_id, marcado, tipo):
+        raise NotImplementedError
+
+    def _escribir_arco(self, origen_id, destino_id, transicion):
+        raise NotImplementedError
+
+
+class EscritorDOT(EscritorGrafo):
+    """Formato DOT de Graphviz con los mismos colores y formas que dibuja_red.dibuja_GC"""
+
+    def _encabezado(self):
+        self.archivo.write("digraph CoverageGraph {\n\trankdir=LR\n")
+
+    def _pie(self):
+        self.archivo.write("}\n")
+
+    def _escribir_nodo(self, nodo_id, marcado, tipo):
+        atributos = f'label="{etiqueta_marcado(marcado)}"'
+        if OMEGA in marcado:
+            atributos += " color=red"
+        elif tipo == 'terminal':
+            atributos += " shape=doublecircle style=filled"
+        self.archivo.write(f"\t{nodo_id} [{atributos}]\n")
+
+    def _escribir_arco(self, origen_id, destino_id, transicion):
+        self.archivo.write(f'\t{origen_id} -> {destino_id} [label="T{transicion}"]\n')
+
+
+class EscritorGraphML(EscritorGrafo):
+    """GraphML con el marcado y el tipo como datos de cada nodo y la transición en cada arco"""
+
+    def _encabezado(self):
+        self.archivo.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <key id="marcado" for="node" attr.name="marcado" attr.type="string"/>\n'
+            '  <key id="tipo" for="node" attr.name="tipo" attr.type="string"/>\n'
+            '  <key id="transicion" for="edge" attr.name="transicion" attr.type="int"/>\n'
+            '  <graph id="CoverageGraph" edgedefault="directed">\n')
+
+    def _pie(self):
+        self.archivo.write("  </graph>\n</graphml>\n")
+
+    def _escribir_nodo(self, nodo_id, marcado, tipo):
+        self.archivo.write(
+            f'    <node id="n{nodo_id}"><data key="marcado">{escape(etiqueta_marcado(marcado))}</data>'
+            f'<data key="tipo">{escape(tipo)}</data></node>\n')
+
+    def _escribir_arco(self, origen_id, destino_id, transicion):
+        self.archivo.write(
+            f'    <edge source="n{origen_id}" target="n{destino_id}">'
+            f'<data key="transicion">{transicion}</data></edge>\n')
+
+
+class EscritorListaArcos(EscritorGrafo):
+    """
+    Lista compacta de texto, una línea por elemento:
+        n <id> <marcado separado por comas, w para omega> <tipo>
+        a <origen> <destino> <transicion>
+    """
+
+    def _escribir_nodo(self, nodo_id, marcado, tipo):
+        valores = ",".join("w" if x == OMEGA else str(x) for x in marcado)
+        self.archivo.write(f"n {nodo_id} {valores} {tipo}\n")
+
+    def _escribir_arco(self, origen_id, destino_id, transicion):
+        self.archivo.write(f"a {origen_id} {destino_id} {transicion}\n")
+
+
+FORMATOS = {
+    'dot': EscritorDOT,
+    'graphml': EscritorGraphML,
+    'lista': EscritorListaArcos,
+}
+
+
+def crear_escritor(ruta, formato='dot'):
+    """Crea el escritor del formato indicado ('dot', 'graphml' o 'lista')"""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato}. Opciones: {', '.join(FORMATOS)}")
+    return FORMATOS[formato](ruta)
+
+
+def exportar(nodos, arcos, ruta, formato='dot'):
+    """
+    Escribe un grafo ya construido (nodos, arcos de expandir_grafo_cobertura)
+
+    Returns:
+        int: Número de nodos escritos
+    """
+    with crear_escritor(ruta, formato) as escritor:
+        for marcado, info in nodos.items():
+            escritor.nodo(marcado, info['tipo'])
+        for arco in arcos:
+            escritor.arco(arco['origen'], arco['destino'], arco['transicion'])
+        return len(escritor.ids)
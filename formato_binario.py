@@ -0,0 +1,361 @@
+import mmap
+import struct
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_left
+
+from Parte_I import RedPetri
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional, solo lo usa como_arreglos
+    np = None
+
+VERSION = 1
+
+# Encabezados (little endian). Todas las secciones empiezan en múltiplos de 8 bytes,
+# así se pueden ver directamente como arreglos con memoryview.cast
+MAGIA_RED = b'RDPN'
+ENCABEZADO_RED = struct.Struct('<4sHHIIII')      # magia, versión, reservado, |P|, |T|, arcos pre, arcos post
+MAGIA_GRAFO = b'RDPG'
+ENCABEZADO_GRAFO = struct.Struct('<4sHHIQQ')     # magia, versión, reservado, |P|, nodos, arcos
+
+TIPOS = ('frontera', 'expandido', 'terminal', 'profundidad_maxima', 'duplicado')
+CODIGO_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+
+
+def _relleno(tam):
+    return b'\0' * (-tam % 8)
+
+
+def _leer_encabezado(datos, formato, magia):
+    valores = formato.unpack_from(datos, 0)
+    if valores[0] != magia:
+        raise ValueError("El archivo no tiene el formato esperado")
+    if valores[1] > VERSION:
+        raise ValueError(f"Versión de archivo {valores[1]} no soportada (máxima {VERSION})")
+    return valores
+
+
+# --- redes ---
+
+def _arcos_por_transicion(indices):
+    """
+    Arcos en formato CSR: inicios[t]..inicios[t + 1] son los arcos de la transición t
+
+    Returns:
+        tuple: (inicios, lugares, pesos) como arreglos
+    """
+    inicios, lugares, pesos = array('q', [0]), array('q'), array('q')
+    for arcos in indices:
+        for p, peso in arcos:
+            lugares.append(p)
+            pesos.append(peso)
+        inicios.append(len(lugares))
+    return inicios, lugares, pesos
+
+
+def guardar_red(red, ruta):
+    """Guarda pre, post y el marcado inicial de una RedPetri con los arcos en CSR"""
+    pre = _arcos_por_transicion(red.entradas)
+    post = _arcos_por_transicion(red.salidas)
+    with open(ruta, 'wb') as archivo:
+        archivo.write(ENCABEZADO_RED.pack(MAGIA_RED, VERSION, 0, red.n_lugares, red.n_transiciones,
+                                          len(pre[1]), len(post[1])))
+        archivo.write(_relleno(ENCABEZADO_RED.size))
+        array('q', red.marcado_inicial).tofile(archivo)
+        for arreglo in pre + post:
+            arreglo.tofile(archivo)
+
+
+def cargar_red(ruta, **opciones):
+    """
+    Lee una red guardada con guardar_red
+    opciones: Se pasan a RedPetri (usar_numpy, tam_cache)
+
+    Returns:
+        RedPetri: La red con su marcado inicial
+    """
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    _, _, _, n_lugares, n_transiciones, n_pre, n_post = _leer_encabezado(datos, ENCABEZADO_RED, MAGIA_RED)
+    valores = memoryview(datos)[ENCABEZADO_RED.size + len(_relleno(ENCABEZADO_RED.size)):].cast('q')
+
+    marcado_inicial = list(valores[:n_lugares])
+    posicion = n_lugares
+    matrices = []
+    for n_arcos in (n_pre, n_post):
+        inicios = valores[posicion:posicion + n_transiciones + 1]
+        lugares = valores[posicion + n_transiciones + 1:posicion + n_transiciones + 1 + n_arcos]
+        pesos = valores[posicion + n_transiciones + 1 + n_arcos:posicion + n_transiciones + 1 + 2 * n_arcos]
+        posicion += n_transiciones + 1 + 2 * n_arcos
+        matriz = [[0] * n_transiciones for _ in range(n_lugares)]
+        for t in range(n_transiciones):
+            for k in range(inicios[t], inicios[t + 1]):
+                matriz[lugares[k]][t] = pesos[k]
+        matrices.append(matriz)
+    return RedPetri(matrices[0], matrices[1], marcado_inicial, **opciones)
+
+
+# --- grafos de cobertura ---
+
+def guardar_grafo(nodos, arcos, ruta):
+    """
+    Guarda el resultado de expandir_grafo_cobertura. Los nodos se ordenan por marcado para
+    poder buscarlos con búsqueda binaria sobre el archivo; los arcos quedan en CSR por origen.
+
+    Secciones después del encabezado:
+        marcados   int64[nodos x lugares]
+        profundidad int64[nodos], padre int64[nodos] (-1 en la raíz)
+        inicios    int64[nodos + 1], destinos int64[arcos], transiciones int64[arcos]
+        tipos      uint8[nodos]
+    """
+    orden = sorted(nodos)
+    ids = {marcado: i for i, marcado in enumerate(orden)}
+    n_lugares = len(orden[0]) if orden else 0
+
+    salientes = [[] for _ in orden]
+    for arco in arcos:
+        salientes[ids[arco['origen']]].append((ids[arco['destino']], arco['transicion']))
+
+    with open(ruta, 'wb') as archivo:
+        archivo.write(ENCABEZADO_GRAFO.pack(MAGIA_GRAFO, VERSION, 0, n_lugares, len(orden), len(arcos)))
+        archivo.write(_relleno(ENCABEZADO_GRAFO.size))
+        marcados = array('q')
+        for marcado in orden:
+            marcados.extend(marcado)
+        marcados.tofile(archivo)
+        array('q', (nodos[m]['profundidad'] for m in orden)).tofile(archivo)
+        array('q', (-1 if nodos[m]['padre'] is None else ids[nodos[m]['padre']] for m in orden)).tofile(archivo)
+
+        inicios, destinos, transiciones = array('q', [0]), array('q'), array('q')
+        for lista in salientes:
+            for destino, transicion in lista:
+                destinos.append(destino)
+                transiciones.append(transicion)
+            inicios.append(len(destinos))
+        inicios.tofile(archivo)
+        destinos.tofile(archivo)
+        transiciones.tofile(archivo)
+        archivo.write(bytes(CODIGO_TIPO[nodos[m]['tipo']] for m in orden))
+
+
+class GrafoGuardado:
+    """
+    Grafo de cobertura abierto con mmap: no se lee nada hasta que se consulta, así que
+    abrirlo cuesta lo mismo sin importar su tamaño. Los nodos se identifican por su
+    posición en el archivo (orden de marcado).
+    """
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, 'rb')
+        self.mmap = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (_, self.version, _, self.n_lugares,
+         self.n_nodos, self.n_arcos) = _leer_encabezado(self.mmap, ENCABEZADO_GRAFO, MAGIA_GRAFO)
+
+        vista = memoryview(self.mmap)
+        inicio = ENCABEZADO_GRAFO.size + len(_relleno(ENCABEZADO_GRAFO.size))
+        secciones = []
+        for tam in (self.n_nodos * self.n_lugares, self.n_nodos, self.n_nodos,
+                    self.n_nodos + 1, self.n_arcos, self.n_arcos):
+            secciones.append(vista[inicio:inicio + 8 * tam].cast('q'))
+            inicio += 8 * tam
+        (self._marcados, self._profundidades, self._padres,
+         self._inicios, self._destinos, self._transiciones) = secciones
+        self._tipos = vista[inicio:inicio + self.n_nodos]
+
+    def cerrar(self):
+        """
+        Libera las vistas y cierra el archivo. Si siguen vivos arreglos de como_arreglos,
+        el mapa no se puede cerrar todavía: se deja abierto y se libera cuando el
+        recolector elimine esos arreglos
+        """
+        try:
+            for seccion in (self._marcados, self._profundidades, self._padres,
+                            self._inicios, self._destinos, self._transiciones, self._tipos):
+                seccion.release()
+            self.mmap.close()
+        except BufferError:
+            pass
+        self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def __len__(self):
+        return self.n_nodos
+
+    def marcado(self, nodo):
+        inicio = nodo * self.n_lugares
+        return tuple(self._marcados[inicio:inicio + self.n_lugares])
+
+    def tipo(self, nodo):
+        return TIPOS[self._tipos[nodo]]
+
+    def profundidad(self, nodo):
+        return self._profundidades[nodo]
+
+    def padre(self, nodo):
+        """Id del padre en el árbol de expansión, o None para la raíz"""
+        padre = self._padres[nodo]
+        return None if padre < 0 else padre
+
+    def sucesores(self, nodo):
+        """
+        Returns:
+            list: [(transicion, nodo destino), ...]
+        """
+        return [(self._transiciones[k], self._destinos[k])
+                for k in range(self._inicios[nodo], self._inicios[nodo + 1])]
+
+    def id_de(self, marcado):
+        """Busca un marcado con búsqueda binaria; None si no está"""
+        marcado = tuple(marcado)
+        vista = _VistaMarcados(self)
+        i = bisect_left(vista, marcado)
+        if i < self.n_nodos and vista[i] == marcado:
+            return i
+        return None
+
+    def __contains__(self, marcado):
+        return self.id_de(marcado) is not None
+
+    def como_grafo(self):
+        """
+        Returns:
+            tuple: (nodos, arcos) con la misma forma que expandir_grafo_cobertura
+        """
+        marcados = [self.marcado(i) for i in range(self.n_nodos)]
+        nodos = {}
+        for i, marcado in enumerate(marcados):
+            padre = self.padre(i)
+            nodos[marcado] = {
+                'tipo': self.tipo(i),
+                'marcado': marcado,
+                'profundidad': self.profundidad(i),
+                'padre': None if padre is None else marcados[padre]
+            }
+        arcos = [{'origen': marcados[i], 'destino': marcados[j], 'transicion': t}
+                 for i in range(self.n_nodos) for t, j in self.sucesores(i)]
+        return nodos, arcos
+
+    def arreglos_csr(self):
+        """
+        Copia de los arcos en CSR, sin requerir numpy
+
+        Returns:
+            tuple: (inicios, destinos, transiciones) como array('q'); los arcos del nodo v
+                   están en las posiciones inicios[v]..inicios[v+1]-1
+        """
+        return array('q', self._inicios), array('q', self._destinos), array('q', self._transiciones)
+
+    def como_arreglos(self):
+        """
+        Vistas de NumPy sobre el archivo, sin copiar. Mantienen el mapa abierto aunque se
+        llame a cerrar; se libera al eliminar las vistas
+
+        Returns:
+            dict: marcados (nodos x lugares), profundidad, padre, inicios, destinos,
+                  transiciones y tipos
+        """
+        if np is None:
+            raise ImportError("como_arreglos requiere numpy (pip install numpy)")
+        return {
+            'marcados': np.frombuffer(self._marcados, dtype=np.int64).reshape(self.n_nodos, self.n_lugares),
+            'profundidad': np.frombuffer(self._profundidades, dtype=np.int64),
+            'padre': np.frombuffer(self._padres, dtype=np.int64),
+            'inicios': np.frombuffer(self._inicios, dtype=np.int64),
+            'destinos': np.frombuffer(self._destinos, dtype=np.int64),
+            'transiciones': np.frombuffer(self._transiciones, dtype=np.int64),
+            'tipos': np.frombuffer(self._tipos, dtype=np.uint8)
+        }
+
+
+class _VistaMarcados:
+    """Secuencia de marcados sobre el archivo, para usar bisect sin cargarlos"""
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+
+    def __len__(self):
+        return self.grafo.n_nodos
+
+    def __getitem__(self, i):
+        return self.grafo.marcado(i)
+
+
+# --- PNML ---
+
+def _local(etiqueta):
+    """Nombre de la etiqueta XML sin el espacio de nombres"""
+    return etiqueta.rsplit('}', 1)[-1]
+
+
+def _texto_entero(elemento, defecto):
+    """Entero dentro de <text> (acepta el formato 'Default,3' de PIPE)"""
+    if elemento is None:
+        return defecto
+    for hijo in elemento.iter():
+        if _local(hijo.tag) in ('text', 'value') and hijo.text and hijo.text.strip():
+            return int(hijo.text.strip().split(',')[-1])
+    return defecto
+
+
+def _hijo(elemento, nombre):
+    return next((hijo for hijo in elemento if _local(hijo.tag) == nombre), None)
+
+
+def leer_pnml(ruta):
+    """
+    Importa una red lugar/transición en formato PNML (estándar ISO/IEC 15909-2).
+    Se recorren todas las páginas; los arcos inhibidores o de reinicio no se soportan.
+
+    Returns:
+        tuple: (pre, post, marcado_inicial, nombres_lugares, nombres_transiciones)
+    """
+    raiz = ET.parse(ruta).getroot()
+    lugares, transiciones, arcos = [], [], []
+    for elemento in raiz.iter():
+        etiqueta = _local(elemento.tag)
+        if etiqueta == 'place':
+            lugares.append(elemento)
+        elif etiqueta == 'transition':
+            transiciones.append(elemento)
+        elif etiqueta == 'arc':
+            arcos.append(elemento)
+
+    indice_lugar = {lugar.get('id'): i for i, lugar in enumerate(lugares)}
+    indice_transicion = {t.get('id'): i for i, t in enumerate(transiciones)}
+
+    def nombre(elemento):
+        etiqueta = _hijo(elemento, 'name')
+        texto = _hijo(etiqueta, 'text') if etiqueta is not None else None
+        return texto.text.strip() if texto is not None and texto.text else elemento.get('id')
+
+    pre = [[0] * len(transiciones) for _ in lugares]
+    post = [[0] * len(transiciones) for _ in lugares]
+    for arco in arcos:
+        tipo = _hijo(arco, 'type')
+        if tipo is not None and tipo.get('value', 'normal') != 'normal':
+            raise ValueError(f"Arco {arco.get('id')} de tipo '{tipo.get('value')}' no soportado")
+        origen, destino = arco.get('source'), arco.get('target')
+        peso = _texto_entero(_hijo(arco, 'inscription'), 1)
+        if origen in indice_lugar and destino in indice_transicion:
+            pre[indice_lugar[origen]][indice_transicion[destino]] += peso
+        elif origen in indice_transicion and destino in indice_lugar:
+            post[indice_lugar[destino]][indice_transicion[origen]] += peso
+        else:
+            raise ValueError(f"Arco {arco.get('id')} no une un lugar con una transición")
+
+    marcado_inicial = [_texto_entero(_hijo(lugar, 'initialMarking'), 0) for lugar in lugares]
+    return (pre, post, marcado_inicial,
+            [nombre(lugar) for lugar in lugares], [nombre(t) for t in transiciones])
+
+
+def importar_pnml(ruta, **opciones):
+    """Crea una RedPetri a partir de un archivo PNML (ver leer_pnml)"""
+    pre, post, marcado_inicial, _, _ = leer_pnml(ruta)
+    return RedPetri(pre, post, marcado_inicial, **opciones)
@@ -0,0 +1,132 @@
+import random
+
+
+def _red_vacia(n_lugares, n_transiciones):
+    """Matrices pre y post en ceros (lugares x transiciones)"""
+    pre = [[0] * n_transiciones for _ in range(n_lugares)]
+    post = [[0] * n_transiciones for _ in range(n_lugares)]
+    return pre, post
+
+
+def filosofos(n):
+    """
+    Cena de los filósofos con n filósofos que toman primero el tenedor izquierdo y luego
+    el derecho, así que la red tiene un bloqueo (todos con el izquierdo en la mano).
+    Lugares por filósofo i: pensando, esperando (tiene el izquierdo), comiendo, tenedor.
+    Transiciones por filósofo i: tomar izquierdo, tomar derecho, soltar ambos.
+
+    Returns:
+        tuple: (pre, post, marcado_inicial)
+    """
+    if n < 2:
+        raise ValueError("Se necesitan al menos 2 filósofos")
+    pre, post = _red_vacia(4 * n, 3 * n)
+    marcado_inicial = [0] * (4 * n)
+    for i in range(n):
+        pensando, esperando, comiendo, tenedor = 4 * i, 4 * i + 1, 4 * i + 2, 4 * i + 3
+        tenedor_derecho = 4 * ((i + 1) % n) + 3
+        tomar_izquierdo, tomar_derecho, soltar = 3 * i, 3 * i + 1, 3 * i + 2
+        marcado_inicial[pensando] = 1
+        marcado_inicial[tenedor] = 1
+
+        pre[pensando][tomar_izquierdo] = 1
+        pre[tenedor][tomar_izquierdo] = 1
+        post[esperando][tomar_izquierdo] = 1
+
+        pre[esperando][tomar_derecho] = 1
+        pre[tenedor_derecho][tomar_derecho] = 1
+        post[comiendo][tomar_derecho] = 1
+
+        pre[comiendo][soltar] = 1
+        post[pensando][soltar] = 1
+        post[tenedor][soltar] = 1
+        post[tenedor_derecho][soltar] = 1
+    return pre, post, marcado_inicial
+
+
+def productor_consumidor(k, capacidad=1, acotado=True):
+    """
+    Productor y consumidor unidos por una cadena de k búferes con la capacidad dada.
+    El espacio de estados crece como (capacidad + 1)^k.
+    Lugares por búfer i: lleno (2i) y libre (2i + 1).
+    Transiciones: producir (0), mover del búfer i al i + 1 (i + 1), consumir (k).
+    acotado: Si es False el productor no espera lugar libre y el primer búfer crece sin
+             límite (útil para el grafo de cobertura)
+
+    Returns:
+        tuple: (pre, post, marcado_inicial)
+    """
+    if k < 1:
+        raise ValueError("Se necesita al menos un búfer")
+    pre, post = _red_vacia(2 * k, k + 1)
+    marcado_inicial = [0] * (2 * k)
+    for i in range(k):
+        marcado_inicial[2 * i + 1] = capacidad
+
+    producir, consumir = 0, k
+    post[0][producir] = 1
+    if acotado:
+        pre[1][producir] = 1
+    for i in range(k - 1):
+        mover = i + 1
+        pre[2 * i][mover] = 1
+        post[2 * i + 1][mover] = 1
+        pre[2 * (i + 1) + 1][mover] = 1
+        post[2 * (i + 1)][mover] = 1
+    pre[2 * (k - 1)][consumir] = 1
+    post[2 * (k - 1) + 1][consumir] = 1
+    return pre, post, marcado_inicial
+
+
+def anillo(n, fichas=1):
+    """
+    Anillo de n lugares donde la transición i pasa una marca del lugar i al i + 1.
+    Todas las fichas empiezan en el lugar 0.
+
+    Returns:
+        tuple: (pre, post, marcado_inicial)
+    """
+    if n < 2:
+        raise ValueError("El anillo necesita al menos 2 lugares")
+    pre, post = _red_vacia(n, n)
+    for i in range(n):
+        pre[i][i] = 1
+        post[(i + 1) % n][i] = 1
+    marcado_inicial = [0] * n
+    marcado_inicial[0] = fichas
+    return pre, post, marcado_inicial
+
+
+def aleatoria_dispersa(n_lugares, n_transiciones, arcos=2, peso_max=1, densidad_marcas=0.3,
+                       conservativa=False, semilla=None):
+    """
+    Red aleatoria dispersa: cada transición tiene entre 1 y arcos lugares de entrada y
+    de salida, con pesos entre 1 y peso_max. Puede no ser acotada.
+    densidad_marcas: Probabilidad de que un lugar empiece con una marca
+    conservativa: Si es True cada transición consume y produce el mismo número de marcas
+                  (pesos 1), así el total se conserva y la red es acotada
+
+    Returns:
+        tuple: (pre, post, marcado_inicial)
+    """
+    rng = random.Random(semilla)
+    pre, post = _red_vacia(n_lugares, n_transiciones)
+    for t in range(n_transiciones):
+        n_arcos = rng.randint(1, min(arcos, n_lugares))
+        for matriz in (pre, post):
+            if not conservativa:
+                n_arcos = rng.randint(1, min(arcos, n_lugares))
+            for p in rng.sample(range(n_lugares), n_arcos):
+                matriz[p][t] = 1 if conservativa else rng.randint(1, peso_max)
+    marcado_inicial = [1 if rng.random() < densidad_marcas else 0 for _ in range(n_lugares)]
+    return pre, post, marcado_inicial
+
+
+# familia -> función que recibe el tamaño
+FAMILIAS = {
+    'filosofos': filosofos,
+    'productor_consumidor': lambda k: productor_consumidor(k, capacidad=2),
+    'anillo': lambda n: anillo(n, fichas=2),
+    'aleatoria': lambda n: aleatoria_dispersa(n, 2 * n, arcos=1, densidad_marcas=0.2,
+                                              conservativa=True, semilla=n),
+}
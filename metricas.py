@@ -0,0 +1,135 @@
+import time
+
+FASES = ('habilitacion', 'disparo', 'reglas_cobertura')
+
+
+class Metricas:
+    """
+    Métricas de una exploración (búsqueda por anchura o grafo de cobertura).
+    Los contadores cuestan una suma; los tiempos por fase se toman con muestreo: solo una
+    de cada `muestreo` llamadas lee el reloj y el total se estima escalando, así se puede
+    dejar encendido sin pagar dos lecturas de reloj por disparo.
+
+    Uso dentro de un ciclo:
+        inicio = metricas.iniciar('disparo')
+        ...
+        metricas.terminar('disparo', inicio)
+    """
+
+    def __init__(self, callback=None, intervalo=1.0, muestreo=64, revisar_cada=1024):
+        """
+        callback: Función que recibe resumen() cada `intervalo` segundos (opcional)
+        intervalo: Segundos mínimos entre dos llamadas al callback
+        muestreo: Se mide el tiempo de una de cada `muestreo` llamadas por fase (1 mide todas)
+        revisar_cada: Cada cuántos estados nuevos se consulta el reloj para el callback
+        """
+        self.callback = callback
+        self.intervalo = intervalo
+        self.muestreo = max(1, muestreo)
+        self.revisar_cada = max(1, revisar_cada)
+
+        self.estados = 0
+        self.duplicados = 0
+        self.introducciones_omega = 0
+        self.frontera = 0
+        self.max_frontera = 0
+        self.por_profundidad = []
+
+        self.llamadas = dict.fromkeys(FASES, 0)
+        self.muestras = dict.fromkeys(FASES, 0)
+        self.tiempo_muestras = dict.fromkeys(FASES, 0.0)
+
+        self.inicio = None
+        self.fin = None
+        self._ultimo_reporte = None
+
+    # --- ciclo de vida ---
+
+    def comenzar(self):
+        self.inicio = self._ultimo_reporte = time.perf_counter()
+        self.fin = None
+
+    def finalizar(self):
+        self.fin = time.perf_counter()
+        if self.callback is not None:
+            self.callback(self.resumen())
+
+    # --- eventos ---
+
+    def nuevo_estado(self, profundidad, frontera):
+        """Registra un estado descubierto a la profundidad dada y el tamaño de la frontera"""
+        self.estados += 1
+        while len(self.por_profundidad) <= profundidad:
+            self.por_profundidad.append(0)
+        self.por_profundidad[profundidad] += 1
+        self.frontera = frontera
+        if frontera > self.max_frontera:
+            self.max_frontera = frontera
+
+        if self.callback is not None and self.estados % self.revisar_cada == 0:
+            ahora = time.perf_counter()
+            if ahora - self._ultimo_reporte >= self.intervalo:
+                self._ultimo_reporte = ahora
+                self.callback(self.resumen())
+
+    def duplicado(self):
+        self.duplicados += 1
+
+    def omegas(self, cantidad):
+        """Registra lugares que pasaron a ω al aplicar las reglas de cobertura"""
+        self.introducciones_omega += cantidad
+
+    # --- tiempos muestreados ---
+
+    def iniciar(self, fase):
+        """
+        Returns:
+            float: Instante de inicio si esta llamada se mide, None si no
+        """
+        self.llamadas[fase] += 1
+        if self.llamadas[fase] % self.muestreo == 0:
+            return time.perf_counter()
+        return None
+
+    def terminar(self, fase, inicio):
+        if inicio is not None:
+            self.tiempo_muestras[fase] += time.perf_counter() - inicio
+            self.muestras[fase] += 1
+
+    def tiempo_estimado(self, fase):
+        """Tiempo total estimado de una fase: promedio de las muestras por número de llamadas"""
+        if not self.muestras[fase]:
+            return 0.0
+        return self.tiempo_muestras[fase] / self.muestras[fase] * self.llamadas[fase]
+
+    def tiempo_total(self):
+        if self.inicio is None:
+            return 0.0
+        return (self.fin if self.fin is not None else time.perf_counter()) - self.inicio
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Contadores, velocidad y tiempo estimado por fase hasta este momento
+        """
+        total = self.tiempo_total()
+        resumen = {
+            'estados': self.estados,
+            'estados_por_segundo': self.estados / total if total > 0 else 0.0,
+            'duplicados': self.duplicados,
+            'introducciones_omega': self.introducciones_omega,
+            'frontera': self.frontera,
+            'max_frontera': self.max_frontera,
+            'nodos_por_profundidad': list(self.por_profundidad),
+            'tiempo_total': total
+        }
+        for fase in FASES:
+            resumen[f'tiempo_{fase}'] = self.tiempo_estimado(fase)
+        return resumen
+
+
+def imprimir_progreso(resumen):
+    """Callback sencillo que muestra una línea de progreso"""
+    print(f"[{resumen['tiempo_total']:.1f}s] estados: {resumen['estados']} | "
+          f"frontera: {resumen['frontera']} | {resumen['estados_por_segundo']:.0f} estados/s | "
+          f"duplicados: {resumen['duplicados']} | ω: {resumen['introducciones_omega']}")
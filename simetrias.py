@@ -0,0 +1,309 @@
+from collections import deque
+
+
+def aplicar(permutacion, marcado):
+    """Marcado permutado: el valor del lugar p pasa al lugar permutacion[p]"""
+    nuevo = [0] * len(marcado)
+    for p, x in enumerate(marcado):
+        nuevo[permutacion[p]] = x
+    return tuple(nuevo)
+
+
+def _lugares_de(red, t):
+    """Lugares con arco de entrada o de salida en la transición t"""
+    return {p for p, _ in red.entradas[t]} | {p for p, _ in red.salidas[t]}
+
+
+def _columnas(red):
+    """Para cada transición, sus arcos como conjunto {(lugar, peso pre, peso post)}"""
+    return [frozenset((p, red.pre[p][t], red.post[p][t]) for p in _lugares_de(red, t))
+            for t in range(red.n_transiciones)]
+
+
+def permutacion_transiciones(red, lugares):
+    """
+    Deduce la permutación de transiciones que acompaña a una de lugares: cada transición
+    debe ir a otra con los mismos pesos sobre los lugares permutados
+
+    Returns:
+        tuple: Permutación de transiciones, o None si la de lugares no es un automorfismo
+    """
+    columnas = _columnas(red)
+    por_columna = {}
+    for t, columna in enumerate(columnas):
+        por_columna.setdefault(columna, []).append(t)
+    transiciones = [None] * red.n_transiciones
+    for t, columna in enumerate(columnas):
+        destinos = por_columna.get(frozenset((lugares[p], a, b) for p, a, b in columna))
+        if not destinos:
+            return None
+        # transiciones idénticas se reparten en orden para que sea una biyección
+        transiciones[t] = destinos.pop(0)
+    return tuple(transiciones)
+
+
+def es_automorfismo(red, lugares, transiciones):
+    """True si la permutación conserva pre, post y el marcado inicial"""
+    if sorted(lugares) != list(range(red.n_lugares)) or sorted(transiciones) != list(range(red.n_transiciones)):
+        return False
+    for t in range(red.n_transiciones):
+        lugares_t = _lugares_de(red, t)
+        # mismo número de arcos en la imagen, así no le sobran arcos
+        if len(lugares_t) != len(_lugares_de(red, transiciones[t])):
+            return False
+        for p in lugares_t:
+            if (red.pre[p][t] != red.pre[lugares[p]][transiciones[t]] or
+                    red.post[p][t] != red.post[lugares[p]][transiciones[t]]):
+                return False
+    return aplicar(lugares, red.marcado_inicial) == tuple(red.marcado_inicial)
+
+
+# --- detección por individualización y refinamiento ---
+
+def _vecinos(red):
+    """Grafo bipartito: lugares 0..P-1, transiciones P..P+T-1, arcos etiquetados con (pre, post)"""
+    n_lugares = red.n_lugares
+    vecinos = [[] for _ in range(n_lugares + red.n_transiciones)]
+    for t in range(red.n_transiciones):
+        for p in _lugares_de(red, t):
+            peso = (red.pre[p][t], red.post[p][t])
+            vecinos[p].append((peso, n_lugares + t))
+            vecinos[n_lugares + t].append((peso, p))
+    return vecinos
+
+
+def _refinar(colores, vecinos):
+    """
+    Refinamiento de colores hasta una partición equitativa. Los colores nuevos son el
+    rango de la firma (color, vecindad coloreada) ordenada, así dos coloraciones que se
+    corresponden por una permutación se refinan igual.
+    """
+    n_colores = len(set(colores))
+    while True:
+        firmas = [(colores[v], tuple(sorted((peso, colores[u]) for peso, u in vecinos[v])))
+                  for v in range(len(colores))]
+        rango = {firma: i for i, firma in enumerate(sorted(set(firmas)))}
+        colores = [rango[firma] for firma in firmas]
+        if len(rango) == n_colores:
+            return colores
+        n_colores = len(rango)
+
+
+def _individualizar(colores, v, vecinos):
+    """Le da a v un color propio (mayor que todos) y refina"""
+    colores = list(colores)
+    colores[v] = len(colores)
+    return _refinar(colores, vecinos)
+
+
+def _celda_objetivo(colores):
+    """Color de la primera celda con más de un vértice, o None si la partición es discreta"""
+    tamanos = {}
+    for c in colores:
+        tamanos[c] = tamanos.get(c, 0) + 1
+    return min((c for c, n in tamanos.items() if n > 1), default=None)
+
+
+def _buscar_automorfismo(red, colores_a, colores_b, vecinos):
+    """
+    Busca una permutación que lleve la coloración a en la b, individualizando en a
+    siempre el primer vértice de la celda y en b cada candidato
+
+    Returns:
+        tuple: (lugares, transiciones), o None si no existe
+    """
+    if sorted(colores_a) != sorted(colores_b):
+        return None
+    celda = _celda_objetivo(colores_a)
+    if celda is None:
+        imagen = {c: v for v, c in enumerate(colores_b)}
+        mapeo = [imagen[c] for c in colores_a]
+        n_lugares = red.n_lugares
+        lugares = tuple(mapeo[:n_lugares])
+        transiciones = tuple(v - n_lugares for v in mapeo[n_lugares:])
+        return (lugares, transiciones) if es_automorfismo(red, lugares, transiciones) else None
+    v = colores_a.index(celda)
+    siguiente_a = _individualizar(colores_a, v, vecinos)
+    for w, c in enumerate(colores_b):
+        if c == celda:
+            encontrado = _buscar_automorfismo(red, siguiente_a, _individualizar(colores_b, w, vecinos), vecinos)
+            if encontrado is not None:
+                return encontrado
+    return None
+
+
+def _orbita(v, generadores):
+    orbita = {v}
+    pendientes = [v]
+    while pendientes:
+        u = pendientes.pop()
+        for g in generadores:
+            if g[u] not in orbita:
+                orbita.add(g[u])
+                pendientes.append(g[u])
+    return orbita
+
+
+def detectar_automorfismos(red):
+    """
+    Generadores del grupo de automorfismos de la red (pre, post y marcado inicial) por
+    individualización y refinamiento: sobre el camino que individualiza siempre el primer
+    vértice de la primera celda, se busca para cada otro vértice de la celda un
+    automorfismo que lo lleve a él, saltando los que ya están en la órbita. Es exponencial
+    en el peor caso, pero rápido en redes formadas por réplicas.
+
+    Returns:
+        list: Generadores como tuplas (permutación de lugares, permutación de transiciones)
+    """
+    n_lugares = red.n_lugares
+    vecinos = _vecinos(red)
+    colores = ([('lugar', m) for m in red.marcado_inicial] +
+               [('transicion', 0)] * red.n_transiciones)
+    rango = {c: i for i, c in enumerate(sorted(set(colores)))}
+    colores = _refinar([rango[c] for c in colores], vecinos)
+
+    generadores = []
+    while True:
+        celda = _celda_objetivo(colores)
+        if celda is None:
+            return generadores
+        v = colores.index(celda)
+        fijado = _individualizar(colores, v, vecinos)
+        del_nivel = []
+        for w, c in enumerate(colores):
+            if c != celda or w == v:
+                continue
+            if w in _orbita(v, [lugares + tuple(n_lugares + t for t in transiciones)
+                                for lugares, transiciones in del_nivel]):
+                continue
+            encontrado = _buscar_automorfismo(red, fijado, _individualizar(colores, w, vecinos), vecinos)
+            if encontrado is not None:
+                del_nivel.append(encontrado)
+        generadores.extend(del_nivel)
+        colores = fijado
+
+
+def cerrar_grupo(generadores, n_lugares, max_elementos):
+    """
+    Todas las permutaciones de lugares generadas, o None si son más de max_elementos
+    """
+    identidad = tuple(range(n_lugares))
+    grupo = {identidad}
+    pendientes = deque([identidad])
+    while pendientes:
+        g = pendientes.popleft()
+        for h in generadores:
+            compuesta = tuple(h[g[p]] for p in range(n_lugares))
+            if compuesta not in grupo:
+                if len(grupo) >= max_elementos:
+                    return None
+                grupo.add(compuesta)
+                pendientes.append(compuesta)
+    return list(grupo)
+
+
+class Simetria:
+    """
+    Reducción por simetría: cada marcado se cambia por un representante de su órbita antes
+    de guardarlo, así la búsqueda recorre una órbita por estado simétrico. Como el grupo
+    conserva la estructura y el marcado inicial, un marcado es alcanzable si y solo si su
+    representante está en los visitados, y un representante es un bloqueo si y solo si
+    lo es todo marcado de su órbita.
+
+    La simetría se declara de una de dos formas:
+        generadores: Permutaciones de lugares (la de transiciones se deduce) o pares
+                     (lugares, transiciones); se comprueba que sean automorfismos
+        bloques: Réplicas intercambiables, cada una una lista de lugares de la misma
+                 longitud; el representante ordena las réplicas, sin enumerar las N!
+                 permutaciones
+    o se detecta con Simetria.detectar(red).
+    """
+
+    def __init__(self, red, generadores=(), bloques=None, max_grupo=5000):
+        self.red = red
+        if generadores and bloques:
+            raise ValueError("Declarar la simetría con generadores o con bloques, no ambos")
+        self.bloques = [list(bloque) for bloque in bloques] if bloques else []
+        self.generadores = [self._validar(g) for g in generadores]
+        if self.bloques:
+            self._validar_bloques()
+        # el grupo declarado por generadores se enumera si es chico; si no, el
+        # representante se busca bajando por los generadores y puede no ser único
+        self.grupo = cerrar_grupo([g[0] for g in self.generadores], red.n_lugares, max_grupo)
+        self.exacta = self.grupo is not None
+
+    @classmethod
+    def detectar(cls, red, max_grupo=5000):
+        """Simetría con los automorfismos detectados en la red"""
+        return cls(red, detectar_automorfismos(red), max_grupo=max_grupo)
+
+    def _validar(self, generador):
+        if len(generador) == 2 and not isinstance(generador[0], int):
+            lugares, transiciones = tuple(generador[0]), tuple(generador[1])
+        else:
+            lugares = tuple(generador)
+            transiciones = permutacion_transiciones(self.red, lugares)
+            if transiciones is None:
+                raise ValueError(f"La permutación {list(lugares)} no es un automorfismo de la red")
+        if not es_automorfismo(self.red, lugares, transiciones):
+            raise ValueError(f"La permutación {list(lugares)} no es un automorfismo de la red")
+        return lugares, transiciones
+
+    def _validar_bloques(self):
+        """Las réplicas deben ser disjuntas, del mismo tamaño e intercambiables"""
+        tamano = len(self.bloques[0])
+        usados = [p for bloque in self.bloques for p in bloque]
+        if any(len(bloque) != tamano for bloque in self.bloques) or len(set(usados)) != len(usados):
+            raise ValueError("Los bloques deben ser disjuntos y del mismo tamaño")
+        # la transposición de las dos primeras réplicas y el ciclo de todas generan
+        # el grupo simétrico completo
+        n = len(self.bloques)
+        for orden in ([1, 0] + list(range(2, n)), list(range(1, n)) + [0]):
+            lugares = list(range(self.red.n_lugares))
+            for i, j in enumerate(orden):
+                for p, q in zip(self.bloques[i], self.bloques[j]):
+                    lugares[p] = q
+            self._validar(lugares)
+
+    def canonico(self, marcado):
+        """
+        Representante de la órbita del marcado
+
+        Returns:
+            tuple: El marcado representante
+        """
+        marcado = tuple(marcado)
+        if self.bloques:
+            return self._ordenar_bloques(marcado)
+        if not self.generadores:
+            return marcado
+        if self.exacta:
+            return min(aplicar(g, marcado) for g in self.grupo)
+        # bajar por los generadores mientras el marcado decrezca
+        mejorado = True
+        while mejorado:
+            mejorado = False
+            for lugares, _ in self.generadores:
+                candidato = aplicar(lugares, marcado)
+                if candidato < marcado:
+                    marcado, mejorado = candidato, True
+        return marcado
+
+    def _ordenar_bloques(self, marcado):
+        replicas = sorted(tuple(marcado[p] for p in bloque) for bloque in self.bloques)
+        nuevo = list(marcado)
+        for bloque, valores in zip(self.bloques, replicas):
+            for p, x in zip(bloque, valores):
+                nuevo[p] = x
+        return tuple(nuevo)
+
+    def contiene(self, visitados, marcado):
+        """
+        True si el marcado es alcanzable según una búsqueda reducida con esta simetría.
+        Con un grupo declarado que no se pudo enumerar el representante no es único y
+        la respuesta negativa no es confiable, por eso se rechaza.
+        """
+        if self.generadores and not self.exacta:
+            raise ValueError("El grupo es demasiado grande para decidir pertenencia; "
+                             "declarar las réplicas como bloques o subir max_grupo")
+        return self.canonico(marcado) in visitados
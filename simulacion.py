@@ -0,0 +1,217 @@
+from Parte_I import OMEGA
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional, solo lo usa el simulador por lotes
+    np = None
+
+
+class SimuladorMonteCarlo:
+    """
+    Juego de marcas aleatorio por lotes: muchas corridas independientes avanzan a la vez
+    como filas de una matriz de marcados (corridas x lugares). En cada paso cada corrida
+    dispara una transición habilitada elegida con un generador con semilla, así que los
+    resultados son reproducibles. Sirve para estimar capacidades en redes cuyo espacio de
+    estados es demasiado grande para enumerarlo.
+
+    Políticas de elección (se combinan):
+        prioridades: solo compiten las habilitadas de mayor prioridad
+        pesos: entre las que compiten se elige con probabilidad proporcional al peso
+        politica: función (marcados, habilitadas, rng) -> índice elegido por corrida
+                  (-1 si la corrida no dispara); reemplaza a las dos anteriores
+    Sin ninguna, la elección es uniforme entre las habilitadas.
+    """
+
+    def __init__(self, red, pesos=None, prioridades=None, politica=None, semilla=None):
+        """
+        red: Instancia de RedPetri (el marcado inicial no puede tener ω)
+        pesos: Lista con un peso no negativo por transición (opcional)
+        prioridades: Lista con una prioridad por transición, mayor gana (opcional)
+        politica: Función de elección propia (opcional)
+        semilla: Semilla del generador aleatorio
+        """
+        if np is None:
+            raise ImportError("El simulador por lotes requiere numpy (pip install numpy)")
+        if OMEGA in red.marcado_inicial:
+            raise ValueError("No se puede simular un marcado con ω")
+
+        self.red = red
+        self.rng = np.random.default_rng(semilla)
+        self.politica = politica
+        n_transiciones = red.n_transiciones
+
+        self.pesos = None
+        if pesos is not None:
+            self.pesos = np.asarray(pesos, dtype=np.float64)
+            if self.pesos.shape != (n_transiciones,) or (self.pesos < 0).any():
+                raise ValueError("Se necesita un peso no negativo por transición")
+        self.prioridades = None
+        if prioridades is not None:
+            self.prioridades = np.asarray(prioridades, dtype=np.float64)
+            if self.prioridades.shape != (n_transiciones,):
+                raise ValueError("Se necesita una prioridad por transición")
+
+        # Arcos de entrada ordenados por transición: habilitar cuesta O(corridas x arcos)
+        # en lugar de O(corridas x lugares x transiciones)
+        lugares, pesos_arco, inicios = [], [], []
+        self.con_entradas = []
+        for t in range(n_transiciones):
+            if red.entradas[t]:
+                self.con_entradas.append(t)
+                inicios.append(len(lugares))
+                for p, peso in red.entradas[t]:
+                    lugares.append(p)
+                    pesos_arco.append(peso)
+        self.arco_lugar = np.array(lugares, dtype=np.intp)
+        self.arco_peso = np.array(pesos_arco, dtype=np.int64)
+        self.inicios = np.array(inicios, dtype=np.intp)
+        self.con_entradas = np.array(self.con_entradas, dtype=np.intp)
+        # las transiciones sin entradas pero con salidas siempre están habilitadas
+        self.siempre = np.array(red.con_arcos, dtype=bool)
+        self.siempre[self.con_entradas] = False
+
+        # Fila t: cambio que produce disparar t en cada lugar
+        self.C_t = np.array(red.C, dtype=np.int64).reshape(red.n_lugares, n_transiciones).T.copy()
+
+    def habilitadas(self, marcados):
+        """
+        marcados: Matriz (corridas x lugares)
+
+        Returns:
+            numpy.ndarray: Matriz booleana (corridas x transiciones)
+        """
+        habilitadas = np.repeat(self.siempre[None, :], marcados.shape[0], axis=0)
+        if len(self.con_entradas):
+            cumple = marcados[:, self.arco_lugar] >= self.arco_peso
+            # conjunción de los arcos de cada transición en un solo paso
+            habilitadas[:, self.con_entradas] = np.logical_and.reduceat(cumple, self.inicios, axis=1)
+        return habilitadas
+
+    def elegir(self, marcados, habilitadas):
+        """
+        Returns:
+            numpy.ndarray: Transición elegida por corrida, -1 si no hay candidata con peso
+                           positivo (o la política no dispara)
+        """
+        if self.politica is not None:
+            return np.asarray(self.politica(marcados, habilitadas, self.rng), dtype=np.intp)
+
+        candidatas = habilitadas
+        if self.prioridades is not None:
+            prioridad = np.where(habilitadas, self.prioridades, -np.inf)
+            candidatas = habilitadas & (prioridad == prioridad.max(axis=1, keepdims=True))
+
+        pesos = candidatas.astype(np.float64)
+        if self.pesos is not None:
+            pesos *= self.pesos
+        acumulado = np.cumsum(pesos, axis=1)
+        total = acumulado[:, -1]
+        # se busca el primer acumulado que supera un punto uniforme en [0, total)
+        punto = self.rng.random(len(total)) * total
+        elegidas = (acumulado <= punto[:, None]).sum(axis=1)
+        elegidas[total <= 0] = -1
+        return elegidas
+
+    def ejecutar(self, n_corridas=1000, max_pasos=1000):
+        """
+        Ejecuta n_corridas secuencias de disparos aleatorios de hasta max_pasos pasos.
+        Una corrida se detiene al llegar a un bloqueo (ninguna transición habilitada) o
+        cuando hay habilitadas pero ninguna puede elegirse (todas con peso 0 o la política
+        devolvió -1); lo segundo se cuenta aparte y no como bloqueo.
+
+        Returns:
+            dict: Estadísticas por lugar, disparos por transición, frecuencia de bloqueo,
+                  histograma de pasos hasta el bloqueo y frecuencia de detención sin bloqueo
+        """
+        n_lugares = self.red.n_lugares
+        marcados = np.tile(np.array(self.red.marcado_inicial, dtype=np.int64), (n_corridas, 1))
+        activas = np.ones(n_corridas, dtype=bool)
+        pasos_bloqueo = np.full(n_corridas, -1, dtype=np.int64)
+        detenidas = np.zeros(n_corridas, dtype=bool)
+        disparos = np.zeros(self.red.n_transiciones, dtype=np.int64)
+
+        # estadísticas de marcas sobre todos los pasos de todas las corridas activas
+        suma = marcados.sum(axis=0, dtype=np.float64)
+        suma_cuadrados = (marcados.astype(np.float64) ** 2).sum(axis=0)
+        maximo = marcados.max(axis=0) if n_corridas else np.zeros(n_lugares, dtype=np.int64)
+        observaciones = n_corridas
+
+        for paso in range(max_pasos):
+            indices = np.flatnonzero(activas)
+            if len(indices) == 0:
+                break
+            actuales = marcados[indices]
+            habilitadas = self.habilitadas(actuales)
+            elegidas = self.elegir(actuales, habilitadas)
+
+            sin_disparo = elegidas < 0
+            if sin_disparo.any():
+                # bloqueo solo si de verdad no hay habilitadas; si las hay, la corrida
+                # se detiene porque ninguna tiene peso positivo
+                bloqueadas = sin_disparo & ~habilitadas.any(axis=1)
+                pasos_bloqueo[indices[bloqueadas]] = paso
+                detenidas[indices[sin_disparo & ~bloqueadas]] = True
+                activas[indices[sin_disparo]] = False
+                indices = indices[~sin_disparo]
+                elegidas = elegidas[~sin_disparo]
+                if len(indices) == 0:
+                    break
+
+            marcados[indices] += self.C_t[elegidas]
+            disparos += np.bincount(elegidas, minlength=len(disparos))
+
+            nuevos = marcados[indices]
+            suma += nuevos.sum(axis=0)
+            suma_cuadrados += (nuevos.astype(np.float64) ** 2).sum(axis=0)
+            np.maximum(maximo, nuevos.max(axis=0), out=maximo)
+            observaciones += len(indices)
+        else:
+            # las que siguen activas pueden estar bloqueadas justo en el último marcado
+            indices = np.flatnonzero(activas)
+            if len(indices):
+                sin_habilitadas = ~self.habilitadas(marcados[indices]).any(axis=1)
+                pasos_bloqueo[indices[sin_habilitadas]] = max_pasos
+
+        media = suma / observaciones if observaciones else suma
+        varianza = np.maximum(suma_cuadrados / observaciones - media ** 2, 0) if observaciones else suma
+        con_bloqueo = pasos_bloqueo >= 0
+        return {
+            'corridas': n_corridas,
+            'max_pasos': max_pasos,
+            'media_marcas': media.tolist(),
+            'desviacion_marcas': np.sqrt(varianza).tolist(),
+            'maximo_marcas': maximo.tolist(),
+            'media_marcas_final': marcados.mean(axis=0).tolist() if n_corridas else [0.0] * n_lugares,
+            'disparos': disparos.tolist(),
+            'frecuencia_bloqueo': float(con_bloqueo.mean()) if n_corridas else 0.0,
+            'pasos_hasta_bloqueo': np.bincount(pasos_bloqueo[con_bloqueo], minlength=max_pasos + 1).tolist(),
+            'frecuencia_detencion': float(detenidas.mean()) if n_corridas else 0.0,
+        }
+
+
+def simular(red, n_corridas=1000, max_pasos=1000, semilla=None, **politicas):
+    """Atajo: crea un SimuladorMonteCarlo y ejecuta las corridas"""
+    return SimuladorMonteCarlo(red, semilla=semilla, **politicas).ejecutar(n_corridas, max_pasos)
+
+
+def imprimir_simulacion(resultado, ancho=40):
+    """Muestra el resultado de ejecutar con un histograma de texto de los bloqueos"""
+    print("SIMULACIÓN MONTE CARLO")
+    print(f"Corridas: {resultado['corridas']} | Pasos máximos: {resultado['max_pasos']}")
+    print("\nMarcas por lugar (media ± desviación, máximo, media final):")
+    for p, (media, desviacion, maximo, final) in enumerate(zip(
+            resultado['media_marcas'], resultado['desviacion_marcas'],
+            resultado['maximo_marcas'], resultado['media_marcas_final'])):
+        print(f"  P{p}: {media:.3f} ± {desviacion:.3f}, máx {maximo}, final {final:.3f}")
+    print(f"\nDisparos por transición: {resultado['disparos']}")
+    print(f"Frecuencia de bloqueo: {resultado['frecuencia_bloqueo']:.2%}")
+    if resultado['frecuencia_detencion']:
+        print(f"Detenidas sin bloqueo (habilitadas sin peso): {resultado['frecuencia_detencion']:.2%}")
+
+    histograma = resultado['pasos_hasta_bloqueo']
+    mayor = max(histograma) if histograma else 0
+    if mayor:
+        print("Pasos hasta el bloqueo:")
+        for pasos, cantidad in enumerate(histograma):
+            if cantidad:
+                print(f"  {pasos:>5}: {'#' * max(1, cantidad * ancho // mayor)} {cantidad}")
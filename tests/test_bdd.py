@@ -0,0 +1,16 @@
+import sys
+
+from bdd import BDD
+
+
+def test_no_cambia_el_limite_de_recursion():
+    limite = sys.getrecursionlimit()
+    bdd = BDD(2000)
+    # conjunción de muchas variables: la recursión de ite baja una vez por variable
+    u = bdd.VERDADERO
+    for i in range(0, 2000, 2):
+        u = bdd.y(u, bdd.variable(i))
+    v = bdd.y(bdd.variable(1999), u)
+    assert bdd.contar(v) == 2 ** (2000 - 1001)
+    assert bdd.y_existe(v, bdd.variable(0), frozenset(range(10))) != bdd.FALSO
+    assert sys.getrecursionlimit() == limite
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+import ecuacion_estado
+from Parte_I import RedPetri
+from generadores import anillo
+
+
+def test_importar_parte_i_no_carga_scipy():
+    codigo = "import sys, Parte_I; print('scipy' in sys.modules)"
+    raiz = os.path.dirname(os.path.abspath(ecuacion_estado.__file__))
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True, cwd=raiz)
+    assert salida.stdout.strip() == 'False'
+
+
+def test_alcanzable_sin_scipy(monkeypatch):
+    monkeypatch.setattr(ecuacion_estado, 'linprog', None)
+    red = RedPetri(*anillo(4))
+    resultado, secuencia = red.alcanzable((0, 0, 1, 0))
+    assert resultado and secuencia == [0, 1]
+    # los P-invariantes descartan sin scipy: el anillo conserva una ficha
+    assert red.alcanzable((1, 1, 0, 0)) == (False, None)
+    assert red.verificar_ecuacion_estado((0, 1, 0, 0)) == (None, None)
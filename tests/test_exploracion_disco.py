@@ -0,0 +1,23 @@
+import pytest
+
+from Parte_I import RedPetri
+from generadores import anillo, filosofos
+
+
+def test_reanudar_misma_red(tmp_path):
+    red = RedPetri(*filosofos(3))
+    with red.busqueda_en_disco(tmp_path, max_profundidad=2):
+        pass
+    with red.busqueda_en_disco(tmp_path) as visitados:
+        assert set(visitados) == set(red.busqueda_por_anchura(None))
+
+
+def test_rechaza_otra_red_con_los_mismos_lugares(tmp_path):
+    red = RedPetri(*filosofos(3))
+    with red.busqueda_en_disco(tmp_path, max_profundidad=1):
+        pass
+    pre, post, marcado_inicial = anillo(12)
+    otra = RedPetri(pre, post, marcado_inicial)
+    assert otra.n_lugares == red.n_lugares
+    with pytest.raises(ValueError):
+        otra.busqueda_en_disco(tmp_path)
@@ -0,0 +1,42 @@
+import gc
+
+from Parte_I import RedPetri
+from Parte_II import GrafoCobertura
+from formato_binario import GrafoGuardado, guardar_grafo
+from generadores import filosofos
+
+
+def _grafo_guardado(tmp_path):
+    pre, post, marcado_inicial = filosofos(3)
+    nodos, arcos = GrafoCobertura(RedPetri(pre, post, marcado_inicial)).expandir_cobertura_minima()
+    ruta = tmp_path / "grafo.bin"
+    guardar_grafo(nodos, arcos, ruta)
+    return ruta, nodos, arcos
+
+
+def test_cerrar_con_arreglos_vivos(tmp_path):
+    ruta, nodos, arcos = _grafo_guardado(tmp_path)
+    with GrafoGuardado(ruta) as grafo:
+        arreglos = grafo.como_arreglos()
+    # el bloque with terminó sin BufferError y las vistas siguen siendo válidas
+    assert arreglos['marcados'].shape == (len(nodos), 12)
+    assert len(arreglos['destinos']) == len(arcos)
+    assert grafo.archivo.closed
+    del arreglos
+    gc.collect()
+
+
+def test_cerrar_sin_arreglos(tmp_path):
+    ruta, nodos, _ = _grafo_guardado(tmp_path)
+    with GrafoGuardado(ruta) as grafo:
+        assert grafo.como_grafo()[0] == nodos
+    assert grafo.mmap.closed
+
+
+def test_csr_desde_guardado_igual_que_desde_grafo(tmp_path):
+    from Parte_III import GrafoCSR
+
+    ruta, nodos, arcos = _grafo_guardado(tmp_path)
+    with GrafoGuardado(ruta) as grafo:
+        desde_archivo = GrafoCSR.desde_guardado(grafo)
+    assert desde_archivo.analizar(9) == GrafoCSR.desde_grafo(nodos, arcos).analizar(9)
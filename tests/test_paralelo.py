@@ -0,0 +1,20 @@
+from Parte_I import RedPetri
+from Parte_II import GrafoCobertura
+from generadores import filosofos, productor_consumidor
+
+
+def test_anchura_paralela_sin_limite_igual_a_secuencial():
+    pre, post, marcado_inicial = filosofos(3)
+    red = RedPetri(pre, post, marcado_inicial)
+    secuencial = red.busqueda_por_anchura(max_profundidad=None)
+    paralela = red.busqueda_por_anchura_paralela(max_profundidad=None, procesos=2, tam_bloque=4)
+    assert list(paralela) == list(secuencial)
+    assert [paralela[m] for m in paralela] == [secuencial[m] for m in secuencial]
+
+
+def test_cobertura_paralela_sin_limite_igual_a_secuencial():
+    pre, post, marcado_inicial = productor_consumidor(2, acotado=False)
+    secuencial = GrafoCobertura(RedPetri(pre, post, marcado_inicial)).expandir_grafo_cobertura(max_profundidad=None)
+    paralela = GrafoCobertura(RedPetri(pre, post, marcado_inicial)).expandir_grafo_cobertura_paralelo(
+        max_profundidad=None, procesos=2, tam_bloque=4)
+    assert paralela == secuencial
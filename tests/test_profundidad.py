@@ -0,0 +1,44 @@
+from Parte_I import RedPetri
+from generadores import filosofos, productor_consumidor
+
+
+def _reproducir(red, secuencia):
+    marcado = list(red.marcado_inicial)
+    for transicion in secuencia:
+        assert red.esta_habilitada(transicion, marcado)
+        marcado = red._sucesor(transicion, marcado)
+    return tuple(marcado)
+
+
+def test_caminos_minimos_con_limite():
+    for pre, post, marcado_inicial in (filosofos(3), productor_consumidor(3, 2)):
+        red = RedPetri(pre, post, marcado_inicial)
+        anchura = red.busqueda_por_anchura(None)
+        for limite in (3, 6, None):
+            if limite is None:
+                visitados = red.busqueda_por_profundizacion()
+            else:
+                visitados = red.busqueda_por_profundidad(limite)
+            assert set(visitados) == {m for m in anchura
+                                      if limite is None or len(anchura.secuencia(anchura.id_de(m))) <= limite}
+            for marcado in visitados:
+                secuencia = visitados.secuencia(visitados.id_de(marcado))
+                assert _reproducir(red, secuencia) == marcado
+                assert len(secuencia) == len(anchura.secuencia(anchura.id_de(marcado)))
+
+
+def test_profundizacion_para_cerca_de_la_profundidad_de_anchura():
+    red = RedPetri(*productor_consumidor(6, 2))
+    anchura = red.busqueda_por_anchura(None)
+    profundidad = max(len(anchura.secuencia(i)) for i in range(len(anchura)))
+    limites = []
+    pasos = red._pasos_en_profundidad
+
+    def registrar(max_profundidad, *args, **kwargs):
+        limites.append(max_profundidad)
+        return pasos(max_profundidad, *args, **kwargs)
+
+    red._pasos_en_profundidad = registrar
+    visitados = red.busqueda_por_profundizacion(incremento=5)
+    assert len(visitados) == len(anchura)
+    assert max(limites) <= profundidad + 5
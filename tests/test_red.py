@@ -0,0 +1,21 @@
+import pytest
+
+from Parte_I import RedPetri
+
+
+def test_pre_y_post_no_se_modifican_en_sitio():
+    red = RedPetri([[1], [0]], [[0], [1]], [1, 0])
+    assert red.disparar(0, [1, 0]) == (True, [0, 1])
+    with pytest.raises(TypeError):
+        red.pre[0][0] = 2
+    with pytest.raises(TypeError):
+        red.post[1] = [0]
+
+
+def test_reasignar_pre_invalida_la_cache():
+    red = RedPetri([[1], [0]], [[0], [1]], [1, 0])
+    assert red.transiciones_habilitadas([1, 0]) == [0]
+    red.pre = [[2], [0]]
+    assert red.transiciones_habilitadas([1, 0]) == []
+    assert red.disparar(0, [1, 0])[0] is False
+    assert red.disparar(0, [2, 0]) == (True, [0, 1])
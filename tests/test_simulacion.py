@@ -0,0 +1,13 @@
+from Parte_I import RedPetri
+from generadores import anillo
+from simulacion import simular
+
+
+def test_peso_cero_no_cuenta_como_bloqueo():
+    # en el anillo siempre hay una transición habilitada; con peso 0 en una de ellas las
+    # corridas se detienen al llegar ahí, pero no es un bloqueo
+    pre, post, marcado_inicial = anillo(3)
+    resultado = simular(RedPetri(pre, post, marcado_inicial), n_corridas=50, max_pasos=10,
+                        semilla=0, pesos=[1, 1, 0])
+    assert resultado['frecuencia_bloqueo'] == 0.0
+    assert resultado['frecuencia_detencion'] == 1.0
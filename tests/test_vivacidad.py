@@ -0,0 +1,32 @@
+from __init__ import pre, post, marcado_inicial
+from Parte_I import RedPetri
+from Parte_II import GrafoCobertura
+from Parte_III import GrafoCSR
+from generadores import anillo
+
+
+def test_red_por_defecto_en_grafo_de_alcance():
+    red = RedPetri(pre, post, marcado_inicial)
+    resultado = GrafoCSR.desde_alcance(red).analizar(red.n_transiciones)
+    # se bloquea en [0, 0, 3]; T2 no tiene arcos
+    assert resultado['bloqueos'] == 1
+    assert resultado['vivacidad'] == ['L1', 'L1', 'L0']
+    assert resultado['viva'] is False
+    assert resultado['reversible'] is False
+    assert resultado['completo'] and not resultado['con_omega']
+
+
+def test_cobertura_con_omega_no_decide():
+    red = RedPetri(pre, post, marcado_inicial)
+    nodos, arcos = GrafoCobertura(red).expandir_grafo_cobertura()
+    resultado = GrafoCSR.desde_grafo(nodos, arcos).analizar(red.n_transiciones)
+    assert resultado['con_omega']
+    assert resultado['bloqueos'] is None and resultado['viva'] is None
+    assert resultado['vivacidad'] == ['L1', 'L1', 'L0']
+
+
+def test_anillo_reversible():
+    red = RedPetri(*anillo(4))
+    resultado = GrafoCSR.desde_alcance(red).analizar(red.n_transiciones)
+    assert resultado['reversible'] and resultado['viva']
+    assert resultado['bloqueos'] == 0